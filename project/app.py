@@ -3,7 +3,10 @@ Streamlit web interface for the AI Text Summarizer
 """
 
 import streamlit as st
-from summarizer import TextSummarizer
+from cache import EncoderCache
+from jobs import JobQueue
+from preprocess import clean_text
+from summarizer import DEFAULT_MODEL, TextSummarizer
 
 # Page configuration
 st.set_page_config(
@@ -127,6 +130,80 @@ st.markdown(
 )
 
 
+@st.cache_resource
+def load_summarizer() -> TextSummarizer:
+    """
+    Start loading and warming up the model once per server process, shared by all sessions.
+
+    The load runs in the background so the page renders immediately; the first
+    summary request waits for it to finish. Encoder outputs are cached, so moving
+    the length sliders on the same text only reruns the decoder.
+    """
+    summarizer = TextSummarizer(DEFAULT_MODEL, encoder_cache=EncoderCache())
+    summarizer.preload(background=True)
+    return summarizer
+
+
+@st.cache_resource
+def load_job_queue() -> JobQueue:
+    """Create the background queue for uploaded documents, shared by all sessions."""
+    return JobQueue(load_summarizer())
+
+
+def show_metrics(result: dict):
+    """Show the length and compression metrics of one result."""
+    st.markdown("### Metrics")
+    metrics_cols = st.columns([1, 1, 1])
+    with metrics_cols[0]:
+        st.metric(
+            "Original Length",
+            f"{result['original_length']} words"
+        )
+    with metrics_cols[1]:
+        st.metric(
+            "Summary Length",
+            f"{result['summary_length']} words"
+        )
+    with metrics_cols[2]:
+        st.metric(
+            "Compression Ratio",
+            f"{result['compression_ratio']:.2%}"
+        )
+
+
+@st.fragment(run_every=1.0)
+def show_batch():
+    """Show the progress of this session's uploaded documents, refreshed every second."""
+    batch = st.session_state.get("batch")
+    if batch is None:
+        return
+    # The queue's thread never touches session state; copy its results over here
+    st.session_state.setdefault("results", {}).update(batch.results())
+    progress = batch.progress()
+    finished = progress['done'] + progress['failed']
+    st.progress(
+        finished / progress['total'],
+        text=f"{finished} of {progress['total']} documents summarized"
+    )
+    st.caption(
+        f"{progress['docs_per_second']:.2f} documents/s, "
+        f"{progress['cached']} from earlier in this session, {progress['failed']} failed"
+    )
+    icons = {"queued": "⏳", "running": "⚙️", "done": "✅", "cached": "✅", "failed": "❌"}
+    for job in batch.jobs:
+        with st.expander(f"{icons[job.status]} {job.name}"):
+            if job.result is not None:
+                st.write(job.result['summary'])
+                st.caption(
+                    f"{job.result['original_length']} → {job.result['summary_length']} words "
+                    f"({job.result['compression_ratio']:.0%})"
+                )
+            elif job.error is not None:
+                st.error(job.error)
+            else:
+                st.caption(job.status.capitalize())
+
+
 def main():
     # Header
     st.markdown('<div class="app-header">', unsafe_allow_html=True)
@@ -140,6 +217,8 @@ def main():
     )
     st.markdown('</div>', unsafe_allow_html=True)
 
+    summarizer = load_summarizer()
+
     # Sidebar configuration
     st.sidebar.header("⚙️ Configuration")
     min_length = st.sidebar.slider(
@@ -154,51 +233,118 @@ def main():
         min_value=50,
         max_value=500,
         value=130,
-        help="The maximum length of the generated summary"
+        help="The maximum length of the generated summary, converted to model tokens "
+             "using the measured tokens-per-word ratio"
+    )
+    fast_mode = st.sidebar.checkbox(
+        "Fast mode (extractive)",
+        value=False,
+        help="Pick the most important sentences instead of running the model: "
+             "instant, but the summary is made of original sentences"
     )
 
-    # Text input and summary generation
-    text_input = st.text_area(
-        "Enter your text to summarize:",
-        height=200,
-        help="Paste your article, document, or any text you want to summarize"
+    clean_input = st.sidebar.checkbox(
+        "Clean web text",
+        value=False,
+        help="Strip HTML, menus, cookie notices and repeated paragraphs before summarizing, "
+             "so more of the model's input budget goes to the article"
     )
 
-    if st.button("Generate Summary", type="primary"):
-        if not text_input.strip():
+    mode = "fast" if fast_mode else "abstractive"
+    job_queue = load_job_queue()
+    # Results of this browser session by content and settings, so returning to
+    # earlier slider values shows their summary again without rerunning the model
+    results = st.session_state.setdefault("results", {})
+
+    paste_tab, upload_tab = st.tabs(["Paste text", "Upload documents"])
+
+    with paste_tab:
+        text_input = st.text_area(
+            "Enter your text to summarize:",
+            height=200,
+            help="Paste your article, document, or any text you want to summarize"
+        )
+        if clean_input and text_input.strip():
+            # Fast mode never loads the model, so it cannot count tokens; report words
+            count_tokens = None if fast_mode else summarizer.count_tokens
+            text_input, report = clean_text(text_input, count_tokens)
+            if count_tokens is None:
+                saved = f"{report['words_before'] - report['words_after']} words"
+            else:
+                saved = f"{report['tokens_saved']} tokens"
+            st.caption(
+                f"Cleaning saved {saved} ({report['removed_paragraphs']} boilerplate and "
+                f"{report['duplicate_paragraphs']} repeated paragraphs removed)"
+            )
+        # Pasted text is streamed, which decodes greedily, unlike the queue's beam search
+        profile = None if fast_mode else "fast"
+        key = job_queue.result_key(text_input, max_length, min_length, "words", mode, profile)
+        clicked = st.button("Generate Summary", type="primary")
+
+        if clicked and not text_input.strip():
             st.error("Please enter some text to summarize.")
-        else:
+        elif text_input.strip() and key in results:
+            st.success("Showing the summary generated earlier for these settings.")
+            st.markdown("### Summary")
+            st.write(results[key]['summary'])
+            show_metrics(results[key])
+        elif clicked:
             try:
-                with st.spinner("Generating summary..."):
-                    summarizer = TextSummarizer()
+                status = st.empty()
+                status.info("Generating summary...")
+                st.markdown("### Summary")
+                summary_placeholder = st.empty()
+
+                if fast_mode:
                     result = summarizer.summarize(
                         text_input,
                         max_length=max_length,
-                        min_length=min_length
+                        length_unit="words",
+                        mode="fast"
                     )
-                    st.success("Summary generated successfully!")
-                    st.markdown("### Summary")
-                    st.write(result['summary'])
-                    st.markdown("### Metrics")
-                    metrics_cols = st.columns([1, 1, 1])
-                    with metrics_cols[0]:
-                        st.metric(
-                            "Original Length",
-                            f"{result['original_length']} words"
-                        )
-                    with metrics_cols[1]:
-                        st.metric(
-                            "Summary Length",
-                            f"{result['summary_length']} words"
-                        )
-                    with metrics_cols[2]:
-                        st.metric(
-                            "Compression Ratio",
-                            f"{result['compression_ratio']:.2%}"
-                        )
+                    total_seconds = result['timings']['total']
+                else:
+                    # Render the summary as it is generated instead of behind a spinner
+                    streamed = ""
+                    result = None
+                    for event in summarizer.summarize_stream(
+                        text_input,
+                        max_length=max_length,
+                        min_length=min_length,
+                        length_unit="words"
+                    ):
+                        if event['type'] == 'token':
+                            streamed += event['text']
+                            summary_placeholder.markdown(streamed + "▌")
+                        else:
+                            result = event
+                    total_seconds = result['total_seconds']
+                results[key] = result
+                summary_placeholder.write(result['summary'])
+                status.success(f"Summary generated successfully in {total_seconds:.2f}s!")
+                show_metrics(result)
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
 
+    with upload_tab:
+        uploads = st.file_uploader(
+            "Upload text files",
+            type=["txt", "md", "html"],
+            accept_multiple_files=True,
+            help="Each file is summarized separately, in the background"
+        )
+        if st.button("Summarize Documents", type="primary", disabled=not uploads):
+            documents = [
+                (upload.name, upload.getvalue().decode("utf-8", errors="replace"))
+                for upload in uploads
+            ]
+            if clean_input:
+                documents = [(name, clean_text(text)[0]) for name, text in documents]
+            st.session_state["batch"] = job_queue.submit(
+                documents, max_length, min_length, "words", mode, results
+            )
+        show_batch()
+
     # Additional information
     with st.expander("ℹ️ About this app"):
         st.markdown("""
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the AI Text Summarizer.
+
+Run from the project directory:
+
+    python -m bench --output bench.json
+"""
@@ -0,0 +1,259 @@
+"""
+Benchmark runner for the AI Text Summarizer.
+
+Reports cold-start and model-load time, latency percentiles per input-length
+bucket, throughput at several concurrency levels and batch sizes, and peak RSS,
+as JSON that can be diffed between runs or checked against a baseline.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from bench.stats import find_regressions, latency_summary, peak_rss_mb
+from summarizer import DEFAULT_MODEL, ModelRegistry, TextSummarizer
+from tests import sample_texts, test_data
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, min words inclusive, max words exclusive) for the latency breakdown
+LENGTH_BUCKETS = (("short", 0, 100), ("medium", 100, 250), ("long", 250, 10**9))
+
+# Synthetic inputs that stay under the 1024-token limit of summarize()
+SYNTHETIC_WORDS = (400, 650)
+
+# Synthetic document for the map-reduce (summarize_long) path
+DOCUMENT_WORDS = 3000
+
+_COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from summarizer import TextSummarizer
+imported = time.perf_counter()
+summarizer = TextSummarizer(sys.argv[1])
+summarizer.summarizer
+loaded = time.perf_counter()
+summarizer.summarize(sys.argv[2])
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "load": loaded - imported, "first": done - loaded}))
+"""
+
+
+def load_corpus() -> List[str]:
+    """Collect the distinct sample texts from the test corpora."""
+    texts = []
+    for module in (test_data, sample_texts):
+        for name in sorted(vars(module)):
+            value = getattr(module, name)
+            if name.isupper() and isinstance(value, str) and value.strip() not in texts:
+                texts.append(value.strip())
+    return texts
+
+
+def synthetic_text(corpus: List[str], words: int) -> str:
+    """Build a text of roughly ``words`` words by cycling through the corpus."""
+    pool = " ".join(corpus).split()
+    repeated = (pool * (words // len(pool) + 1))[:words]
+    return " ".join(repeated).rstrip(".") + "."
+
+
+def bucket_for(text: str) -> str:
+    """Return the length bucket name for a text."""
+    words = len(text.split())
+    for name, low, high in LENGTH_BUCKETS:
+        if low <= words < high:
+            return name
+    return LENGTH_BUCKETS[-1][0]
+
+
+def measure_cold_start(model_name: str, text: str) -> Dict[str, float]:
+    """Time import, model load and first summary in a fresh interpreter."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _COLD_START_SCRIPT, model_name, text],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = time.perf_counter() - start
+    phases = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {
+        "cold_start_seconds": total,
+        "cold_import_seconds": phases["import"],
+        "cold_load_seconds": phases["load"],
+        "cold_first_summary_seconds": phases["first"],
+    }
+
+
+def measure_latency(
+    summarizer: TextSummarizer, texts: List[str], repeats: int
+) -> Dict[str, Dict[str, float]]:
+    """Time summarize() per input and group the samples by length bucket."""
+    samples: Dict[str, List[float]] = {}
+    for text in texts:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            summarizer.summarize(text)
+            samples.setdefault(bucket_for(text), []).append(time.perf_counter() - start)
+    return {bucket: latency_summary(values) for bucket, values in samples.items()}
+
+
+def measure_throughput(
+    summarizer: TextSummarizer,
+    texts: List[str],
+    concurrency: List[int],
+    batch_sizes: List[int],
+) -> List[Dict[str, Any]]:
+    """Measure docs/sec with concurrent summarize() calls and with summarize_many()."""
+    rows = []
+    for workers in concurrency:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(summarizer.summarize, texts))
+        rows.append(_throughput_row("threads", workers, len(texts), start))
+
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        summarizer.summarize_many(texts, batch_size=batch_size)
+        rows.append(_throughput_row("batch", batch_size, len(texts), start))
+    return rows
+
+
+def _throughput_row(mode: str, size: int, docs: int, start: float) -> Dict[str, Any]:
+    seconds = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "size": size,
+        "docs": docs,
+        "seconds": seconds,
+        "docs_per_sec": docs / seconds,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every benchmark section and return the report."""
+    import torch
+
+    corpus = load_corpus()
+    inputs = corpus + [synthetic_text(corpus, words) for words in SYNTHETIC_WORDS]
+    report: Dict[str, Any] = {
+        "model": args.model,
+        "quantize": args.quantize,
+        "backend": args.backend,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "cpu_count": os.cpu_count(),
+    }
+
+    if not args.skip_cold_start:
+        logger.info("Measuring cold start")
+        report.update(measure_cold_start(args.model, corpus[0]))
+
+    # A private registry so the load is timed even if something else loaded the model
+    summarizer = TextSummarizer(
+        args.model, quantize=args.quantize, backend=args.backend, registry=ModelRegistry()
+    )
+    start = time.perf_counter()
+    summarizer.summarizer
+    report["model_load_seconds"] = time.perf_counter() - start
+    summarizer.summarize(corpus[0])
+
+    logger.info("Measuring latency")
+    report["latency"] = measure_latency(summarizer, inputs, args.repeats)
+
+    logger.info("Measuring long-document latency")
+    document = synthetic_text(corpus, DOCUMENT_WORDS)
+    start = time.perf_counter()
+    long_result = summarizer.summarize_long(document)
+    report["document"] = {
+        "words": DOCUMENT_WORDS,
+        "seconds": time.perf_counter() - start,
+        "levels": long_result["levels"],
+    }
+
+    logger.info("Measuring throughput")
+    report["throughput"] = measure_throughput(
+        summarizer, inputs * args.throughput_rounds, args.concurrency, args.batch_sizes
+    )
+
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a short human-readable summary of a report."""
+    print(f"\nModel: {report['model']} (torch {report['torch']}, {report['cpu_count']} CPUs)")
+    print("-" * 60)
+    if "cold_start_seconds" in report:
+        print(f"Cold start to first summary: {report['cold_start_seconds']:.2f}s")
+    print(f"Model load: {report['model_load_seconds']:.2f}s")
+    for bucket, stats in report["latency"].items():
+        print(
+            f"Latency {bucket:<7} p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  "
+            f"p99 {stats['p99']:.3f}s  (n={stats['count']})"
+        )
+    print(f"Document ({report['document']['words']} words): {report['document']['seconds']:.2f}s")
+    for row in report["throughput"]:
+        print(f"Throughput {row['mode']:<7} x{row['size']:<3} {row['docs_per_sec']:.2f} docs/sec")
+    print(f"Peak RSS: {report['peak_rss_mb']:.0f} MB")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Benchmark the AI Text Summarizer")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--quantize", choices=["int8"], default=None)
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="torch")
+    parser.add_argument("--repeats", type=int, default=3, help="Latency samples per input")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 2, 4])
+    parser.add_argument("--batch-sizes", type=_int_list, default=[1, 4, 8])
+    parser.add_argument("--throughput-rounds", type=int, default=2, help="Corpus copies per run")
+    parser.add_argument("--skip-cold-start", action="store_true")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed relative regression (0.10 = 10%%)"
+    )
+    return parser.parse_args(argv)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks; return 1 if a regression beyond the threshold was found."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    args = parse_args(argv)
+    report = run(args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
@@ -0,0 +1,100 @@
+"""
+Statistics and regression checks for benchmark results.
+"""
+
+import resource
+import sys
+from typing import Any, Dict, List, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Return the pct-th percentile of values using linear interpolation.
+
+    Args:
+        values (Sequence[float]): Samples, in any order
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The interpolated percentile
+    """
+    if not values:
+        raise ValueError("Cannot compute a percentile of no values")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """Summarize latency samples as count, mean and p50/p95/p99."""
+    return {
+        "count": len(seconds),
+        "mean": sum(seconds) / len(seconds),
+        "p50": percentile(seconds, 50),
+        "p95": percentile(seconds, 95),
+        "p99": percentile(seconds, 99),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def find_regressions(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Compare two benchmark reports and describe metrics that got worse.
+
+    Latencies regress when they grow by more than ``threshold`` (a fraction),
+    throughputs when they shrink by more than ``threshold``. Metrics missing
+    from either report are skipped.
+
+    Args:
+        baseline (Dict[str, Any]): An earlier report
+        current (Dict[str, Any]): The report to check
+        threshold (float): Allowed relative change, e.g. 0.1 for 10%
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+
+    def check(name: str, old: float, new: float, higher_is_better: bool) -> None:
+        if not old:
+            return
+        change = (new - old) / old
+        if (higher_is_better and change < -threshold) or (
+            not higher_is_better and change > threshold
+        ):
+            regressions.append(f"{name}: {old:.4f} -> {new:.4f} ({change:+.1%})")
+
+    for bucket, stats in current.get("latency", {}).items():
+        old_stats = baseline.get("latency", {}).get(bucket)
+        if old_stats:
+            for key in ("p50", "p95", "p99"):
+                check(f"latency.{bucket}.{key}", old_stats[key], stats[key], False)
+
+    old_throughput = {
+        (row["mode"], row["size"]): row["docs_per_sec"] for row in baseline.get("throughput", [])
+    }
+    for row in current.get("throughput", []):
+        key = (row["mode"], row["size"])
+        if key in old_throughput:
+            check(
+                f"throughput.{row['mode']}.{row['size']}",
+                old_throughput[key],
+                row["docs_per_sec"],
+                True,
+            )
+
+    for key in ("cold_start_seconds", "model_load_seconds"):
+        if key in baseline and key in current:
+            check(key, baseline[key], current[key], False)
+
+    return regressions
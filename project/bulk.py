@@ -0,0 +1,302 @@
+"""
+Bulk offline summarization for the AI Text Summarizer.
+
+Streams documents from JSONL files or directories of text files, summarizes
+them in worker processes (each holding its own model), and writes results as
+JSONL in input order. Progress is checkpointed, so rerunning the same command
+after a crash or kill resumes where it stopped. Input lines that cannot be read
+and documents that fail to summarize are written as ``{"id": ..., "error": ...}``
+records instead of stopping the run.
+
+Run from the project directory:
+
+    python -m bulk articles.jsonl --output summaries.jsonl --workers 4 --threads 2
+
+With --share-weights the model is loaded once and the workers are forked from the
+loading process, so they share one copy of the weights instead of holding four.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from summarizer import (
+    DEFAULT_MODEL,
+    LENGTH_UNITS,
+    TextSummarizer,
+    configure_torch_threads,
+    model_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+# (document id, text)
+Document = Tuple[str, str]
+
+
+class InvalidDocument(NamedTuple):
+    """An input record that could not be read; it is written out as an error record."""
+
+    id: str
+    error: str
+
+
+# Set in each worker process by _init_worker
+_worker_summarizer: Optional[TextSummarizer] = None
+
+
+def iter_documents(
+    paths: List[str], text_field: str = "text", id_field: str = "id"
+) -> Iterator[Union[Document, InvalidDocument]]:
+    """
+    Stream documents from JSONL files, text files, or directories of either.
+
+    Directories are walked in sorted order so that runs are reproducible, which
+    resuming from a checkpoint relies on.
+
+    Args:
+        paths (List[str]): Files or directories to read
+        text_field (str): JSONL field holding the text
+        id_field (str): JSONL field holding the document id (line number if missing)
+
+    Yields:
+        (id, text) tuples, or an InvalidDocument for each JSONL line that is not a JSON
+        object with a string text field
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith((".jsonl", ".txt")):
+                        file_path = os.path.join(root, name)
+                        yield from _iter_file(file_path, text_field, id_field, path)
+        else:
+            yield from _iter_file(path, text_field, id_field, os.path.dirname(path))
+
+
+def _iter_file(
+    path: str, text_field: str, id_field: str, base: str
+) -> Iterator[Union[Document, InvalidDocument]]:
+    relative = os.path.relpath(path, base)
+    if not path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            yield relative, f.read()
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            default_id = f"{relative}:{line_number}"
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping unreadable line {default_id}: {str(e)}")
+                yield InvalidDocument(default_id, f"Invalid JSON: {str(e)}")
+                continue
+            if not isinstance(record, dict):
+                yield InvalidDocument(default_id, "Record must be a JSON object")
+                continue
+            doc_id = str(record.get(id_field, default_id))
+            text = record.get(text_field) or ""
+            if not isinstance(text, str):
+                yield InvalidDocument(doc_id, f"Field {text_field!r} must be a string")
+                continue
+            yield doc_id, text
+
+
+def _init_worker(model_name: str, threads: Optional[int], options: Dict[str, Any]) -> None:
+    global _worker_summarizer
+    configure_torch_threads(threads)
+    # Forked workers inherit the summarizer the parent loaded with --share-weights
+    if _worker_summarizer is None:
+        _worker_summarizer = TextSummarizer(model_name, **options)
+        _worker_summarizer.summarizer
+
+
+def _summarize_batch(
+    documents: List[Union[Document, InvalidDocument]],
+    max_length: int,
+    min_length: int,
+    length_unit: str,
+) -> List[Dict[str, Any]]:
+    records: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+    texts, positions = [], []
+    for index, document in enumerate(documents):
+        if isinstance(document, InvalidDocument):
+            records[index] = {"id": document.id, "error": document.error}
+        elif document[1].strip():
+            texts.append(document[1])
+            positions.append(index)
+        else:
+            records[index] = {"id": document[0], "error": "Input text cannot be empty"}
+
+    def summarize(batch: List[str]) -> List[Dict[str, Any]]:
+        return _worker_summarizer.summarize_many(
+            batch,
+            batch_size=len(batch),
+            max_length=max_length,
+            min_length=min_length,
+            length_unit=length_unit,
+        )
+
+    if texts:
+        try:
+            results = summarize(texts)
+        except Exception as e:
+            # Retry one at a time so only the documents that fail get error records
+            logger.warning(f"Batch of {len(texts)} documents failed ({str(e)}), retrying each")
+            results = []
+            for text in texts:
+                try:
+                    results.append(summarize([text])[0])
+                except Exception as e:
+                    results.append({"error": str(e)})
+        for index, result in zip(positions, results):
+            records[index] = {"id": documents[index][0], **result}
+    return records
+
+
+class Checkpoint:
+    """Tracks how many input documents have been written, next to the output file."""
+
+    def __init__(self, output_path: str):
+        self.path = f"{output_path}.checkpoint"
+        self.completed = 0
+        self.output_bytes = 0
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                state = json.load(f)
+            self.completed = state["completed"]
+            self.output_bytes = state["output_bytes"]
+
+    def save(self, completed: int, output_bytes: int) -> None:
+        """Atomically record progress."""
+        self.completed = completed
+        self.output_bytes = output_bytes
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"completed": completed, "output_bytes": output_bytes}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Summarize every input document; return the number written in this run."""
+    checkpoint = Checkpoint(args.output)
+    if checkpoint.completed and not os.path.exists(args.output):
+        logger.warning("Checkpoint found without its output file, starting over")
+        checkpoint.save(0, 0)
+    if checkpoint.completed:
+        logger.info(f"Resuming after {checkpoint.completed} documents")
+
+    # Drop anything written after the last checkpoint (e.g. a partial line)
+    mode = "r+b" if os.path.exists(args.output) else "wb"
+    out = open(args.output, mode)
+    out.truncate(checkpoint.output_bytes)
+    out.seek(checkpoint.output_bytes)
+
+    documents = itertools.islice(
+        iter_documents(args.inputs, args.text_field, args.id_field), checkpoint.completed, None
+    )
+    batches = iter(lambda: list(itertools.islice(documents, args.batch_size)), [])
+
+    options = {
+        "quantize": args.quantize,
+        "backend": args.backend,
+        "dtype": args.dtype,
+        "low_memory": args.low_memory,
+    }
+    if args.share_weights:
+        # Load in this process; forked workers then see the weights copy-on-write
+        _init_worker(args.model, None, options)
+        model_registry.prepare_fork()
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+    window = args.workers * 2
+    progress = {"completed": checkpoint.completed, "written": 0}
+    start = time.perf_counter()
+
+    def write(records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            out.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        out.flush()
+        progress["completed"] += len(records)
+        progress["written"] += len(records)
+        checkpoint.save(progress["completed"], out.tell())
+        rate = progress["written"] / (time.perf_counter() - start)
+        print(f"{progress['completed']} documents done, {rate:.2f} docs/sec", file=sys.stderr)
+
+    with context.Pool(
+        args.workers, initializer=_init_worker, initargs=(args.model, args.threads, options)
+    ) as pool:
+        # A bounded window of in-flight batches keeps memory flat and output in order
+        pending: deque = deque()
+        for batch in batches:
+            pending.append(
+                pool.apply_async(
+                    _summarize_batch,
+                    (batch, args.max_length, args.min_length, args.length_unit),
+                )
+            )
+            if len(pending) >= window:
+                write(pending.popleft().get())
+        while pending:
+            write(pending.popleft().get())
+
+    out.close()
+    logger.info(
+        f"Wrote {progress['written']} summaries to {args.output} "
+        f"({progress['completed']} total)"
+    )
+    return progress["written"]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Summarize many documents offline")
+    parser.add_argument("inputs", nargs="+", help="JSONL files, text files or directories")
+    parser.add_argument("--output", "-o", required=True, help="Output JSONL file")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--quantize", choices=["int8"], default=None)
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="torch")
+    parser.add_argument("--dtype", default=None, help='Torch dtype, e.g. "bfloat16"')
+    parser.add_argument(
+        "--low-memory", action="store_true", help="Load weights from memory-mapped safetensors"
+    )
+    parser.add_argument(
+        "--share-weights",
+        action="store_true",
+        help="Load the model once and fork workers that share it (not on Windows)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--threads", type=int, default=None, help="Torch threads per worker")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-length", type=int, default=130)
+    parser.add_argument("--min-length", type=int, default=30)
+    parser.add_argument("--length-unit", choices=list(LENGTH_UNITS), default="tokens")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the bulk summarizer from the command line."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Summary caching for the AI Text Summarizer.
+
+Two tiers: a bounded in-process LRU in front of an optional on-disk SQLite store.
+EncoderCache additionally keeps the encoder outputs of recent inputs in memory, so
+re-summarizing a text with different generation parameters only reruns the decoder.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(
+    text: str,
+    model_name: str,
+    max_length: int,
+    min_length: int,
+    do_sample: bool,
+    length_unit: str = "tokens",
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build a cache key from normalized text, model and generation parameters.
+
+    Args:
+        text (str): The input text
+        model_name (str): The name/path of the model
+        max_length (int): Maximum length of the summary
+        min_length (int): Minimum length of the summary
+        do_sample (bool): Whether sampling is used in generation
+        length_unit (str): Unit of max_length and min_length ("tokens" or "words")
+        options (Optional[Dict[str, Any]]): Any other settings that change the summary
+
+    Returns:
+        str: Hex SHA-256 digest identifying the request
+    """
+    normalized = " ".join(text.split())
+    fields = [normalized, model_name, max_length, min_length, do_sample, length_unit]
+    if options:
+        fields.append(options)
+    payload = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """A two-tier (memory LRU + SQLite) cache of summarization results."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        path: Optional[str] = None,
+        max_disk_entries: int = 100_000,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of results kept in memory
+            path (Optional[str]): SQLite database file, or None for memory only
+            max_disk_entries (int): Maximum number of results kept on disk
+            ttl (Optional[float]): Seconds before an entry expires, or None to never expire
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed)"
+            )
+            self._db.commit()
+            logger.info(f"Summary cache using SQLite store at {path}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key (str): Key produced by make_cache_key
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return dict(value)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        self._db.execute(
+                            "UPDATE summaries SET accessed = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        value = json.loads(row[0])
+                        self._remember(key, row[1], value)
+                        self.disk_hits += 1
+                        return dict(value)
+                    self._db.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a result in both tiers.
+
+        Args:
+            key (str): Key produced by make_cache_key
+            value (Dict[str, Any]): JSON-serializable summarization result
+        """
+        now = time.time()
+        value = dict(value)
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, value, created, accessed) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now),
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM summaries")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current sizes."""
+        with self._lock:
+            disk_entries = 0
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+    def close(self) -> None:
+        """Close the SQLite store, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, created: float, value: Dict[str, Any]) -> None:
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM summaries WHERE created < ?", (time.time() - self.ttl,))
+        overflow = (
+            self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            - self.max_disk_entries
+        )
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM summaries WHERE key IN "
+                "(SELECT key FROM summaries ORDER BY accessed LIMIT ?)",
+                (overflow,),
+            )
+
+
+def make_encoder_key(model_id: str, input_ids: Any) -> str:
+    """
+    Build an encoder cache key from a model variant and a batch of input ids.
+
+    Args:
+        model_id (str): Identifies the model, precision and device the outputs came from
+        input_ids (Any): Padded ids as an array with ``shape`` and ``tobytes()`` (numpy)
+
+    Returns:
+        str: Hex SHA-256 digest identifying the encoder input
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([model_id, list(input_ids.shape), str(input_ids.dtype)]).encode())
+    digest.update(input_ids.tobytes())
+    return digest.hexdigest()
+
+
+class EncoderCache:
+    """A bounded in-memory LRU of encoder outputs (hidden-state tensors)."""
+
+    def __init__(self, max_entries: int = 32, max_bytes: Optional[int] = 256 * 2**20):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of encoder outputs kept
+            max_bytes (Optional[int]): Maximum total size of the kept outputs, or None for
+                no limit; an output larger than this is never kept
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up the encoder output of an input.
+
+        Args:
+            key (str): Key produced by make_encoder_key
+
+        Returns:
+            The cached hidden states, or None on a miss. The tensor is shared, so callers
+            must not modify it in place.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, hidden_states: Any) -> None:
+        """
+        Store the encoder output of an input, evicting the least recently used ones.
+
+        Args:
+            key (str): Key produced by make_encoder_key
+            hidden_states (Any): Tensor or array with an ``nbytes`` size
+        """
+        size = int(hidden_states.nbytes)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (hidden_states, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
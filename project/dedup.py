@@ -0,0 +1,251 @@
+"""
+Near-duplicate detection for the AI Text Summarizer.
+
+MinHash signatures over word shingles estimate the Jaccard similarity of two
+normalized texts, and locality-sensitive hashing (LSH) bands find candidate
+matches without comparing against every stored entry. This lets a summary be
+reused for the same story with a different byline, timestamp or footer.
+"""
+
+import copy
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+_SHIFT = np.uint64(32)
+
+FORMAT_VERSION = 1
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """
+    Lowercase word n-grams of text, ignoring punctuation and spacing.
+
+    Args:
+        text (str): The text to shingle
+        size (int): Words per shingle
+
+    Returns:
+        List[str]: The shingles, or the whole normalized text if it is shorter
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)]
+    return [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+
+
+class NearDuplicateIndex:
+    """A bounded, persistable MinHash-LSH index from texts to stored results."""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        max_entries: int = 10_000,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity for a match
+            max_entries (int): Maximum number of stored entries (least recently used
+                entries are evicted first)
+            num_perm (int): MinHash signature length; more is more accurate but slower
+            bands (int): LSH bands; must divide num_perm. More bands find matches at
+                lower similarity at the cost of more candidates to check
+            shingle_size (int): Words per shingle
+            seed (int): Seed of the hash functions, saved with the index
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        # Multiply-shift hash functions (odd multipliers), one per signature position
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+        self._lock = threading.Lock()
+        # id -> (namespace, signature, result)
+        self._entries: "OrderedDict[int, Tuple[str, np.ndarray, Dict[str, Any]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, bytes], Set[int]] = {}
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text (str): The text to fingerprint
+
+        Returns:
+            np.ndarray: ``num_perm`` minimum hash values
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text, self.shingle_size)),
+            dtype=np.uint64,
+        )
+        # uint64 arithmetic wraps, which is what multiply-shift hashing relies on
+        return ((self._a * hashes + self._b) >> _SHIFT).min(axis=1)
+
+    def lookup(
+        self, text: str, namespace: str = "", signature: Optional[np.ndarray] = None
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find a stored result for a near-duplicate of text.
+
+        Args:
+            text (str): The text to look up
+            namespace (str): Only entries added under the same namespace match (e.g. a
+                key of the model and generation parameters)
+            signature (Optional[np.ndarray]): Precomputed signature of text
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], float]]: A copy of the most similar stored
+            result and its estimated similarity, or None if nothing reaches the threshold
+        """
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            candidates: Set[int] = set()
+            for band in self._band_keys(namespace, signature):
+                candidates |= self._buckets.get(band, set())
+
+            best: Optional[Tuple[int, float]] = None
+            for entry_id in candidates:
+                similarity = float(np.mean(self._entries[entry_id][1] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (entry_id, similarity)
+
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best[0])
+            return copy.deepcopy(self._entries[best[0]][2]), best[1]
+
+    def add(
+        self,
+        text: str,
+        result: Dict[str, Any],
+        namespace: str = "",
+        signature: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Store a copy of a result under the fingerprint of text.
+
+        Copies are stored and returned, so callers that annotate their results never
+        change what later lookups return.
+
+        Args:
+            text (str): The text the result belongs to
+            result (Dict[str, Any]): The result to return for near-duplicates
+            namespace (str): See lookup()
+            signature (Optional[np.ndarray]): Precomputed signature of text
+        """
+        if signature is None:
+            signature = self.signature(text)
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._insert(namespace, signature, result)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a JSON file (atomically).
+
+        Args:
+            path (str): Destination file
+        """
+        with self._lock:
+            state = {
+                "version": FORMAT_VERSION,
+                "num_perm": self.num_perm,
+                "shingle_size": self.shingle_size,
+                "seed": self.seed,
+                "entries": [
+                    [namespace, signature.tolist(), result]
+                    for namespace, signature, result in self._entries.values()
+                ],
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """
+        Add the entries of an index saved with save().
+
+        Args:
+            path (str): File written by save()
+        """
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        hashing = (state["num_perm"], state["shingle_size"], state["seed"])
+        if hashing != (self.num_perm, self.shingle_size, self.seed):
+            raise ValueError(
+                f"Index at {path} was built with (num_perm, shingle_size, seed)={hashing}"
+            )
+        with self._lock:
+            for namespace, signature, result in state["entries"]:
+                self._insert(namespace, np.array(signature, dtype=np.uint64), result)
+        logger.info(f"Loaded {len(state['entries'])} near-duplicate entries from {path}")
+
+    def _band_keys(self, namespace: str, signature: np.ndarray) -> List[Tuple[str, int, bytes]]:
+        rows = self.num_perm // self.bands
+        return [
+            (namespace, band, signature[band * rows : (band + 1) * rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _insert(self, namespace: str, signature: np.ndarray, result: Dict[str, Any]) -> None:
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (namespace, signature, result)
+        for band in self._band_keys(namespace, signature):
+            self._buckets.setdefault(band, set()).add(entry_id)
+
+        while len(self._entries) > self.max_entries:
+            old_id, (old_namespace, old_signature, _) = self._entries.popitem(last=False)
+            for band in self._band_keys(old_namespace, old_signature):
+                bucket = self._buckets.get(band)
+                if bucket is not None:
+                    bucket.discard(old_id)
+                    if not bucket:
+                        del self._buckets[band]
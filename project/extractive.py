@@ -0,0 +1,194 @@
+"""
+Extractive summarization with TF-IDF and TextRank, vectorized in NumPy.
+
+Used on its own as the model-free "fast" mode, and in front of the abstractive
+model to keep only the most central sentences of long inputs.
+"""
+
+import logging
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("textrank", "tfidf")
+
+# Split after sentence-ending punctuation followed by whitespace
+_SENTENCE_BOUNDARY = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+")
+
+_WORD = re.compile(r"\w+")
+
+# TextRank random-walk parameters
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences on terminal punctuation.
+
+    Args:
+        text (str): The text to split
+
+    Returns:
+        List of non-empty sentences with surrounding whitespace removed
+    """
+    return [text[start:end].strip() for start, end in sentence_spans(text)]
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Locate sentences in text, as split_sentences does, without copying them.
+
+    Args:
+        text (str): The text to split
+
+    Returns:
+        List of (start, end) character offsets of each non-empty sentence
+    """
+    spans = []
+    start = 0
+    for boundary in _SENTENCE_BOUNDARY.finditer(text):
+        spans.append((start, boundary.start()))
+        start = boundary.end()
+    spans.append((start, len(text)))
+    return [(start, end) for start, end in spans if text[start:end].strip()]
+
+
+def tfidf_matrix(sentences: Sequence[str]) -> np.ndarray:
+    """
+    Build L2-normalized TF-IDF vectors, one row per sentence.
+
+    Args:
+        sentences (Sequence[str]): The sentences to vectorize
+
+    Returns:
+        np.ndarray: Matrix of shape (sentences, vocabulary)
+    """
+    vocabulary: dict = {}
+    rows: List[int] = []
+    columns: List[int] = []
+    for row, sentence in enumerate(sentences):
+        for word in _WORD.findall(sentence.lower()):
+            rows.append(row)
+            columns.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    counts = np.zeros((len(sentences), len(vocabulary)), dtype=np.float32)
+    np.add.at(counts, (rows, columns), 1.0)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    weights = counts * idf.astype(np.float32)
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights / np.where(norms == 0, 1, norms)
+
+
+def score_sentences(sentences: Sequence[str], method: str = "textrank") -> np.ndarray:
+    """
+    Score how central each sentence is to the text.
+
+    Args:
+        sentences (Sequence[str]): The sentences of one text, in order
+        method (str): "textrank" for PageRank over the cosine-similarity graph, or
+            "tfidf" for cosine similarity to the document centroid (faster)
+
+    Returns:
+        np.ndarray: One score per sentence, higher is more important
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unsupported method {method!r}, expected one of {METHODS}")
+    count = len(sentences)
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    vectors = tfidf_matrix(sentences)
+    if method == "tfidf":
+        return vectors @ vectors.mean(axis=0)
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+    totals = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no words with any other jump uniformly
+    transition = np.divide(
+        similarity, totals, out=np.full_like(similarity, 1 / count), where=totals > 0
+    )
+    scores = np.full(count, 1 / count, dtype=np.float32)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def select_sentences(scores: np.ndarray, lengths: Sequence[int], budget: int) -> List[int]:
+    """
+    Pick the best-scoring sentences whose lengths fit in a budget.
+
+    Sentences are taken greedily by score, skipping any that would overflow the
+    budget. The top sentence is always kept, even if it alone is too long.
+
+    Args:
+        scores (np.ndarray): Score of each sentence
+        lengths (Sequence[int]): Length of each sentence, in the budget's unit
+        budget (int): Maximum total length
+
+    Returns:
+        List[int]: Indices of the kept sentences, in their original order
+    """
+    kept: List[int] = []
+    used = 0
+    for index in np.argsort(-scores, kind="stable").tolist():
+        if used + lengths[index] <= budget or not kept:
+            kept.append(index)
+            used += lengths[index]
+        if used >= budget:
+            break
+    return sorted(kept)
+
+
+def extract(
+    sentences: Sequence[str],
+    budget: int,
+    lengths: Optional[Sequence[int]] = None,
+    method: str = "textrank",
+) -> List[int]:
+    """
+    Choose which sentences to keep so that at most ``budget`` length remains.
+
+    Args:
+        sentences (Sequence[str]): The sentences of one text, in order
+        budget (int): Maximum total length of the kept sentences
+        lengths (Optional[Sequence[int]]): Length of each sentence (e.g. in tokens),
+            defaults to word counts
+        method (str): Scoring method, see score_sentences()
+
+    Returns:
+        List[int]: Indices of the kept sentences, in their original order
+    """
+    if lengths is None:
+        lengths = [len(sentence.split()) for sentence in sentences]
+    if sum(lengths) <= budget:
+        return list(range(len(sentences)))
+    return select_sentences(score_sentences(sentences, method), lengths, budget)
+
+
+def extractive_summary(text: str, max_words: int = 100, method: str = "textrank") -> str:
+    """
+    Summarize text by keeping its most central sentences, without a neural model.
+
+    Args:
+        text (str): The text to summarize
+        max_words (int): Maximum number of words in the summary
+        method (str): Scoring method, see score_sentences()
+
+    Returns:
+        str: The kept sentences, joined in their original order
+    """
+    sentences = split_sentences(text)
+    kept = extract(sentences, max_words, method=method)
+    # Drop line breaks from wrapped input so the summary reads as one paragraph
+    return " ".join(" ".join(sentences[i].split()) for i in kept)
@@ -0,0 +1,228 @@
+"""
+Incremental summarization of documents that grow or change over time.
+
+Each document is split into chunks whose boundaries depend on content, not on
+position, so appending text or editing one passage leaves the other chunks
+(and their cached summaries) untouched. Chunk summaries are combined through a
+tree of group summaries; after an update only the changed chunks, their
+ancestors and the top-level summary are regenerated, so a refresh costs time
+proportional to the new text rather than the whole document.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from extractive import split_sentences
+from summarizer import TextSummarizer
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DocumentState:
+    """Cached summaries of one document, keyed by the hash of the text they summarize."""
+
+    def __init__(self):
+        # One dict per tree level: level 0 holds chunk summaries, higher levels group summaries
+        self.levels: List[Dict[str, str]] = []
+        self.root: Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]] = None
+        # Held while the document is refreshed, so its updates apply one after another
+        self.lock = threading.Lock()
+
+
+class IncrementalSummarizer:
+    """Keep per-document summary trees and refresh only what changed."""
+
+    def __init__(
+        self,
+        summarizer: Optional[TextSummarizer] = None,
+        max_chunk_words: int = 400,
+        min_chunk_words: int = 100,
+        boundary_every: int = 4,
+        fanout: int = 6,
+        chunk_max_length: int = 130,
+        max_documents: int = 1024,
+    ):
+        """
+        Initialize the incremental summarizer.
+
+        Args:
+            summarizer (Optional[TextSummarizer]): Generates the summaries, defaults to
+                a TextSummarizer for the default model
+            max_chunk_words (int): Chunks are cut before exceeding this many words
+            min_chunk_words (int): Chunks are never cut at a content boundary before
+                reaching this many words
+            boundary_every (int): On average one sentence in this many ends a chunk
+                (once it has min_chunk_words)
+            fanout (int): Summaries combined into each node of the next tree level
+            chunk_max_length (int): Maximum length of chunk and group summaries
+            max_documents (int): Documents whose trees are kept (least recently
+                updated are dropped first)
+        """
+        if min_chunk_words > max_chunk_words:
+            raise ValueError("min_chunk_words cannot exceed max_chunk_words")
+        if fanout < 2:
+            raise ValueError("fanout must be at least 2")
+        self.summarizer = summarizer if summarizer is not None else TextSummarizer()
+        self.max_chunk_words = max_chunk_words
+        self.min_chunk_words = min_chunk_words
+        self.boundary_every = boundary_every
+        self.fanout = fanout
+        self.chunk_max_length = chunk_max_length
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._documents: "OrderedDict[str, DocumentState]" = OrderedDict()
+
+    def update(
+        self,
+        doc_id: str,
+        text: str,
+        max_length: int = 130,
+        min_length: int = 30,
+        batch_size: int = 8,
+    ) -> Dict[str, Any]:
+        """
+        Summarize the current text of a document, reusing unchanged parts.
+
+        Args:
+            doc_id (str): Identifies the document across updates
+            text (str): The full current text of the document
+            max_length (int): Maximum length of the top-level summary
+            min_length (int): Minimum length of the top-level summary
+            batch_size (int): Number of chunks per forward pass
+
+        Returns:
+            Dict containing the summary text and metadata, plus ``chunks``, ``levels``,
+            ``resummarized`` (texts sent to the model in this update) and ``seconds``
+        """
+        if not text.strip():
+            raise ValueError("Input text cannot be empty")
+
+        start = time.perf_counter()
+        with self._lock:
+            state = self._documents.pop(doc_id, None) or DocumentState()
+            self._documents[doc_id] = state
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+        # Only updates of the same document wait for each other; the model runs
+        # for different documents concurrently
+        with state.lock:
+            text = text.strip()
+            chunks = self.chunk(text)
+            resummarized = 0
+            if len(chunks) == 1:
+                root_text = text
+                levels: List[Dict[str, str]] = []
+            else:
+                nodes = chunks
+                levels = []
+                while True:
+                    memo = state.levels[len(levels)] if len(levels) < len(state.levels) else {}
+                    summaries, current, generated = self._summarize_nodes(nodes, memo, batch_size)
+                    levels.append(current)
+                    resummarized += generated
+                    if len(summaries) <= self.fanout:
+                        break
+                    nodes = [
+                        " ".join(summaries[i : i + self.fanout])
+                        for i in range(0, len(summaries), self.fanout)
+                    ]
+                root_text = " ".join(summaries)
+            # Keep only the summaries the current tree uses
+            state.levels = levels
+
+            root_key = (_digest(root_text), max_length, min_length)
+            if state.root is not None and state.root[0] == root_key:
+                root = state.root[1]
+            else:
+                root = self.summarizer.summarize(root_text, max_length, min_length)
+                state.root = (root_key, root)
+                resummarized += 1
+
+        result: Dict[str, Any] = TextSummarizer._build_result(text, root["summary"])
+        result.update(
+            {
+                "chunks": len(chunks),
+                "levels": len(levels) + 1,
+                "resummarized": resummarized,
+                "seconds": time.perf_counter() - start,
+            }
+        )
+        logger.info(f"Updated {doc_id}: {len(chunks)} chunks, {resummarized} texts re-summarized")
+        return result
+
+    def forget(self, doc_id: str) -> None:
+        """Drop the cached tree of a document."""
+        with self._lock:
+            self._documents.pop(doc_id, None)
+
+    def documents(self) -> List[str]:
+        """Return the ids of documents with a cached tree, least recently updated first."""
+        with self._lock:
+            return list(self._documents)
+
+    def chunk(self, text: str) -> List[str]:
+        """
+        Split text into content-defined chunks of whole sentences.
+
+        A chunk ends after a sentence whose hash selects it as a boundary (once the
+        chunk has ``min_chunk_words``), or before it would exceed ``max_chunk_words``.
+        Because boundaries follow content, an edit only moves the boundaries of the
+        chunk it falls in, and appended text only touches the last chunk.
+
+        Args:
+            text (str): The text to split
+
+        Returns:
+            List[str]: The chunks, in order
+        """
+        chunks: List[str] = []
+        current: List[str] = []
+        words = 0
+        for sentence in split_sentences(text):
+            count = len(sentence.split())
+            if current and words + count > self.max_chunk_words:
+                chunks.append(" ".join(current))
+                current, words = [], 0
+            current.append(sentence)
+            words += count
+            boundary = zlib.crc32(sentence.encode("utf-8")) % self.boundary_every == 0
+            if words >= self.min_chunk_words and boundary:
+                chunks.append(" ".join(current))
+                current, words = [], 0
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def _summarize_nodes(
+        self, nodes: List[str], memo: Dict[str, str], batch_size: int
+    ) -> Tuple[List[str], Dict[str, str], int]:
+        """
+        Summarize one tree level, reusing summaries of unchanged nodes.
+
+        Returns:
+            Tuple of the summaries in order, the memo for this level's current nodes,
+            and how many nodes were sent to the model
+        """
+        keys = [_digest(node) for node in nodes]
+        missing = list(dict.fromkeys(key for key in keys if key not in memo))
+        if missing:
+            texts = {key: node for key, node in zip(keys, nodes)}
+            results = self.summarizer.summarize_many(
+                [texts[key] for key in missing],
+                batch_size=batch_size,
+                max_length=self.chunk_max_length,
+                min_length=0,
+            )
+            memo = {**memo, **{key: r["summary"] for key, r in zip(missing, results)}}
+        current = {key: memo[key] for key in keys}
+        return [current[key] for key in keys], current, len(missing)
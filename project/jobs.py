@@ -0,0 +1,232 @@
+"""
+Background summarization jobs for interactive front ends.
+
+A JobQueue runs submitted documents on a worker thread, batching documents
+with the same settings through TextSummarizer.summarize_many, so a UI can hand
+over dozens of uploads at once and keep rendering progress while they run.
+Finished results are kept on the batch, keyed by content and settings, for the
+caller to copy into its own store (e.g. per browser session) on its own thread;
+passing that store to submit() makes resubmitting with earlier settings instant.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from cache import make_cache_key
+from summarizer import TextSummarizer
+
+logger = logging.getLogger(__name__)
+
+# (max_length, min_length, length_unit, mode): documents can only share a batch if these match
+JobParams = Tuple[int, int, str, str]
+
+
+class DocumentJob:
+    """One document to summarize, and its state."""
+
+    def __init__(self, name: str, text: str, params: JobParams, key: str):
+        self.name = name
+        self.text = text
+        self.params = params
+        self.key = key
+        self.status = "queued"
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.finished: Optional[float] = None
+
+
+class JobBatch:
+    """The documents submitted together, with their combined progress."""
+
+    def __init__(self, jobs: List[DocumentJob]):
+        self.jobs = jobs
+        self.submitted = time.monotonic()
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Summarize the state of the batch.
+
+        Returns:
+            Dict with the number of ``total``, ``done`` (including ``cached``) and
+            ``failed`` documents, ``finished`` and the ``docs_per_second`` so far
+        """
+        done = [job for job in self.jobs if job.status in ("done", "cached")]
+        failed = sum(job.status == "failed" for job in self.jobs)
+        computed = [job.finished for job in done if job.status == "done"]
+        elapsed = (max(computed) - self.submitted) if computed else 0.0
+        return {
+            "total": len(self.jobs),
+            "done": len(done),
+            "cached": len(done) - len(computed),
+            "failed": failed,
+            "finished": len(done) + failed == len(self.jobs),
+            "docs_per_second": len(computed) / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect the results finished so far.
+
+        Returns:
+            Dict of each done or cached document's result under its result_key()
+        """
+        return {
+            job.key: job.result
+            for job in self.jobs
+            if job.status in ("done", "cached") and job.result is not None
+        }
+
+
+class JobQueue:
+    """A FIFO of documents summarized in batches on a background thread."""
+
+    def __init__(self, summarizer: TextSummarizer, batch_size: int = 8):
+        """
+        Initialize the queue and start its worker thread.
+
+        Args:
+            summarizer (TextSummarizer): Runs the model
+            batch_size (int): Most documents summarized in one forward pass
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.summarizer = summarizer
+        self.batch_size = batch_size
+        self._pending: "deque[DocumentJob]" = deque()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._work, name="summarizer-jobs", daemon=True)
+        self._thread.start()
+
+    def result_key(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        length_unit: str,
+        mode: str,
+        profile: Optional[str] = None,
+    ) -> str:
+        """
+        Identify a result by the document content, model and settings.
+
+        Args:
+            profile (Optional[str]): Decoding profile the summary was generated with
+                (e.g. "fast" for summarize_stream()), None for the model's default beam
+                search, which is what the queue uses
+        """
+        model_id = self.summarizer.model_id
+        options = {"mode": mode, "profile": profile}
+        return make_cache_key(text, model_id, max_length, min_length, False, length_unit, options)
+
+    def submit(
+        self,
+        documents: Sequence[Tuple[str, str]],
+        max_length: int = 130,
+        min_length: int = 30,
+        length_unit: str = "tokens",
+        mode: str = "abstractive",
+        results: Optional[Mapping[str, Dict[str, Any]]] = None,
+    ) -> JobBatch:
+        """
+        Queue documents for summarization and return immediately.
+
+        Args:
+            documents (Sequence[Tuple[str, str]]): (name, text) pairs
+            max_length (int): Maximum length of each summary
+            min_length (int): Minimum length of each summary
+            length_unit (str): Unit of max_length and min_length ("tokens" or "words")
+            mode (str): Summary mode, see TextSummarizer.summarize
+            results (Optional[Mapping[str, Dict[str, Any]]]): Earlier results by
+                result_key(); documents already in it are not summarized again. It is
+                only read here, never from the worker thread, see JobBatch.results()
+
+        Returns:
+            JobBatch: Tracks the documents' progress
+        """
+        params: JobParams = (max_length, min_length, length_unit, mode)
+        jobs = []
+        queued = []
+        for name, text in documents:
+            key = self.result_key(text, *params)
+            job = DocumentJob(name, text, params, key)
+            jobs.append(job)
+            if not text.strip():
+                job.status, job.error = "failed", "Input text cannot be empty"
+            elif results is not None and key in results:
+                job.status, job.result = "cached", results[key]
+            else:
+                queued.append(job)
+        with self._condition:
+            self._pending.extend(queued)
+            self._condition.notify()
+        logger.info(f"Queued {len(queued)} of {len(jobs)} documents")
+        return JobBatch(jobs)
+
+    def pending(self) -> int:
+        """Return the number of documents waiting to start."""
+        with self._condition:
+            return len(self._pending)
+
+    def stop(self) -> None:
+        """Stop the worker thread after the batch it is running."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _next_batch(self) -> List[DocumentJob]:
+        with self._condition:
+            while not self._pending and not self._stopping:
+                self._condition.wait()
+            if self._stopping:
+                return []
+            # The oldest document, plus later ones with the same settings
+            first = self._pending.popleft()
+            batch = [first]
+            for job in list(self._pending):
+                if len(batch) >= self.batch_size:
+                    break
+                if job.params == first.params:
+                    self._pending.remove(job)
+                    batch.append(job)
+            for job in batch:
+                job.status = "running"
+            return batch
+
+    def _work(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            max_length, min_length, length_unit, mode = batch[0].params
+            texts = [job.text for job in batch]
+            try:
+                if mode == "abstractive":
+                    outputs = self.summarizer.summarize_many(
+                        texts,
+                        batch_size=self.batch_size,
+                        max_length=max_length,
+                        min_length=min_length,
+                        length_unit=length_unit,
+                    )
+                else:
+                    outputs = [
+                        self.summarizer.summarize(
+                            text, max_length, min_length, length_unit=length_unit, mode=mode
+                        )
+                        for text in texts
+                    ]
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} documents failed: {str(e)}")
+                for job in batch:
+                    job.status, job.error = "failed", str(e)
+                    job.finished = time.monotonic()
+                continue
+
+            finished = time.monotonic()
+            for job, output in zip(batch, outputs):
+                job.result, job.finished, job.status = output, finished, "done"
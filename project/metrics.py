@@ -0,0 +1,112 @@
+"""
+Pluggable metric sinks for summarization stage timings and token counts.
+
+TextSummarizer pushes one record per generated summary to each configured sink.
+A record holds ``model``, ``input_tokens``, ``output_tokens``, ``truncated``,
+``batch_size``, ``tokens_per_second`` and ``timings`` (tokenize/generate/decode/total
+seconds for the batch the summary was generated in).
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("tokenize", "generate", "decode", "total")
+
+
+class MetricSink:
+    """Base class for metric sinks; subclasses implement record()."""
+
+    def record(self, record: Dict[str, Any]) -> None:
+        """
+        Handle the metrics of one generated summary.
+
+        Args:
+            record (Dict[str, Any]): Timings and token counts, see module docstring
+        """
+        raise NotImplementedError
+
+
+class LoggingSink(MetricSink):
+    """Write one log line per summary."""
+
+    def __init__(self, level: int = logging.INFO, logger_name: str = __name__):
+        self.level = level
+        self.logger = logging.getLogger(logger_name)
+
+    def record(self, record: Dict[str, Any]) -> None:
+        timings = record["timings"]
+        self.logger.log(
+            self.level,
+            f"model={record['model']} input_tokens={record['input_tokens']} "
+            f"output_tokens={record['output_tokens']} truncated={record['truncated']} "
+            f"batch_size={record['batch_size']} tokenize={timings['tokenize']:.4f}s "
+            f"generate={timings['generate']:.4f}s decode={timings['decode']:.4f}s "
+            f"tokens_per_second={record['tokens_per_second']:.1f}",
+        )
+
+
+class CallbackSink(MetricSink):
+    """Pass each record to a user-supplied function."""
+
+    def __init__(self, callback: Callable[[Dict[str, Any]], None]):
+        self.callback = callback
+
+    def record(self, record: Dict[str, Any]) -> None:
+        self.callback(record)
+
+
+class PrometheusSink(MetricSink):
+    """Accumulate counters and render them in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = "summarizer"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, int] = {}
+        self._truncated: Dict[str, int] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+        self._stage_seconds: Dict[Tuple[str, str], float] = {}
+
+    def record(self, record: Dict[str, Any]) -> None:
+        model = record["model"]
+        with self._lock:
+            self._summaries[model] = self._summaries.get(model, 0) + 1
+            self._truncated[model] = self._truncated.get(model, 0) + int(record["truncated"])
+            for direction in ("input", "output"):
+                key = (model, direction)
+                self._tokens[key] = self._tokens.get(key, 0) + record[f"{direction}_tokens"]
+            # Batch timings are shared by every summary in the batch, so count them once each
+            share = 1 / record["batch_size"]
+            for stage in STAGES:
+                key = (model, stage)
+                self._stage_seconds[key] = (
+                    self._stage_seconds.get(key, 0.0) + record["timings"][stage] * share
+                )
+
+    def render(self) -> str:
+        """Return all metrics in Prometheus text format."""
+        p = self.prefix
+        with self._lock:
+            lines = [f"# TYPE {p}_summaries_total counter"]
+            lines += [
+                f'{p}_summaries_total{{model="{model}"}} {count}'
+                for model, count in sorted(self._summaries.items())
+            ]
+            lines.append(f"# TYPE {p}_truncated_inputs_total counter")
+            lines += [
+                f'{p}_truncated_inputs_total{{model="{model}"}} {count}'
+                for model, count in sorted(self._truncated.items())
+            ]
+            lines.append(f"# TYPE {p}_tokens_total counter")
+            lines += [
+                f'{p}_tokens_total{{model="{model}",direction="{direction}"}} {count}'
+                for (model, direction), count in sorted(self._tokens.items())
+            ]
+            lines.append(f"# TYPE {p}_stage_seconds_total counter")
+            lines += [
+                f'{p}_stage_seconds_total{{model="{model}",stage="{stage}"}} {seconds:.6f}'
+                for (model, stage), seconds in sorted(self._stage_seconds.items())
+            ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,224 @@
+"""
+Hosting several summarization models in one process.
+
+A ModelPool hands out one TextSummarizer per model name, keeps the loaded
+models within a memory budget by unloading the least recently used ones, and
+limits how many generations run on each model at once, so a request for a
+rarely used model cannot push the host out of memory or starve the others.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from summarizer import DEFAULT_MODEL, ModelRegistry, TextSummarizer
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPool:
+    """Several TextSummarizers behind one interface, with LRU eviction and concurrency caps."""
+
+    def __init__(
+        self,
+        models: Optional[Sequence[str]] = None,
+        memory_budget: Optional[int] = None,
+        max_models: Optional[int] = None,
+        max_concurrency: int = 1,
+        default_model: str = DEFAULT_MODEL,
+        registry: Optional[ModelRegistry] = None,
+        **options: Any,
+    ):
+        """
+        Initialize the pool (models are loaded on first use).
+
+        Args:
+            models (Optional[Sequence[str]]): Model names that may be requested, or None
+                to allow any
+            memory_budget (Optional[int]): Bytes of model weights kept loaded; least
+                recently used models are unloaded to stay within it (models whose size
+                is unknown, such as ONNX ones, only count towards max_models)
+            max_models (Optional[int]): Maximum number of models kept loaded
+            max_concurrency (int): Generations allowed to run on one model at a time
+            default_model (str): Model used when a request names none
+            registry (Optional[ModelRegistry]): Where the pool's pipelines are loaded,
+                defaults to a private registry so evictions never affect summarizers
+                outside the pool
+            **options: Passed on to every TextSummarizer (e.g. dtype, quantize, cache)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if models is not None and default_model not in models:
+            models = [default_model, *models]
+        self.models = list(models) if models is not None else None
+        self.memory_budget = memory_budget
+        self.max_models = max_models
+        self.max_concurrency = max_concurrency
+        self.default_model = default_model
+        self.options = options
+        self.registry = registry if registry is not None else ModelRegistry()
+        self._lock = threading.Lock()
+        self._summarizers: Dict[str, TextSummarizer] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        # Loaded models, least recently used first
+        self._loaded: "OrderedDict[str, None]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._active: Dict[str, int] = {}
+        self.requests: Dict[str, int] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def summarizer(self, model_name: Optional[str] = None) -> TextSummarizer:
+        """
+        Return the pool's TextSummarizer for a model, without loading it.
+
+        Args:
+            model_name (Optional[str]): The model, defaults to default_model
+
+        Returns:
+            TextSummarizer: The summarizer shared by all requests for that model
+        """
+        if model_name is not None and not isinstance(model_name, str):
+            raise ValueError(f"Model names must be strings, got {type(model_name).__name__}")
+        model_name = model_name or self.default_model
+        if self.models is not None and model_name not in self.models:
+            raise ValueError(f"Unsupported model {model_name!r}, expected one of {self.models}")
+        with self._lock:
+            if model_name not in self._summarizers:
+                self._summarizers[model_name] = TextSummarizer(
+                    model_name, registry=self.registry, **self.options
+                )
+                self._semaphores[model_name] = threading.BoundedSemaphore(self.max_concurrency)
+            return self._summarizers[model_name]
+
+    @contextmanager
+    def acquire(self, model_name: Optional[str] = None) -> Iterator[TextSummarizer]:
+        """
+        Reserve one of a model's concurrency slots and make sure it is loaded.
+
+        Waits while ``max_concurrency`` generations are already running on the model.
+        The model is never evicted while a slot is held.
+
+        Args:
+            model_name (Optional[str]): The model, defaults to default_model
+
+        Yields:
+            TextSummarizer: The loaded summarizer for the model
+        """
+        summarizer = self.summarizer(model_name)
+        model_name = summarizer.model_name
+        with self._semaphores[model_name]:
+            with self._lock:
+                self._active[model_name] = self._active.get(model_name, 0) + 1
+                self.requests[model_name] = self.requests.get(model_name, 0) + 1
+                loaded = model_name in self._loaded
+                if loaded:
+                    self._loaded.move_to_end(model_name)
+                else:
+                    # Make room up front when the model's size is known from an earlier load
+                    self._evict(self._sizes.get(model_name, 0), keep=model_name)
+            try:
+                if not loaded:
+                    self._load(summarizer)
+                yield summarizer
+            finally:
+                with self._lock:
+                    self._active[model_name] -= 1
+
+    def summarize(
+        self, text: str, model_name: Optional[str] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Summarize a text with one of the pool's models.
+
+        Args:
+            text (str): The text to summarize
+            model_name (Optional[str]): The model, defaults to default_model
+            **kwargs: Passed on to TextSummarizer.summarize
+
+        Returns:
+            Dict containing the summary text and metadata
+        """
+        with self.acquire(model_name) as summarizer:
+            return summarizer.summarize(text, **kwargs)
+
+    def summarize_many(
+        self, texts: Sequence[str], model_name: Optional[str] = None, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Summarize many texts with one of the pool's models.
+
+        Args:
+            texts (Sequence[str]): The texts to summarize
+            model_name (Optional[str]): The model, defaults to default_model
+            **kwargs: Passed on to TextSummarizer.summarize_many
+
+        Returns:
+            List of result dicts, in the same order as ``texts``
+        """
+        with self.acquire(model_name) as summarizer:
+            return summarizer.summarize_many(texts, **kwargs)
+
+    def loaded_models(self) -> List[str]:
+        """Return the loaded models, least recently used first."""
+        with self._lock:
+            return list(self._loaded)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load/eviction counters and per-model usage."""
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "loaded": len(self._loaded),
+                "memory_bytes": sum(self._sizes.get(name, 0) for name in self._loaded),
+                "models": {
+                    name: {
+                        "loaded": name in self._loaded,
+                        "active": self._active.get(name, 0),
+                        "requests": self.requests.get(name, 0),
+                        "memory_bytes": self._sizes.get(name),
+                    }
+                    for name in self._summarizers
+                },
+            }
+
+    def _load(self, summarizer: TextSummarizer) -> None:
+        model_name = summarizer.model_name
+        summarizer.summarizer
+        size = summarizer.memory_usage()["model_bytes"] or 0
+        with self._lock:
+            # Another slot of the same model may have finished loading it first
+            if model_name in self._loaded:
+                return
+            self.loads += 1
+            self._sizes[model_name] = size
+            self._loaded[model_name] = None
+            self._evict(0, keep=model_name)
+        logger.info(f"Pool loaded {model_name} ({size / 2**20:.0f} MiB of weights)")
+
+    def _evict(self, incoming: int, keep: str) -> None:
+        """Unload idle models, least recently used first, until ``incoming`` more bytes fit."""
+        # Called with self._lock held
+        for name in list(self._loaded):
+            if self._within_budget(incoming, keep):
+                return
+            if name == keep or self._active.get(name, 0):
+                continue
+            del self._loaded[name]
+            self._summarizers[name].unload()
+            self.evictions += 1
+            logger.info(f"Pool evicted {name}")
+        if not self._within_budget(incoming, keep):
+            logger.warning("Model pool is over budget, every other loaded model is in use")
+
+    def _within_budget(self, incoming: int, keep: str) -> bool:
+        count = len(self._loaded) + (keep not in self._loaded)
+        if self.max_models is not None and count > self.max_models:
+            return False
+        if self.memory_budget is None:
+            return True
+        used = sum(self._sizes.get(name, 0) for name in self._loaded)
+        return used + incoming <= self.memory_budget
@@ -0,0 +1,309 @@
+"""
+Input cleaning for scraped text.
+
+Pages copied or scraped from the web carry HTML remnants, runs of whitespace,
+navigation and cookie-banner lines and repeated paragraphs, all of which use up
+the model's input budget without adding anything to the summary. TextCleaner
+removes them with precompiled patterns in a single pass over the lines, and can
+be fed a document in pieces (e.g. while it downloads), emitting each paragraph
+as soon as it is complete. Wrapped lines are joined into paragraphs before
+anything is judged to be boilerplate, so hard-wrapped prose is never cut up.
+"""
+
+import html
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Short paragraphs matching any of these are navigation, consent or sharing chrome.
+# Calls to action only count at the start, so a sentence that merely mentions
+# subscribing or a privacy policy is kept.
+BOILERPLATE_PATTERNS: Tuple[str, ...] = (
+    r"\bwe use cookies\b",
+    r"\b(accept|reject|allow|manage) (all )?cookies\b",
+    r"\bcookie (policy|settings|preferences)\b",
+    r"\ball rights reserved\b",
+    r"©",
+    r"^skip to (main )?content\b",
+    r"^(sign|log) (in|up|out)\b",
+    r"^subscribe\b",
+    r"^(our |the )?newsletter\b",
+    r"^share (this|on)\b",
+    r"^follow us\b",
+    r"^advertisement\b",
+    r"^privacy policy\b",
+    r"^terms (of (use|service)|and conditions)\b",
+    r"^read more\b",
+    r"^click here\b",
+    r"^related (articles|stories|posts)\b",
+    r"^(home|menu|search|back to top|next|previous)$",
+    # Menus: short items separated by bars or bullets, with no sentence punctuation
+    r"^[^.!?]+(\s[|·•»]\s[^.!?]+)+$",
+)
+
+# Paragraphs with more words than this are kept even if they match a pattern
+MAX_BOILERPLATE_WORDS = 12
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HIDDEN_TAGS = "script|style|noscript|template"
+# Only these are stripped, so plain text such as "if a<b and c>d" keeps its comparisons
+_HTML_TAGS = (
+    r"a|abbr|address|area|article|aside|audio|b|base|bdi|bdo|blockquote|body|br|button|"
+    r"canvas|caption|center|cite|code|col|colgroup|data|dd|del|details|dfn|dialog|div|dl|dt|"
+    r"em|embed|fieldset|figcaption|figure|font|footer|form|h[1-6]|head|header|hr|html|i|"
+    r"iframe|img|input|ins|kbd|label|legend|li|link|main|mark|meta|nav|noscript|object|ol|"
+    r"optgroup|option|output|p|picture|pre|q|s|samp|script|section|select|small|source|span|"
+    r"strong|style|sub|summary|sup|svg|table|tbody|td|template|textarea|tfoot|th|thead|time|"
+    r"title|tr|track|u|ul|var|video|wbr"
+)
+# Evidence that a document is markup at all; until it is seen, tags are not stripped
+_MARKUP_RE = re.compile(rf"</(?:{_HTML_TAGS})\s*>|<!--|<!doctype\b|<br\s*/?>", re.I)
+_HIDDEN_RE = re.compile(rf"<({_HIDDEN_TAGS})\b[^>]*>.*?</\1\s*>", re.DOTALL | re.I)
+_BREAK_RE = re.compile(r"<br\s*/?>", re.I)
+_BLOCK_RE = re.compile(
+    r"</?(p|div|section|article|header|footer|nav|aside|main|li|ul|ol|tr|table|blockquote|"
+    r"h[1-6])\b[^>]*>",
+    re.I,
+)
+_TAG_RE = re.compile(rf"</?(?:{_HTML_TAGS})(?:\s[^<>]*)?/?>", re.I)
+# Any whitespace but newlines (including non-breaking spaces), and zero-width characters
+_SPACE_RE = re.compile(r"[^\S\n]+")
+_INVISIBLE_RE = re.compile(r"[\u200b\u200c\u200d\u2060\ufeff]")
+_WORD_RE = re.compile(r"\w")
+# Markup delimiters, scanned once to find where a fed piece can be cut safely
+_SCAN_RE = re.compile(
+    rf"(?P<comment><!--)|(?P<end_comment>-->)|(?P<hidden></?(?:{_HIDDEN_TAGS})\b)"
+    r"|(?P<tag><[a-zA-Z/!])|(?P<close>>)|(?P<newline>\n)",
+    re.I,
+)
+
+
+class TextCleaner:
+    """Strips HTML, whitespace runs, boilerplate lines and repeated paragraphs."""
+
+    def __init__(
+        self,
+        strip_html: bool = True,
+        boilerplate: Optional[Sequence[str]] = BOILERPLATE_PATTERNS,
+        max_boilerplate_words: int = MAX_BOILERPLATE_WORDS,
+        dedupe: bool = True,
+    ):
+        """
+        Initialize the cleaner.
+
+        Args:
+            strip_html (bool): Remove HTML tags, comments and script/style blocks, and
+                decode entities, once the document shows it is markup (a closing tag,
+                comment, doctype or line break); plain text is left as it is
+            boilerplate (Optional[Sequence[str]]): Case-insensitive patterns of
+                paragraphs to drop, or None to keep every paragraph
+            max_boilerplate_words (int): Only paragraphs with at most this many words are
+                checked against ``boilerplate``, so real prose is never dropped
+            dedupe (bool): Drop paragraphs that repeat an earlier one (ignoring case
+                and spacing)
+        """
+        self.strip_html = strip_html
+        self.max_boilerplate_words = max_boilerplate_words
+        self.dedupe = dedupe
+        self._boilerplate = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in boilerplate), re.I)
+            if boilerplate
+            else None
+        )
+        self._pending = ""
+        # Whether this document has shown any markup yet
+        self._markup = False
+        # How far into _pending markup has been scanned, and what that position is inside
+        # ("tag", "hidden_tag", "hidden", "comment" or None)
+        self._scanned = 0
+        self._inside: Optional[str] = None
+        self._paragraph: List[str] = []
+        self._seen: set = set()
+        self._report = {
+            "characters_before": 0,
+            "characters_after": 0,
+            "words_before": 0,
+            "words_after": 0,
+            "removed_paragraphs": 0,
+            "duplicate_paragraphs": 0,
+            "seconds": 0.0,
+        }
+        self._emitted = 0
+
+    def feed(self, piece: str) -> str:
+        """
+        Clean the next piece of a document.
+
+        Text after the last complete line (or inside an unfinished tag) is held back
+        until the next piece or finish(), and a paragraph is only emitted once the
+        blank line that ends it has been seen.
+
+        Args:
+            piece (str): The next part of the document
+
+        Returns:
+            str: Cleaned paragraphs completed by this piece, separated by blank lines
+        """
+        start = time.perf_counter()
+        self._report["characters_before"] += len(piece)
+        self._report["words_before"] += len(piece.split())
+        text = self._pending + piece
+        cut = self._safe_cut(text)
+        self._pending = text[cut:]
+        self._scanned -= cut
+        cleaned = self._clean(text[:cut])
+        self._report["seconds"] += time.perf_counter() - start
+        return cleaned
+
+    def finish(self) -> str:
+        """
+        Clean whatever is still held back; the cleaner can then start a new document.
+
+        Returns:
+            str: The remaining cleaned paragraphs
+        """
+        start = time.perf_counter()
+        text, self._pending = self._pending, ""
+        self._scanned, self._inside = 0, None
+        cleaned = self._clean(text, final=True)
+        self._markup = False
+        self._report["seconds"] += time.perf_counter() - start
+        return cleaned
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Describe what has been removed so far.
+
+        Returns:
+            Dict with characters and words before and after cleaning, the number of
+            ``removed_paragraphs`` (boilerplate) and ``duplicate_paragraphs``, and the
+            ``seconds`` spent
+        """
+        return dict(self._report)
+
+    def _safe_cut(self, text: str) -> int:
+        """
+        Index up to which ``text`` can be cleaned without seeing what follows.
+
+        That is the last newline outside any tag, comment or script/style block. The
+        scan resumes where the previous piece's stopped, so each character of a
+        document is scanned once however long a block stays open.
+        """
+        end = text.rfind("\n") + 1
+        if not self.strip_html:
+            return end
+        cut = 0
+        for match in _SCAN_RE.finditer(text, self._scanned, end):
+            kind = match.lastgroup
+            inside = self._inside
+            if kind == "newline":
+                if inside is None:
+                    cut = match.end()
+            elif inside == "comment":
+                if kind == "end_comment":
+                    self._inside = None
+            elif inside == "hidden":
+                if kind == "hidden" and match.group().startswith("</"):
+                    self._inside = "tag"
+            elif inside in ("tag", "hidden_tag"):
+                if kind == "close":
+                    self._inside = "hidden" if inside == "hidden_tag" else None
+            elif kind == "comment":
+                self._inside = "comment"
+            elif kind == "hidden":
+                self._inside = "tag" if match.group().startswith("</") else "hidden_tag"
+            elif kind == "tag":
+                self._inside = "tag"
+        self._scanned = end
+        return cut
+
+    def _clean(self, text: str, final: bool = False) -> str:
+        if self.strip_html and not self._markup:
+            self._markup = _MARKUP_RE.search(text) is not None
+        if self._markup:
+            text = _COMMENT_RE.sub(" ", text)
+            text = _HIDDEN_RE.sub(" ", text)
+            text = _BREAK_RE.sub("\n", text)
+            text = _BLOCK_RE.sub("\n\n", text)
+            text = _TAG_RE.sub(" ", text)
+            text = html.unescape(text)
+        text = _INVISIBLE_RE.sub("", text)
+
+        lines = text.split("\n")
+        if not final:
+            # Fed text ends with a newline, which does not end the paragraph
+            lines.pop()
+        paragraphs = []
+        for line in lines:
+            line = _SPACE_RE.sub(" ", line).strip()
+            if line:
+                self._paragraph.append(line)
+            else:
+                paragraphs.extend(self._end_paragraph())
+        if final:
+            paragraphs.extend(self._end_paragraph())
+            self._seen.clear()
+
+        cleaned = "\n\n".join(paragraphs)
+        if cleaned and self._emitted:
+            # Separate from the paragraphs returned by earlier calls
+            cleaned = "\n\n" + cleaned
+        if cleaned:
+            self._report["characters_after"] += len(cleaned)
+            self._report["words_after"] += len(cleaned.split())
+            self._emitted += len(paragraphs)
+        if final:
+            self._emitted = 0
+        return cleaned
+
+    def _end_paragraph(self) -> List[str]:
+        if not self._paragraph:
+            return []
+        paragraph = " ".join(self._paragraph)
+        self._paragraph = []
+        if self._is_boilerplate(paragraph):
+            self._report["removed_paragraphs"] += 1
+            return []
+        if self.dedupe:
+            fingerprint = " ".join(paragraph.casefold().split())
+            if fingerprint in self._seen:
+                self._report["duplicate_paragraphs"] += 1
+                return []
+            self._seen.add(fingerprint)
+        return [paragraph]
+
+    def _is_boilerplate(self, paragraph: str) -> bool:
+        if not _WORD_RE.search(paragraph):
+            # Separators and icon rows such as "|", "•••" or "» »"
+            return True
+        if self._boilerplate is None or len(paragraph.split()) > self.max_boilerplate_words:
+            return False
+        return self._boilerplate.search(paragraph) is not None
+
+
+def clean_text(
+    text: str,
+    count_tokens: Optional[Callable[[str], int]] = None,
+    **options: Any,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Clean a whole document in one call.
+
+    Args:
+        text (str): The raw text or HTML
+        count_tokens (Optional[Callable[[str], int]]): Counts model tokens (e.g. with the
+            summarizer's tokenizer); when given, the report includes ``tokens_before``,
+            ``tokens_after`` and ``tokens_saved``
+        **options: Passed to TextCleaner
+
+    Returns:
+        Tuple of the cleaned text and the cleaner's report
+    """
+    cleaner = TextCleaner(**options)
+    cleaned = cleaner.feed(text) + cleaner.finish()
+    report = cleaner.report()
+    if count_tokens is not None:
+        report["tokens_before"] = count_tokens(text)
+        report["tokens_after"] = count_tokens(cleaned) if cleaned else 0
+        report["tokens_saved"] = report["tokens_before"] - report["tokens_after"]
+    return cleaned, report
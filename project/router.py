@@ -0,0 +1,147 @@
+"""
+Cascade routing between a small distilled model and the full BART-large-CNN.
+
+Short, plainly written inputs are summarized by the small model, which needs a
+fraction of the CPU time; long inputs, or ones with long and dense sentences,
+go to the large model. Routing only looks at word and sentence counts, so it
+costs no tokenization or model time of its own.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from extractive import split_sentences
+from summarizer import DEFAULT_MODEL, TextSummarizer
+
+logger = logging.getLogger(__name__)
+
+# DistilBART distilled from bart-large-cnn: same tokenizer and output style, ~2x faster
+DEFAULT_SMALL_MODEL = "sshleifer/distilbart-cnn-6-6"
+
+TIERS = ("small", "large")
+
+
+class CascadeRouter:
+    """Send each input to a small or a large summarizer based on its size."""
+
+    def __init__(
+        self,
+        small: Optional[TextSummarizer] = None,
+        large: Optional[TextSummarizer] = None,
+        max_small_words: int = 300,
+        max_small_sentence_words: float = 30.0,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            small (Optional[TextSummarizer]): Summarizer for easy inputs, defaults to
+                DEFAULT_SMALL_MODEL
+            large (Optional[TextSummarizer]): Summarizer for hard inputs, defaults to
+                DEFAULT_MODEL
+            max_small_words (int): Longest input, in words, sent to the small model
+            max_small_sentence_words (float): Highest average sentence length, in words,
+                sent to the small model
+        """
+        self.small = small if small is not None else TextSummarizer(DEFAULT_SMALL_MODEL)
+        self.large = large if large is not None else TextSummarizer(DEFAULT_MODEL)
+        self.max_small_words = max_small_words
+        self.max_small_sentence_words = max_small_sentence_words
+        self._lock = threading.Lock()
+        self.routed = {tier: 0 for tier in TIERS}
+
+    def route(self, text: str) -> Tuple[str, str]:
+        """
+        Decide which tier summarizes a text.
+
+        Args:
+            text (str): The text to summarize
+
+        Returns:
+            Tuple of the tier ("small" or "large") and a short reason
+        """
+        words = len(text.split())
+        if words > self.max_small_words:
+            return "large", f"{words} words > {self.max_small_words}"
+        sentence_words = words / max(len(split_sentences(text)), 1)
+        if sentence_words > self.max_small_sentence_words:
+            return (
+                "large",
+                f"{sentence_words:.1f} words per sentence > {self.max_small_sentence_words}",
+            )
+        return "small", f"{words} words, {sentence_words:.1f} words per sentence"
+
+    def summarize(self, text: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Summarize one text with the tier chosen by route().
+
+        Args:
+            text (str): The text to summarize
+            **kwargs: Passed on to TextSummarizer.summarize
+
+        Returns:
+            Dict containing the summary text and metadata, plus ``route`` with the
+            tier, model and reason
+        """
+        if not text.strip():
+            raise ValueError("Input text cannot be empty")
+        tier, reason = self.route(text)
+        summarizer = self._summarizer(tier)
+        result = summarizer.summarize(text, **kwargs)
+        self._record(tier, 1)
+        return self._with_route(result, tier, summarizer, reason)
+
+    def summarize_many(self, texts: Sequence[str], **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Summarize many texts, batching each tier's share separately.
+
+        Args:
+            texts (Sequence[str]): The texts to summarize
+            **kwargs: Passed on to TextSummarizer.summarize_many
+
+        Returns:
+            List of result dicts with ``route``, in the same order as ``texts``
+        """
+        for index, text in enumerate(texts):
+            if not text.strip():
+                raise ValueError(f"Input text at position {index} cannot be empty")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        routes = [self.route(text) for text in texts]
+        for tier in TIERS:
+            indices = [i for i, (routed, _) in enumerate(routes) if routed == tier]
+            if not indices:
+                continue
+            summarizer = self._summarizer(tier)
+            outputs = summarizer.summarize_many([texts[i] for i in indices], **kwargs)
+            self._record(tier, len(indices))
+            for i, output in zip(indices, outputs):
+                results[i] = self._with_route(output, tier, summarizer, routes[i][1])
+        return results
+
+    def preload(self, background: bool = True, warmup: bool = True) -> None:
+        """Load both models ahead of the first request, see TextSummarizer.preload."""
+        for summarizer in (self.small, self.large):
+            summarizer.preload(background=background, warmup=warmup)
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many texts each tier has summarized."""
+        with self._lock:
+            return dict(self.routed)
+
+    def _summarizer(self, tier: str) -> TextSummarizer:
+        return self.small if tier == "small" else self.large
+
+    def _record(self, tier: str, count: int) -> None:
+        with self._lock:
+            self.routed[tier] += count
+
+    @staticmethod
+    def _with_route(
+        result: Dict[str, Any], tier: str, summarizer: TextSummarizer, reason: str
+    ) -> Dict[str, Any]:
+        # Results may be shared with the cache, so annotate a copy
+        routed = dict(result)
+        routed["route"] = {"tier": tier, "model": summarizer.model_id, "reason": reason}
+        return routed
@@ -0,0 +1,165 @@
+"""
+Asyncio micro-batching for the AI Text Summarizer.
+
+Concurrent requests are collected for a few milliseconds and run as one
+batched generation on a worker thread, so the event loop is never blocked.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from summarizer import TextSummarizer
+
+logger = logging.getLogger(__name__)
+
+# (max_length, min_length, do_sample, length_unit): requests can only share a batch if
+# these match
+GenerationParams = Tuple[int, int, bool, str]
+
+
+class BatchScheduler:
+    """Coalesce concurrent summarization requests into batched generations."""
+
+    def __init__(
+        self,
+        summarizer: "TextSummarizer",
+        max_batch_size: int = 16,
+        max_wait: float = 0.005,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            summarizer (TextSummarizer): The summarizer that runs the batches
+            max_batch_size (int): Maximum number of requests per batch
+            max_wait (float): Seconds to wait for more requests after the first arrives
+            executor (Optional[ThreadPoolExecutor]): Where batches run, defaults to a
+                single dedicated worker thread
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait cannot be negative")
+
+        self.summarizer = summarizer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="summarizer-batch"
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(
+        self,
+        text: str,
+        max_length: int = 130,
+        min_length: int = 30,
+        do_sample: bool = False,
+        length_unit: str = "tokens",
+    ) -> Dict[str, Any]:
+        """
+        Queue one request and wait for its result.
+
+        Args:
+            text (str): The text to summarize
+            max_length (int): Maximum length of the summary
+            min_length (int): Minimum length of the summary
+            do_sample (bool): Whether to use sampling in generation
+            length_unit (str): Unit of max_length and min_length ("tokens" or "words")
+
+        Returns:
+            Dict containing the summary text and metadata
+        """
+        # Validate up front so one bad input cannot fail a whole batch
+        if not text.strip():
+            raise ValueError("Input text cannot be empty")
+
+        loop = asyncio.get_running_loop()
+        self._ensure_running(loop)
+        future = loop.create_future()
+        await self._queue.put(((max_length, min_length, do_sample, length_unit), text, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the batching task and release the worker thread."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    def _ensure_running(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Queues and tasks belong to one event loop; start fresh if the loop changed
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            groups: Dict[GenerationParams, List[Tuple[str, asyncio.Future]]] = {}
+            for params, text, future in batch:
+                if not future.done():
+                    groups.setdefault(params, []).append((text, future))
+
+            for params, items in groups.items():
+                await self._execute(loop, items, *params)
+
+    async def _execute(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        items: List[Tuple[str, asyncio.Future]],
+        max_length: int,
+        min_length: int,
+        do_sample: bool,
+        length_unit: str,
+    ) -> None:
+        call = partial(
+            self.summarizer.summarize_many,
+            [text for text, _ in items],
+            batch_size=len(items),
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=do_sample,
+            length_unit=length_unit,
+        )
+        try:
+            results = await loop.run_in_executor(self._executor, call)
+        except Exception as e:
+            logger.error(f"Batched summarization of {len(items)} requests failed: {str(e)}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.requests += len(items)
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,523 @@
+"""
+Headless HTTP inference server for the AI Text Summarizer.
+
+Run from the project directory:
+
+    python -m serve --port 8000
+
+Endpoints:
+    POST /summarize         {"text": "...", "max_length": 130, "min_length": 30}
+    POST /summarize/batch   {"texts": ["...", "..."], "max_length": 130, "min_length": 30}
+    GET  /healthz           Process is up
+    GET  /readyz            Model is loaded and requests are accepted
+    GET  /metrics           Prometheus text format
+
+Lengths count tokens; add "length_unit": "words" to a request to give them in words.
+Generation is stopped when a request's timeout runs out, picking the best decoding
+profile expected to finish in time; "profile" ("fast", "balanced" or "quality") forces one.
+When started with --models, "model" picks one of those models from a ModelPool.
+"""
+
+import argparse
+import json
+import logging
+import math
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import PrometheusSink
+from pool import ModelPool
+from summarizer import DEFAULT_MODEL, GENERATION_PROFILES, LENGTH_UNITS, TextSummarizer
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTooLarge(ValueError):
+    """The request body is over the server's size limit."""
+
+
+class Job:
+    """One queued request: a list of texts sharing generation parameters."""
+
+    def __init__(
+        self,
+        texts: List[str],
+        max_length: int,
+        min_length: int,
+        timeout: float,
+        length_unit: str = "tokens",
+        profile: Optional[str] = None,
+        model: Optional[str] = None,
+    ):
+        self.texts = texts
+        self.params = (max_length, min_length, length_unit, profile, model)
+        self.deadline = time.monotonic() + timeout
+        self.done = threading.Event()
+        self.results: Optional[List[Dict[str, Any]]] = None
+        self.error: Optional[Exception] = None
+        self.cancelled = False
+
+
+class ServerMetrics:
+    """Thread-safe counters rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses: Dict[Tuple[str, int], int] = {}
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    def record_response(self, path: str, status: int, seconds: float) -> None:
+        with self._lock:
+            key = (path, status)
+            self.responses[key] = self.responses.get(key, 0) + 1
+            if status == 200 and path.startswith("/summarize"):
+                self.latency_sum += seconds
+                self.latency_count += 1
+
+    def record_batch(self, size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_texts += size
+
+    def render(
+        self, queue_depth: int, queue_capacity: int, ready: bool, memory: Dict[str, Any]
+    ) -> str:
+        with self._lock:
+            lines = [
+                "# TYPE summarizer_http_responses_total counter",
+                *(
+                    f'summarizer_http_responses_total{{path="{path}",status="{status}"}} {count}'
+                    for (path, status), count in sorted(self.responses.items())
+                ),
+                "# TYPE summarizer_request_seconds summary",
+                f"summarizer_request_seconds_sum {self.latency_sum:.6f}",
+                f"summarizer_request_seconds_count {self.latency_count}",
+                "# TYPE summarizer_batches_total counter",
+                f"summarizer_batches_total {self.batches}",
+                "# TYPE summarizer_batched_texts_total counter",
+                f"summarizer_batched_texts_total {self.batched_texts}",
+                "# TYPE summarizer_queue_depth gauge",
+                f"summarizer_queue_depth {queue_depth}",
+                "# TYPE summarizer_queue_capacity gauge",
+                f"summarizer_queue_capacity {queue_capacity}",
+                "# TYPE summarizer_ready gauge",
+                f"summarizer_ready {int(ready)}",
+                "# TYPE summarizer_model_loaded gauge",
+                f"summarizer_model_loaded {int(memory['loaded'])}",
+            ]
+        gauges = {
+            "summarizer_resident_memory_bytes": memory["resident_bytes"],
+            "summarizer_model_memory_bytes": memory["model_bytes"],
+        }
+        for metric, value in gauges.items():
+            # Unknown on some platforms and backends
+            if value is not None:
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def render_pool(stats: Dict[str, Any]) -> str:
+        lines = [
+            "# TYPE summarizer_pool_loads_total counter",
+            f"summarizer_pool_loads_total {stats['loads']}",
+            "# TYPE summarizer_pool_evictions_total counter",
+            f"summarizer_pool_evictions_total {stats['evictions']}",
+            "# TYPE summarizer_pool_loaded_models gauge",
+            f"summarizer_pool_loaded_models {stats['loaded']}",
+            "# TYPE summarizer_pool_memory_bytes gauge",
+            f"summarizer_pool_memory_bytes {stats['memory_bytes']}",
+            "# TYPE summarizer_pool_active gauge",
+            *(
+                f'summarizer_pool_active{{model="{name}"}} {model["active"]}'
+                for name, model in sorted(stats["models"].items())
+            ),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class SummaryServer:
+    """Bounded-queue front end that feeds batched work to a TextSummarizer."""
+
+    def __init__(
+        self,
+        summarizer: TextSummarizer,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        queue_size: int = 64,
+        workers: int = 1,
+        max_batch_size: int = 8,
+        request_timeout: float = 30.0,
+        max_texts_per_request: int = 64,
+        pool: Optional[ModelPool] = None,
+        max_summary_length: int = 1024,
+        max_body_bytes: int = 16 * 2**20,
+    ):
+        """
+        Initialize the server (call start() to begin serving).
+
+        Args:
+            summarizer (TextSummarizer): The summarizer that runs the model
+            host (str): Interface to bind
+            port (int): Port to bind, 0 for an ephemeral port
+            queue_size (int): Maximum queued requests before returning 429
+            workers (int): Threads pulling work from the queue
+            max_batch_size (int): Maximum texts coalesced into one generation
+            request_timeout (float): Seconds a request may wait before returning 504
+            max_texts_per_request (int): Maximum texts accepted by the batch endpoint
+            pool (Optional[ModelPool]): Serves requests that name a "model"; others use
+                summarizer. It must list its models, since clients pick among them
+            max_summary_length (int): Largest max_length a request may ask for (BART
+                generates at most 1024 positions)
+            max_body_bytes (int): Largest request body accepted before returning 413
+        """
+        if pool is not None and pool.models is None:
+            raise ValueError("The pool must list the models clients may request")
+        self.summarizer = summarizer
+        self.queue: "queue.Queue[Job]" = queue.Queue(maxsize=queue_size)
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.request_timeout = request_timeout
+        self.max_texts_per_request = max_texts_per_request
+        self.pool = pool
+        self.max_summary_length = max_summary_length
+        self.max_body_bytes = max_body_bytes
+        self.metrics = ServerMetrics()
+        self.model_metrics = PrometheusSink()
+        summarizer.metric_sinks.append(self.model_metrics)
+        self.ready = threading.Event()
+        self.load_error: Optional[Exception] = None
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """The (host, port) the server is bound to."""
+        return self.httpd.server_address[:2]
+
+    def start(self) -> None:
+        """Load the model in the background and start serving on a thread."""
+        self._spawn(self._load_model, "summarizer-load")
+        for index in range(self.workers):
+            self._spawn(self._work, f"summarizer-worker-{index}")
+        self._spawn(self.httpd.serve_forever, "summarizer-http")
+        logger.info(f"Serving on http://{self.address[0]}:{self.address[1]}")
+
+    def stop(self) -> None:
+        """Stop accepting requests and shut the workers down."""
+        self._stopping.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def submit(self, job: Job) -> Tuple[int, Any]:
+        """
+        Queue a job and wait for it, applying load shedding and timeouts.
+
+        Args:
+            job (Job): The job to run
+
+        Returns:
+            Tuple of HTTP status and JSON-serializable body
+        """
+        if not self.ready.is_set():
+            return 503, {"error": "Model is not ready"}
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            return 429, {"error": "Server is busy, retry later"}
+
+        if not job.done.wait(max(0.0, job.deadline - time.monotonic())):
+            job.cancelled = True
+            return 504, {"error": "Request timed out"}
+        if job.error is not None:
+            return 500, {"error": str(job.error)}
+        return 200, job.results
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _load_model(self) -> None:
+        try:
+            self.summarizer.summarizer
+            self.ready.set()
+            logger.info("Model loaded, server is ready")
+        except Exception as e:
+            self.load_error = e
+            logger.error(f"Model failed to load: {str(e)}")
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                first = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Coalesce whatever else is queued, up to one batch worth of texts
+            jobs = [first]
+            size = len(first.texts)
+            while size < self.max_batch_size:
+                try:
+                    job = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                jobs.append(job)
+                size += len(job.texts)
+
+            now = time.monotonic()
+            groups: Dict[Tuple[int, int, str, Optional[str], Optional[str]], List[Job]] = {}
+            for job in jobs:
+                if not job.cancelled and job.deadline > now:
+                    groups.setdefault(job.params, []).append(job)
+            for group in groups.values():
+                self._run(group)
+
+    def _run(self, jobs: List[Job]) -> None:
+        texts = [text for job in jobs for text in job.texts]
+        max_length, min_length, length_unit, profile, model = jobs[0].params
+        # Leave generation only the time the most urgent job has left
+        deadline = max(min(job.deadline for job in jobs) - time.monotonic(), 0.0)
+        options = {
+            "batch_size": self.max_batch_size,
+            "max_length": max_length,
+            "min_length": min_length,
+            "length_unit": length_unit,
+            "profile": profile,
+            "deadline": deadline,
+        }
+        try:
+            if model is None:
+                results = self.summarizer.summarize_many(texts, **options)
+            else:
+                results = self.pool.summarize_many(texts, model_name=model, **options)
+            self.metrics.record_batch(len(texts))
+        except Exception as e:
+            logger.error(f"Batch of {len(texts)} texts failed: {str(e)}")
+            for job in jobs:
+                job.error = e
+                job.done.set()
+            return
+
+        offset = 0
+        for job in jobs:
+            job.results = results[offset : offset + len(job.texts)]
+            offset += len(job.texts)
+            job.done.set()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # A client that sends less body than it announced cannot hold a thread forever
+            timeout = server.request_timeout
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_GET(self):
+                start = time.perf_counter()
+                if self.path == "/healthz":
+                    self._reply(200, {"status": "ok"}, start)
+                elif self.path == "/readyz":
+                    if server.ready.is_set():
+                        self._reply(200, {"status": "ready"}, start)
+                    elif server.load_error is not None:
+                        body = {"status": "failed", "error": str(server.load_error)}
+                        self._reply(503, body, start)
+                    else:
+                        self._reply(503, {"status": "loading"}, start)
+                elif self.path == "/metrics":
+                    body = server.metrics.render(
+                        server.queue.qsize(),
+                        server.queue.maxsize,
+                        server.ready.is_set(),
+                        server.summarizer.memory_usage(),
+                    ) + server.model_metrics.render()
+                    if server.pool is not None:
+                        body += server.metrics.render_pool(server.pool.stats())
+                    self._send(200, body.encode("utf-8"), "text/plain; version=0.0.4")
+                else:
+                    self._reply(404, {"error": "Not found"}, start)
+
+            def do_POST(self):
+                start = time.perf_counter()
+                if self.path not in ("/summarize", "/summarize/batch"):
+                    self._reply(404, {"error": "Not found"}, start)
+                    return
+                try:
+                    job = self._parse_job()
+                except RequestTooLarge as e:
+                    # The unread body is left on the socket, so it cannot be reused
+                    self.close_connection = True
+                    self._reply(413, {"error": str(e)}, start)
+                    return
+                except ValueError as e:
+                    self._reply(400, {"error": str(e)}, start)
+                    return
+
+                status, body = server.submit(job)
+                if status == 200 and self.path == "/summarize":
+                    body = body[0]
+                elif status == 200:
+                    body = {"results": body}
+                self._reply(status, body, start)
+
+            def _parse_job(self) -> Job:
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                except ValueError:
+                    raise ValueError("Content-Length must be an integer")
+                if length < 0:
+                    raise ValueError("Content-Length cannot be negative")
+                if length > server.max_body_bytes:
+                    raise RequestTooLarge(
+                        f"Request body is over the {server.max_body_bytes} byte limit"
+                    )
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    raise ValueError("Request body must be valid JSON")
+                if not isinstance(payload, dict):
+                    raise ValueError("Request body must be a JSON object")
+
+                if self.path == "/summarize":
+                    texts = [payload.get("text")]
+                else:
+                    texts = payload.get("texts")
+                    if not isinstance(texts, list) or not texts:
+                        raise ValueError("'texts' must be a non-empty list")
+                    if len(texts) > server.max_texts_per_request:
+                        raise ValueError(
+                            f"At most {server.max_texts_per_request} texts per request"
+                        )
+                if not all(isinstance(text, str) and text.strip() for text in texts):
+                    raise ValueError("Input text cannot be empty")
+
+                try:
+                    max_length = int(payload.get("max_length", 130))
+                    min_length = int(payload.get("min_length", 30))
+                except (TypeError, ValueError):
+                    raise ValueError("'max_length' and 'min_length' must be integers")
+                if not 1 <= max_length <= server.max_summary_length:
+                    raise ValueError(
+                        f"'max_length' must be between 1 and {server.max_summary_length}"
+                    )
+                if not 0 <= min_length <= max_length:
+                    raise ValueError("'min_length' must be between 0 and 'max_length'")
+                length_unit = payload.get("length_unit", "tokens")
+                if length_unit not in LENGTH_UNITS:
+                    raise ValueError(f"'length_unit' must be one of {list(LENGTH_UNITS)}")
+                profile = payload.get("profile")
+                # Checked as a string first: JSON lists and objects cannot be looked up
+                if profile is not None and (
+                    not isinstance(profile, str) or profile not in GENERATION_PROFILES
+                ):
+                    raise ValueError(f"'profile' must be one of {list(GENERATION_PROFILES)}")
+                try:
+                    timeout = float(payload.get("timeout", server.request_timeout))
+                except (TypeError, ValueError):
+                    raise ValueError("'timeout' must be a number")
+                if not math.isfinite(timeout) or timeout <= 0:
+                    raise ValueError("'timeout' must be a positive number of seconds")
+                timeout = min(timeout, server.request_timeout)
+                model = payload.get("model")
+                if model is not None:
+                    if server.pool is None:
+                        raise ValueError("This server does not host other models")
+                    if not isinstance(model, str):
+                        raise ValueError("'model' must be a string")
+                    # Rejects models outside the pool's list
+                    server.pool.summarizer(model)
+                return Job(texts, max_length, min_length, timeout, length_unit, profile, model)
+
+            def _reply(self, status: int, body: Any, start: float) -> None:
+                headers = {"Retry-After": "1"} if status in (429, 503) else {}
+                self._send(status, json.dumps(body).encode("utf-8"), "application/json", headers)
+                server.metrics.record_response(self.path, status, time.perf_counter() - start)
+
+            def _send(self, status, data, content_type, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def main() -> None:
+    """Parse command-line options and serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the AI Text Summarizer over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--dtype", default=None, help='Torch dtype, e.g. "bfloat16"')
+    parser.add_argument(
+        "--low-memory", action="store_true", help="Load weights from memory-mapped safetensors"
+    )
+    parser.add_argument(
+        "--idle-ttl", type=float, default=None, help="Unload the model after this many idle seconds"
+    )
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--models", nargs="*", default=None, help='Other models requests may pick with "model"'
+    )
+    parser.add_argument(
+        "--pool-memory", type=int, default=None, help="Bytes of weights kept loaded by --models"
+    )
+    parser.add_argument(
+        "--pool-concurrency", type=int, default=1, help="Generations at once per pooled model"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    pool = None
+    if args.models:
+        pool = ModelPool(
+            args.models,
+            memory_budget=args.pool_memory,
+            max_concurrency=args.pool_concurrency,
+            default_model=args.models[0],
+            dtype=args.dtype,
+            low_memory=args.low_memory,
+        )
+    server = SummaryServer(
+        TextSummarizer(
+            args.model, dtype=args.dtype, low_memory=args.low_memory, idle_ttl=args.idle_ttl
+        ),
+        host=args.host,
+        port=args.port,
+        queue_size=args.queue_size,
+        workers=args.workers,
+        max_batch_size=args.max_batch_size,
+        request_timeout=args.timeout,
+        pool=pool,
+    )
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,50 +2,801 @@
 AI Text Summarizer using Hugging Face Transformers
 """
 
+import bisect
+import gc
+import importlib.util
 import logging
-from typing import Dict, Optional, Union
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from transformers import pipeline
-from transformers.pipelines.base import Pipeline
+from cache import EncoderCache, SummaryCache, make_cache_key, make_encoder_key
+from dedup import NearDuplicateIndex
+from extractive import extract, extractive_summary, sentence_spans
+from metrics import MetricSink
+from preprocess import clean_text
+from scheduler import BatchScheduler
+
+# torch and transformers take seconds to import, so they are only imported when a
+# model is actually loaded or run
+if TYPE_CHECKING:
+    import torch
+    from transformers.pipelines.base import Pipeline
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "facebook/bart-large-cnn"
+
+# Where derived model artifacts (e.g. quantized weights) are stored between runs
+MODEL_CACHE_DIR = os.environ.get(
+    "SUMMARIZER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ai-text-summarizer")
+)
+
+QUANTIZE_MODES = ("int8",)
+
+BACKENDS = ("torch", "onnx")
+
+# Units accepted for max_length/min_length; generation itself always counts tokens
+LENGTH_UNITS = ("tokens", "words")
+
+# "abstractive" runs the model on the full input, "hybrid" first keeps only the most
+# central sentences (TextRank) up to a token budget, "fast" returns those sentences
+# without running the model at all
+SUMMARY_MODES = ("abstractive", "hybrid", "fast")
+
+# Decoding settings by profile, fastest first; "quality" keeps the model's own
+# generation config (4-beam search for BART-CNN)
+GENERATION_PROFILES: Dict[str, Dict[str, Any]] = {
+    "fast": {"num_beams": 1},
+    "balanced": {"num_beams": 2, "early_stopping": True},
+    "quality": {"early_stopping": True},
+}
+
+# Weight of the newest measurement in each profile's moving-average throughput
+PROFILE_RATE_SMOOTHING = 0.2
+
+# Sentence scoring used by the hybrid and fast modes
+EXTRACT_METHOD = "textrank"
+
+# Tokens per word assumed for token targets in fast mode before anything is measured
+DEFAULT_TOKENS_PER_WORD = 1.3
+
+# Safety net for recursive reduction in summarize_long
+MAX_REDUCE_LEVELS = 8
+
+
+def configure_torch_threads(
+    intra_op_threads: Optional[int] = None, cpus: Optional[Sequence[int]] = None
+) -> None:
+    """
+    Set torch's thread count, and optionally pin the current process to some CPUs.
+
+    Call this at the start of a worker process, before any model runs, so that
+    several workers on one host do not oversubscribe the cores.
+
+    Args:
+        intra_op_threads (Optional[int]): Threads torch uses inside one operator
+        cpus (Optional[Sequence[int]]): CPU ids this process may run on (Linux only)
+    """
+    if cpus is not None:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, set(cpus))
+        else:
+            logger.warning("CPU affinity is not supported on this platform, ignoring cpus")
+
+    import torch
+
+    if intra_op_threads:
+        torch.set_num_threads(intra_op_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only allowed before any parallel work has started in this process
+            pass
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """
+    Return the resident set size (RSS) of the current process.
+
+    Returns:
+        Optional[int]: Bytes of physical memory in use, or None where it cannot be read
+            (only Linux /proc is supported)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def model_memory_bytes(loaded: "Pipeline") -> Optional[int]:
+    """
+    Return the memory held by a pipeline's weights and buffers.
+
+    Args:
+        loaded (Pipeline): A loaded summarization pipeline
+
+    Returns:
+        Optional[int]: Bytes of parameters and buffers, or None for models that do not
+            expose them (e.g. ONNX Runtime sessions)
+    """
+    model = loaded.model
+    if not hasattr(model, "parameters"):
+        return None
+    tensors = [*model.parameters(), *model.buffers()]
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+def _acceptable_profiles(profile: Optional[str], deadline: Optional[float]) -> List[str]:
+    """Profiles whose stored results can answer a request, best first."""
+    if profile is not None:
+        return [profile]
+    if deadline is not None:
+        # Any finished summary beats generating under time pressure
+        return list(reversed(list(GENERATION_PROFILES)))
+    return ["quality"]
+
+
+def _check_profile(profile: Optional[str]) -> None:
+    if profile is not None and profile not in GENERATION_PROFILES:
+        raise ValueError(
+            f"Unsupported profile {profile!r}, expected one of {tuple(GENERATION_PROFILES)}"
+        )
+
+
+def _check_length_unit(length_unit: str) -> None:
+    if length_unit not in LENGTH_UNITS:
+        raise ValueError(
+            f"Unsupported length unit {length_unit!r}, expected one of {LENGTH_UNITS}"
+        )
+
+
+def load_pipeline(
+    model_name: str,
+    device: int = -1,
+    dtype: Optional[str] = None,
+    quantize: Optional[str] = None,
+    backend: str = "torch",
+    fallback: bool = True,
+    low_memory: bool = False,
+) -> "Pipeline":
+    """
+    Load a summarization pipeline for the requested engine and precision.
+
+    Args:
+        model_name (str): The name/path of the model to use
+        device (int): Device index, -1 for CPU
+        dtype (Optional[str]): Torch dtype name (e.g. "bfloat16"), or None for the default
+        quantize (Optional[str]): "int8" to quantize Linear layers, or None for full precision
+        backend (str): "torch" for PyTorch, or "onnx" for ONNX Runtime on CPU
+        fallback (bool): Load the PyTorch pipeline if the ONNX backend is unavailable
+        low_memory (bool): Build the model without a randomly initialized copy of the
+            weights, reading them straight from the memory-mapped safetensors file; this
+            roughly halves peak memory while loading (combine with dtype="bfloat16" to
+            also halve resident memory)
+
+    Returns:
+        Pipeline: The summarization pipeline
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend {backend!r}, expected one of {BACKENDS}")
+
+    if backend == "onnx":
+        if quantize is not None or dtype is not None:
+            raise ValueError("The onnx backend does not support quantize or dtype options")
+        try:
+            return _load_onnx_pipeline(model_name)
+        except ImportError as e:
+            if not fallback:
+                raise
+            logger.warning(f"ONNX backend unavailable ({str(e)}), falling back to PyTorch")
+
+    from transformers import AutoTokenizer, pipeline
+
+    if quantize is None:
+        return pipeline(
+            "summarization",
+            model=model_name,
+            device=device,
+            torch_dtype=dtype,
+            model_kwargs={"low_cpu_mem_usage": True} if low_memory else None,
+        )
+
+    if quantize not in QUANTIZE_MODES:
+        raise ValueError(
+            f"Unsupported quantize mode {quantize!r}, expected one of {QUANTIZE_MODES}"
+        )
+    if device != -1:
+        raise ValueError("Dynamic int8 quantization is only supported on CPU (device=-1)")
+
+    return pipeline(
+        "summarization",
+        model=_load_quantized_model(model_name, low_memory),
+        tokenizer=AutoTokenizer.from_pretrained(model_name),
+        device=device,
+    )
+
+
+def _load_quantized_model(model_name: str, low_memory: bool = False) -> "torch.nn.Module":
+    """
+    Build an int8 model, taking its quantized weights from the on-disk cache when present.
+
+    On a cache hit the full-precision checkpoint is never read: the model is built
+    from its config, quantized while its weights are still uninitialized, and then
+    filled from the cache. Only the state dict is cached, and it is read back with
+    ``weights_only=True``, so a cache file can never run code. The file name
+    includes the torch and transformers versions and the model revision, so
+    upgrades and new checkpoints never reuse stale weights.
+    """
+    import torch
+    import transformers
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM
+
+    start = time.perf_counter()
+    config = AutoConfig.from_pretrained(model_name)
+    versions = f"torch{torch.__version__}-transformers{transformers.__version__}"
+    path = os.path.join(MODEL_CACHE_DIR, f"{_cache_name(model_name, config)}-int8-{versions}.pt")
+
+    if os.path.exists(path):
+        model = AutoModelForSeq2SeqLM.from_config(config)
+        model.eval()
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        model.load_state_dict(torch.load(path, weights_only=True))
+        logger.info(f"Loaded quantized weights from {path} in {time.perf_counter() - start:.1f}s")
+        return model
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(
+        model_name, config=config, low_cpu_mem_usage=low_memory
+    )
+    model.eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    logger.info(f"Quantized {model_name} to int8 in {time.perf_counter() - start:.1f}s")
+    # Write atomically so a crashed run never leaves a truncated file behind
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    torch.save(model.state_dict(), tmp_path)
+    os.replace(tmp_path, path)
+    logger.info(f"Cached quantized weights at {path}")
+    return model
+
+
+def _cache_name(model_name: str, config: Any) -> str:
+    """File-system safe name of a model checkpoint, including its revision."""
+    # Hub checkpoints carry their commit; local directories are identified by their mtime
+    revision = getattr(config, "_commit_hash", None)
+    if revision is None and os.path.isdir(model_name):
+        revision = f"local{int(os.path.getmtime(model_name))}"
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name)
+    return f"{safe_name}-{revision or 'unknown'}"
+
+
+def onnx_available() -> bool:
+    """Whether the packages of the onnx backend are installed (without importing them)."""
+    return all(importlib.util.find_spec(name) for name in ("optimum", "onnxruntime"))
+
+
+def _load_onnx_pipeline(model_name: str) -> "Pipeline":
+    """
+    Load an ONNX Runtime pipeline, exporting and caching the ONNX graphs on first use.
+
+    Like the int8 cache, the directory name includes the model revision and the
+    optimum, onnxruntime and transformers versions, so graphs exported from an older
+    checkpoint or by older libraries are never reused.
+    """
+    import transformers
+    from transformers import AutoConfig, AutoTokenizer, pipeline
+
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        from optimum.version import __version__ as optimum_version
+    except ImportError:
+        raise ImportError(
+            "The onnx backend requires optimum with onnxruntime: "
+            "pip install 'optimum[onnxruntime]'"
+        )
+
+    versions = (
+        f"optimum{optimum_version}-onnxruntime{onnxruntime.__version__}"
+        f"-transformers{transformers.__version__}"
+    )
+    config = AutoConfig.from_pretrained(model_name)
+    path = os.path.join(MODEL_CACHE_DIR, f"{_cache_name(model_name, config)}-onnx-{versions}")
+
+    if os.path.isdir(path):
+        logger.info(f"Loading ONNX model from {path}")
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            path, use_cache=True, provider="CPUExecutionProvider"
+        )
+    else:
+        # Exports encoder, decoder and decoder-with-past graphs for fast incremental decoding
+        start = time.perf_counter()
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            model_name, export=True, use_cache=True, provider="CPUExecutionProvider"
+        )
+        logger.info(f"Exported {model_name} to ONNX in {time.perf_counter() - start:.1f}s")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        model.save_pretrained(tmp_path)
+        os.replace(tmp_path, path)
+        logger.info(f"Cached ONNX model at {path}")
+
+    return pipeline(
+        "summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(model_name)
+    )
+
+
+class ModelRegistry:
+    """A thread-safe, process-wide store of loaded summarization pipelines."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._pipelines: Dict[Tuple, "Pipeline"] = {}
+        self._loading: Dict[Tuple, threading.Lock] = {}
+        # Generations running on each pipeline, and when one last started or finished
+        self._active: Dict[Tuple, int] = {}
+        self._used: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        model_name: str,
+        device: int = -1,
+        dtype: Optional[str] = None,
+        quantize: Optional[str] = None,
+        backend: str = "torch",
+        warmup: bool = False,
+        low_memory: bool = False,
+    ) -> "Pipeline":
+        """
+        Return the pipeline for a model, loading it on first use.
+
+        Concurrent callers asking for the same model wait for a single load
+        instead of each loading their own copy.
+
+        Args:
+            model_name (str): The name/path of the model to use
+            device (int): Device index, -1 for CPU
+            dtype (Optional[str]): Torch dtype name (e.g. "bfloat16"), or None for the default
+            quantize (Optional[str]): "int8" for dynamic quantization, or None
+            backend (str): "torch" or "onnx"
+            warmup (bool): Run a short dummy generation after loading
+            low_memory (bool): Load with low peak memory, see load_pipeline()
+
+        Returns:
+            Pipeline: The shared summarization pipeline
+        """
+        key = (model_name, device, dtype, quantize, backend)
+        with self._lock:
+            if key in self._pipelines:
+                return self._pipelines[key]
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._pipelines:
+                    return self._pipelines[key]
+            try:
+                start = time.perf_counter()
+                loaded = load_pipeline(
+                    model_name, device, dtype, quantize, backend, low_memory=low_memory
+                )
+                logger.info(
+                    f"Summarization pipeline {model_name} loaded in "
+                    f"{time.perf_counter() - start:.1f}s"
+                )
+                if warmup:
+                    self.warmup(loaded)
+            except Exception as e:
+                logger.error(f"Failed to load summarization pipeline: {str(e)}")
+                raise
+            with self._lock:
+                self._pipelines[key] = loaded
+                self._used[key] = time.monotonic()
+                self._loading.pop(key, None)
+            return loaded
+
+    @staticmethod
+    def warmup(loaded: "Pipeline") -> None:
+        """Run a tiny generation so first real request does not pay one-off setup costs."""
+        start = time.perf_counter()
+        loaded("Warm up the summarization model. " * 8, max_length=16, min_length=4)
+        logger.info(f"Summarization pipeline warmed up in {time.perf_counter() - start:.1f}s")
+
+    def is_loaded(
+        self,
+        model_name: str,
+        device: int = -1,
+        dtype: Optional[str] = None,
+        quantize: Optional[str] = None,
+        backend: str = "torch",
+    ) -> bool:
+        """Return whether a model is already loaded."""
+        with self._lock:
+            return (model_name, device, dtype, quantize, backend) in self._pipelines
+
+    @contextmanager
+    def in_use(
+        self,
+        model_name: str,
+        device: int = -1,
+        dtype: Optional[str] = None,
+        quantize: Optional[str] = None,
+        backend: str = "torch",
+    ) -> Iterator[None]:
+        """Mark a pipeline as running for the duration of the block, see unload(idle_for=)."""
+        key = (model_name, device, dtype, quantize, backend)
+        with self._lock:
+            self._active[key] = self._active.get(key, 0) + 1
+            self._used[key] = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active[key] -= 1
+                self._used[key] = time.monotonic()
+
+    def idle_seconds(
+        self,
+        model_name: str,
+        device: int = -1,
+        dtype: Optional[str] = None,
+        quantize: Optional[str] = None,
+        backend: str = "torch",
+    ) -> float:
+        """Seconds since any holder last ran a pipeline, 0 while one is running."""
+        key = (model_name, device, dtype, quantize, backend)
+        with self._lock:
+            if self._active.get(key):
+                return 0.0
+            return time.monotonic() - self._used.get(key, time.monotonic())
+
+    def unload(
+        self,
+        model_name: str,
+        device: int = -1,
+        dtype: Optional[str] = None,
+        quantize: Optional[str] = None,
+        backend: str = "torch",
+        idle_for: Optional[float] = None,
+    ) -> bool:
+        """
+        Drop a loaded pipeline so its memory can be freed.
+
+        The memory is only returned once no TextSummarizer still holds the pipeline.
+
+        Args:
+            idle_for (Optional[float]): Only unload if no holder is running the pipeline
+                and none has for this many seconds
+
+        Returns:
+            bool: Whether the model was unloaded
+        """
+        key = (model_name, device, dtype, quantize, backend)
+        with self._lock:
+            if idle_for is not None:
+                if self._active.get(key) or time.monotonic() - self._used.get(key, 0) < idle_for:
+                    return False
+            self._used.pop(key, None)
+            return self._pipelines.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop every loaded pipeline."""
+        with self._lock:
+            self._pipelines.clear()
+
+    def prepare_fork(self) -> None:
+        """
+        Make the loaded weights safe to share with child processes created by fork().
+
+        Children of a fork see the parent's memory copy-on-write, so weights loaded once
+        in the parent are shared by every worker until something writes to their pages.
+        This freezes the weights (inference mode, no gradients) and moves every object
+        allocated so far out of the garbage collector's reach, so collections in the
+        children do not touch, and thereby copy, the pages they live on.
+        """
+        with self._lock:
+            loaded = list(self._pipelines.values())
+        for pipe in loaded:
+            if hasattr(pipe.model, "parameters"):
+                pipe.model.eval()
+                pipe.model.requires_grad_(False)
+        gc.collect()
+        gc.freeze()
+        logger.info(f"Prepared {len(loaded)} pipelines for sharing with forked workers")
+
+
+# Shared by every TextSummarizer unless another registry is passed in
+model_registry = ModelRegistry()
+
 
 class TextSummarizer:
     """A class to handle text summarization using the BART model."""
 
-    def __init__(self, model_name: str = "facebook/bart-large-cnn"):
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        cache: Optional[SummaryCache] = None,
+        device: int = -1,
+        dtype: Optional[str] = None,
+        registry: Optional[ModelRegistry] = None,
+        quantize: Optional[str] = None,
+        backend: str = "torch",
+        metric_sinks: Optional[Sequence[MetricSink]] = None,
+        near_duplicates: Optional[NearDuplicateIndex] = None,
+        low_memory: bool = False,
+        idle_ttl: Optional[float] = None,
+        encoder_cache: Optional[EncoderCache] = None,
+    ):
         """
         Initialize the summarizer with a specific model.
 
         Args:
             model_name (str): The name/path of the model to use
+            cache (Optional[SummaryCache]): Cache for deterministic (non-sampled) results
+            device (int): Device index, -1 for CPU
+            dtype (Optional[str]): Torch dtype name, or None for the model default
+            registry (Optional[ModelRegistry]): Where pipelines are shared, defaults to
+                the process-wide model_registry
+            quantize (Optional[str]): "int8" to run dynamically quantized Linear layers on
+                CPU (cached on disk under MODEL_CACHE_DIR), or None for full precision
+            backend (str): "torch" for the PyTorch pipeline, or "onnx" to run exported
+                ONNX graphs (cached under MODEL_CACHE_DIR) with ONNX Runtime, falling back
+                to PyTorch (and setting ``backend`` to "torch") if optimum/onnxruntime are
+                not installed
+            metric_sinks (Optional[Sequence[MetricSink]]): Receive stage timings and token
+                counts for every generated summary
+            near_duplicates (Optional[NearDuplicateIndex]): Reuse the summary of a
+                near-identical earlier input in summarize() instead of running the model
+            low_memory (bool): Load with low peak memory from memory-mapped safetensors,
+                see load_pipeline()
+            idle_ttl (Optional[float]): Unload the model after this many seconds without
+                use; the next request loads it again
+            encoder_cache (Optional[EncoderCache]): Keep encoder outputs of recent inputs,
+                so re-summarizing a text with other lengths or profiles only reruns the
+                decoder (PyTorch backend only)
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported backend {backend!r}, expected one of {BACKENDS}")
+        if backend == "onnx" and not onnx_available():
+            # Resolved here rather than at load time, so model_id, cache keys and metrics
+            # always name the engine that actually runs
+            logger.warning("ONNX backend unavailable (optimum[onnxruntime]), using PyTorch")
+            backend = "torch"
+        if quantize is not None and quantize not in QUANTIZE_MODES:
+            raise ValueError(
+                f"Unsupported quantize mode {quantize!r}, expected one of {QUANTIZE_MODES}"
+            )
         self.model_name = model_name
-        self._summarizer: Optional[Pipeline] = None
+        self.cache = cache
+        self.device = device
+        self.dtype = dtype
+        self.quantize = quantize
+        self.backend = backend
+        self.registry = registry if registry is not None else model_registry
+        self.metric_sinks: List[MetricSink] = list(metric_sinks or [])
+        self.near_duplicates = near_duplicates
+        self.low_memory = low_memory
+        self.idle_ttl = idle_ttl
+        self.encoder_cache = encoder_cache
+        self._summarizer: Optional["Pipeline"] = None
+        self._preload: Optional[Future] = None
+        self._scheduler: Optional[BatchScheduler] = None
+        self._stats_lock = threading.Lock()
+        # Content tokens and words of every summary so far, for converting word targets
+        self._summary_tokens = 0
+        self._summary_words = 0
+        self._output_overhead: Optional[int] = None
+        # Generation seconds per input-plus-output token, by decoding profile
+        self._profile_rates: Dict[str, float] = {}
+        self._last_used = time.monotonic()
+        self._idle_lock = threading.Lock()
+        self._idle_watch: Optional[threading.Thread] = None
         logger.info(f"Initializing summarizer with model: {model_name}")
 
     @property
-    def summarizer(self) -> Pipeline:
-        """Lazy loading of the summarization pipeline."""
-        if self._summarizer is None:
+    def summarizer(self) -> "Pipeline":
+        """Lazy loading of the summarization pipeline (shared through the registry)."""
+        # Read once: the idle watcher may unload concurrently
+        loaded = self._summarizer
+        if loaded is None:
+            preload = self._preload
+            if preload is not None:
+                # Wait for the background load rather than starting a second one
+                loaded = preload.result()
+            else:
+                loaded = self.registry.get(
+                    self.model_name,
+                    self.device,
+                    self.dtype,
+                    self.quantize,
+                    self.backend,
+                    low_memory=self.low_memory,
+                )
+            self._summarizer = loaded
+            self._watch_idle()
+        self._last_used = time.monotonic()
+        return loaded
+
+    def preload(self, background: bool = True, warmup: bool = True) -> Future:
+        """
+        Load (and optionally warm up) the model ahead of the first request.
+
+        With ``background=True`` the load runs on a daemon thread and this returns
+        immediately; any summarize call made meanwhile waits for that load.
+
+        Args:
+            background (bool): Load on a background thread instead of blocking
+            warmup (bool): Run a short dummy generation after loading
+
+        Returns:
+            Future: Resolves to the loaded pipeline, or raises the load error
+        """
+        if self._preload is not None:
+            return self._preload
+
+        future: Future = Future()
+        self._preload = future
+
+        def load() -> None:
             try:
-                self._summarizer = pipeline(
-                    "summarization", model=self.model_name, device=-1  # CPU by defaul
+                future.set_result(
+                    self.registry.get(
+                        self.model_name,
+                        self.device,
+                        self.dtype,
+                        self.quantize,
+                        self.backend,
+                        warmup=warmup,
+                        low_memory=self.low_memory,
+                    )
                 )
-                logger.info("Summarization pipeline loaded successfully")
+                self._last_used = time.monotonic()
+                self._watch_idle()
             except Exception as e:
-                logger.error(f"Failed to load summarization pipeline: {str(e)}")
-                raise
-        return self._summarizer
+                future.set_exception(e)
+
+        if background:
+            threading.Thread(target=load, name="summarizer-preload", daemon=True).start()
+        else:
+            load()
+            future.result()
+        return future
+
+    def unload(self, idle_for: Optional[float] = None) -> bool:
+        """
+        Release the model; the next request that needs it loads it again.
+
+        The pipeline is also dropped from the registry, but its memory is only freed
+        once no other TextSummarizer sharing it still holds it.
+
+        Args:
+            idle_for (Optional[float]): Keep the model if any TextSummarizer sharing it is
+                running it, or has run it within this many seconds
+
+        Returns:
+            bool: Whether a model was released
+        """
+        key = (self.model_name, self.device, self.dtype, self.quantize, self.backend)
+        before = resident_memory_bytes()
+        with self._idle_lock:
+            if self._summarizer is None and self._preload is None:
+                return False
+            if idle_for is None:
+                self.registry.unload(*key)
+            elif not self.registry.unload(*key, idle_for=idle_for) and self.registry.is_loaded(
+                *key
+            ):
+                return False
+            self._summarizer = None
+            self._preload = None
+        gc.collect()
+        after = resident_memory_bytes()
+        freed = f", {(before - after) / 2**20:.0f} MiB freed" if before and after else ""
+        logger.info(f"Unloaded summarization pipeline {self.model_id}{freed}")
+        return True
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        Report the memory used by this process and by the loaded model.
+
+        Returns:
+            Dict with ``loaded``, ``resident_bytes`` (process RSS, None if unknown) and
+            ``model_bytes`` (weights and buffers, None if not loaded or unknown)
+        """
+        loaded = self._summarizer
+        return {
+            "loaded": loaded is not None,
+            "resident_bytes": resident_memory_bytes(),
+            "model_bytes": model_memory_bytes(loaded) if loaded is not None else None,
+        }
+
+    def _watch_idle(self) -> None:
+        """Start a thread that unloads the model after idle_ttl seconds without use."""
+        if self.idle_ttl is None:
+            return
+        with self._idle_lock:
+            if self._idle_watch is not None:
+                return
+            self._idle_watch = threading.Thread(
+                target=self._unload_when_idle, name="summarizer-idle", daemon=True
+            )
+            self._idle_watch.start()
+
+    def _unload_when_idle(self) -> None:
+        key = (self.model_name, self.device, self.dtype, self.quantize, self.backend)
+        while True:
+            with self._idle_lock:
+                if self._summarizer is None and self._preload is None:
+                    # Unloaded; the next load starts a new watcher
+                    self._idle_watch = None
+                    return
+            # Idle only once neither this instance nor any other sharing the pipeline used it
+            idle = min(time.monotonic() - self._last_used, self.registry.idle_seconds(*key))
+            if idle < self.idle_ttl:
+                time.sleep(self.idle_ttl - idle)
+            elif self.unload(idle_for=self.idle_ttl):
+                logger.info(f"Model idle for {idle:.0f}s")
+
+    @contextmanager
+    def _in_use(self) -> Iterator[None]:
+        """Keep the idle watchers of every holder from unloading the model meanwhile."""
+        key = (self.model_name, self.device, self.dtype, self.quantize, self.backend)
+        with self.registry.in_use(*key):
+            yield
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the model variant, so cached results never mix precisions or engines."""
+        parts = (self.dtype, self.quantize, self.backend)
+        variant = [part for part in parts if part not in (None, "torch")]
+        return "@".join([self.model_name, *variant])
+
+    @property
+    def max_input_tokens(self) -> int:
+        """Longest input (including special tokens) the model accepts."""
+        tokenizer = self.summarizer.tokenizer
+        positions = getattr(self.summarizer.model.config, "max_position_embeddings", None)
+        return min(tokenizer.model_max_length, positions or tokenizer.model_max_length)
+
+    @property
+    def tokens_per_word(self) -> Optional[float]:
+        """Measured tokens per word of generated summaries, or None before the first one."""
+        with self._stats_lock:
+            if not self._summary_words:
+                return None
+            return self._summary_tokens / self._summary_words
+
+    @property
+    def scheduler(self) -> BatchScheduler:
+        """Micro-batching scheduler behind asummarize, created on first use."""
+        if self._scheduler is None:
+            self._scheduler = BatchScheduler(self)
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler: BatchScheduler) -> None:
+        self._scheduler = scheduler
 
     def summarize(
-        self, text: str, max_length: int = 130, min_length: int = 30, do_sample: bool = False
-    ) -> Dict[str, Union[str, float]]:
+        self,
+        text: str,
+        max_length: int = 130,
+        min_length: int = 30,
+        do_sample: bool = False,
+        length_unit: str = "tokens",
+        mode: str = "abstractive",
+        extract_tokens: Optional[int] = None,
+        profile: Optional[str] = None,
+        deadline: Optional[float] = None,
+        clean: bool = False,
+    ) -> Dict[str, Any]:
         """
         Generate a summary of the input text.
 
@@ -54,40 +805,995 @@ class TextSummarizer:
             max_length (int): Maximum length of the summary
             min_length (int): Minimum length of the summary
             do_sample (bool): Whether to use sampling in generation
+            length_unit (str): "tokens", or "words" to convert the lengths to tokens
+                using the measured tokens-per-word ratio
+            mode (str): Trades quality for latency, one of SUMMARY_MODES: "abstractive"
+                (default), "hybrid" (extract sentences, then run the model on them) or
+                "fast" (extracted sentences only, no model)
+            extract_tokens (Optional[int]): Token budget of the extracted input in
+                "hybrid" mode, defaults to the model limit
+            profile (Optional[str]): Decoding profile from GENERATION_PROFILES ("fast",
+                "balanced" or "quality"); defaults to "quality", or to the best profile
+                expected to meet ``deadline``
+            deadline (Optional[float]): Seconds the call may take; generation is stopped
+                when they run out, and ``stopped_early`` is set in the result
+            clean (bool): Strip HTML, boilerplate lines and repeated paragraphs from the
+                text first (see preprocess.TextCleaner); the result then has a
+                ``preprocessing`` report including the ``tokens_saved``
 
         Returns:
-            Dict containing the summary text and metadata
+            Dict containing the summary text and metadata, including input/output token
+            counts, whether the input was truncated, tokenize/generate/decode timings,
+            the decoding profile used and whether the encoder output was reused
+            (``encoder_reused``)
         """
+        start = time.perf_counter()
         if not text.strip():
             raise ValueError("Input text cannot be empty")
+        _check_length_unit(length_unit)
+        _check_profile(profile)
+        if mode not in SUMMARY_MODES:
+            raise ValueError(f"Unsupported mode {mode!r}, expected one of {SUMMARY_MODES}")
+        if clean:
+            # Fast mode never loads the model, so it reports words saved but not tokens
+            count_tokens = None if mode == "fast" else self.count_tokens
+            cleaned, report = clean_text(text, count_tokens)
+            if not cleaned:
+                raise ValueError("Input text is empty after cleaning")
+            if deadline is not None:
+                deadline -= time.perf_counter() - start
+            output = self.summarize(
+                cleaned,
+                max_length,
+                min_length,
+                do_sample,
+                length_unit,
+                mode,
+                extract_tokens,
+                profile,
+                deadline,
+            )
+            output["preprocessing"] = report
+            return output
+        if mode == "fast":
+            return self._summarize_fast(text.strip(), max_length, length_unit)
+
+        # Sampled summaries are not reproducible, so never serve them from cache
+        use_cache = self.cache is not None and not do_sample
+        options = {"mode": mode, "extract_tokens": extract_tokens} if mode == "hybrid" else None
+        if use_cache:
+            cached = self._cache_lookup(
+                text, max_length, min_length, length_unit, profile, deadline, options
+            )
+            if cached is not None:
+                return cached
+
+        signature = None
+        if self.near_duplicates is not None and not do_sample:
+            signature = self.near_duplicates.signature(text)
+            reused = self._near_duplicate_lookup(
+                text, signature, max_length, min_length, length_unit, profile, deadline, options
+            )
+            if reused is not None:
+                return reused
 
         try:
             # Clean and preprocess tex
             text = text.strip()
+            end = start + deadline if deadline is not None else None
 
             # Generate summary
-            result = self.summarizer(
-                text,
-                max_length=max_length,
-                min_length=min_length,
-                do_sample=do_sample,
-                early_stopping=True,
-            )
+            if mode == "hybrid":
+                output = self._summarize_hybrid(
+                    text,
+                    max_length,
+                    min_length,
+                    do_sample,
+                    length_unit,
+                    extract_tokens,
+                    profile,
+                    end,
+                )
+            else:
+                output = self._generate(
+                    [text],
+                    max_length,
+                    min_length,
+                    do_sample,
+                    length_unit,
+                    profile=profile,
+                    deadline=end,
+                )[0]
+            output["mode"] = mode
+            if use_cache and not output["stopped_early"]:
+                self.cache.set(
+                    self._cache_key(
+                        text, max_length, min_length, length_unit, output["profile"], options
+                    ),
+                    output,
+                )
+            if signature is not None and not output["stopped_early"]:
+                # The key of an empty text identifies the model and generation parameters
+                namespace = self._cache_key(
+                    "", max_length, min_length, length_unit, output["profile"], options
+                )
+                self.near_duplicates.add(text, output, namespace, signature)
+            return output
+
+        except Exception as e:
+            logger.error(f"Summarization failed: {str(e)}")
+            raise
+
+    def _summarize_fast(self, text: str, max_length: int, length_unit: str) -> Dict[str, Any]:
+        """Summarize by sentence extraction alone, without loading or running the model."""
+        start = time.perf_counter()
+        if length_unit == "words":
+            max_words = max_length
+        else:
+            max_words = int(max_length / (self.tokens_per_word or DEFAULT_TOKENS_PER_WORD))
+        summary = extractive_summary(text, max(max_words, 1), EXTRACT_METHOD)
+        seconds = time.perf_counter() - start
+
+        result: Dict[str, Any] = self._build_result(text, summary)
+        result.update({"mode": "fast", "timings": {"extract": seconds, "total": seconds}})
+        return result
+
+    def _summarize_hybrid(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        do_sample: bool,
+        length_unit: str,
+        extract_tokens: Optional[int],
+        profile: Optional[str],
+        deadline: Optional[float],
+    ) -> Dict[str, Any]:
+        """Keep the most central sentences up to a token budget, then summarize those."""
+        tokenizer = self.summarizer.tokenizer
+        special_tokens = tokenizer.num_special_tokens_to_add()
+        budget = extract_tokens or self.max_input_tokens - special_tokens
+
+        start = time.perf_counter()
+        encoding = tokenizer(text, return_offsets_mapping=tokenizer.is_fast)
+        ids = encoding["input_ids"]
+        tokenize_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sentences, lengths = self._sentence_lengths(text, encoding.get("offset_mapping"))
+        kept = extract(sentences, budget, lengths, EXTRACT_METHOD)
+        extract_seconds = time.perf_counter() - start
+
+        extracted = text
+        if len(kept) < len(sentences):
+            extracted = " ".join(sentences[i] for i in kept)
+            start = time.perf_counter()
+            ids = self._tokenize([extracted])[0]
+            tokenize_seconds += time.perf_counter() - start
+
+        result = self._generate(
+            [extracted],
+            max_length,
+            min_length,
+            do_sample,
+            length_unit,
+            encoded=[ids],
+            tokenize_seconds=tokenize_seconds,
+            profile=profile,
+            deadline=deadline,
+        )[0]
+        # Report lengths against the original text, not the extract
+        result.update(self._build_result(text, result["summary"]))
+        result["extraction"] = {
+            "kept_sentences": len(kept),
+            "total_sentences": len(sentences),
+            "input_tokens": len(encoding["input_ids"]),
+            "seconds": extract_seconds,
+        }
+        return result
+
+    def summarize_stream(
+        self,
+        text: str,
+        max_length: int = 130,
+        min_length: int = 30,
+        do_sample: bool = False,
+        length_unit: str = "tokens",
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate a summary incrementally, yielding text as tokens are decoded.
+
+        Streaming decodes one hypothesis at a time, so generation always uses the
+        greedy "fast" profile instead of the model's default beam search.
+
+        Args:
+            text (str): The text to summarize
+            max_length (int): Maximum length of the summary
+            min_length (int): Minimum length of the summary
+            do_sample (bool): Whether to use sampling in generation
+            length_unit (str): "tokens" or "words", see summarize()
 
-            # Extract and return summary
-            summary = result[0]["summary_text"]
+        Yields:
+            ``{"type": "token", "text": ...}`` for each decoded piece, then one
+            ``{"type": "done", ...}`` dict with the usual result fields plus
+            ``time_to_first_token`` and ``total_seconds`` (decoding is interleaved
+            with generation, so its time is counted under ``generate``). Closing or
+            abandoning the generator early stops the generation.
+        """
+        import torch
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
 
-            return {
-                "summary": summary,
-                "original_length": len(text.split()),
-                "summary_length": len(summary.split()),
-                "compression_ratio": len(summary.split()) / len(text.split()),
+        if not text.strip():
+            raise ValueError("Input text cannot be empty")
+        _check_length_unit(length_unit)
+
+        text = text.strip()
+        tokenizer = self.summarizer.tokenizer
+        model = self.summarizer.model
+        start = time.perf_counter()
+        encoded = self._tokenize([text])
+        inputs = self._prepare(encoded)
+        tokenize_seconds = time.perf_counter() - start
+        input_tokens = len(encoded[0])
+        input_words = len(text.split())
+        max_tokens, min_tokens = self._token_limits(
+            max_length, min_length, length_unit, [input_tokens], [input_words]
+        )
+        streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        encoder, encoder_reused = self._encoder_outputs(inputs)
+        outputs: List[Any] = []
+        errors: List[Exception] = []
+        cancelled = threading.Event()
+
+        class StopWhenCancelled(StoppingCriteria):
+            def __call__(self, input_ids: Any, scores: Any, **kwargs: Any) -> bool:
+                return cancelled.is_set()
+
+        def generate() -> None:
+            try:
+                with self._in_use(), torch.inference_mode():
+                    outputs.append(
+                        model.generate(
+                            **inputs,
+                            streamer=streamer,
+                            max_length=max_tokens,
+                            min_length=min_tokens,
+                            do_sample=do_sample,
+                            num_beams=1,
+                            stopping_criteria=StoppingCriteriaList([StopWhenCancelled()]),
+                            **encoder,
+                        )
+                    )
+            except Exception as e:
+                errors.append(e)
+                # Unblock the consumer, which would otherwise wait for more text
+                streamer.end()
+
+        worker = threading.Thread(target=generate, name="summarizer-stream", daemon=True)
+        worker.start()
+
+        pieces: List[str] = []
+        time_to_first_token: Optional[float] = None
+        try:
+            for piece in streamer:
+                if not piece:
+                    continue
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+                pieces.append(piece)
+                yield {"type": "token", "text": piece}
+            worker.join()
+        finally:
+            # Runs when the consumer closes or drops the generator (e.g. a Streamlit
+            # rerun mid-stream) too, so the worker stops instead of generating on
+            cancelled.set()
+
+        if errors:
+            logger.error(f"Streaming summarization failed: {str(errors[0])}")
+            raise errors[0]
+
+        total_seconds = time.perf_counter() - start
+        generate_seconds = total_seconds - tokenize_seconds
+        output_tokens = int((outputs[0] != tokenizer.pad_token_id).sum())
+        result: Dict[str, Any] = self._build_result(text, "".join(pieces).strip(), input_words)
+        self._measure_lengths(outputs[0], [output_tokens], [result["summary_length"]])
+        result.update(
+            {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "truncated": input_tokens > self.max_input_tokens,
+                "batch_size": 1,
+                "tokens_per_second": output_tokens / generate_seconds if generate_seconds else 0.0,
+                "timings": {
+                    "tokenize": tokenize_seconds,
+                    "generate": generate_seconds,
+                    "decode": 0.0,
+                    "total": total_seconds,
+                },
+                "profile": "fast",
+                "stopped_early": False,
+                "encoder_reused": encoder_reused,
             }
+        )
+        self._emit_metrics(result)
+        result["type"] = "done"
+        result["time_to_first_token"] = time_to_first_token
+        result["total_seconds"] = total_seconds
+        yield result
+
+    async def asummarize(
+        self,
+        text: str,
+        max_length: int = 130,
+        min_length: int = 30,
+        do_sample: bool = False,
+        length_unit: str = "tokens",
+    ) -> Dict[str, Any]:
+        """
+        Generate a summary without blocking the event loop.
+
+        Concurrent calls are coalesced by the scheduler into batched generations
+        that run on a worker thread. Assign ``summarizer.scheduler`` to a
+        BatchScheduler to tune ``max_batch_size`` and ``max_wait``.
+
+        Args:
+            text (str): The text to summarize
+            max_length (int): Maximum length of the summary
+            min_length (int): Minimum length of the summary
+            do_sample (bool): Whether to use sampling in generation
+            length_unit (str): "tokens" or "words", see summarize()
+
+        Returns:
+            Dict containing the summary text and metadata
+        """
+        return await self.scheduler.submit(text, max_length, min_length, do_sample, length_unit)
+
+    def summarize_many(
+        self,
+        texts: Sequence[str],
+        batch_size: int = 8,
+        max_length: int = 130,
+        min_length: int = 30,
+        do_sample: bool = False,
+        length_unit: str = "tokens",
+        profile: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate summaries for many texts using length-bucketed batches.
+
+        Inputs are tokenized once and sorted by token length so that each batch
+        holds texts of similar size, which keeps padding (and wasted compute) to
+        a minimum. The same token ids are then fed to the model.
+
+        Args:
+            texts (Sequence[str]): The texts to summarize
+            batch_size (int): Number of texts per forward pass
+            max_length (int): Maximum length of each summary
+            min_length (int): Minimum length of each summary
+            do_sample (bool): Whether to use sampling in generation
+            length_unit (str): "tokens" or "words", see summarize()
+            profile (Optional[str]): Decoding profile, see summarize()
+            deadline (Optional[float]): Seconds the whole call may take; each batch picks
+                the best profile expected to finish in the time left
+
+        Returns:
+            List of result dicts, in the same order as ``texts``
+        """
+        call_start = time.perf_counter()
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        _check_length_unit(length_unit)
+        _check_profile(profile)
+        end = call_start + deadline if deadline is not None else None
+
+        cleaned = [text.strip() for text in texts]
+        for index, text in enumerate(cleaned):
+            if not text:
+                raise ValueError(f"Input text at position {index} cannot be empty")
+        if not cleaned:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(cleaned)
+        use_cache = self.cache is not None and not do_sample
+        pending = list(range(len(cleaned)))
+        if use_cache:
+            pending = []
+            for i, text in enumerate(cleaned):
+                results[i] = self._cache_lookup(
+                    text, max_length, min_length, length_unit, profile, deadline
+                )
+                if results[i] is None:
+                    pending.append(i)
+        if not pending:
+            return results
+
+        try:
+            # Bucket by token length so each batch pads to a similar size
+            tokenize_start = time.perf_counter()
+            encoded = dict(zip(pending, self._tokenize([cleaned[i] for i in pending])))
+            tokenize_seconds = time.perf_counter() - tokenize_start
+            order = sorted(pending, key=lambda i: len(encoded[i]))
+
+            for start in range(0, len(order), batch_size):
+                bucket = order[start : start + batch_size]
+                outputs = self._generate(
+                    [cleaned[i] for i in bucket],
+                    max_length,
+                    min_length,
+                    do_sample,
+                    length_unit,
+                    encoded=[encoded[i] for i in bucket],
+                    tokenize_seconds=tokenize_seconds * len(bucket) / len(pending),
+                    profile=profile,
+                    deadline=end,
+                )
+                for i, output in zip(bucket, outputs):
+                    results[i] = output
+                    if use_cache and not output["stopped_early"]:
+                        key = self._cache_key(
+                            cleaned[i], max_length, min_length, length_unit, output["profile"]
+                        )
+                        self.cache.set(key, output)
+
+            return results
 
         except Exception as e:
-            logger.error(f"Summarization failed: {str(e)}")
+            logger.error(f"Batch summarization failed: {str(e)}")
+            raise
+
+    def summarize_long(
+        self,
+        text: str,
+        max_length: int = 130,
+        min_length: int = 30,
+        chunk_tokens: Optional[int] = None,
+        overlap_sentences: int = 1,
+        batch_size: int = 8,
+        length_unit: str = "tokens",
+    ) -> Dict[str, Any]:
+        """
+        Summarize a document longer than the model's input limit (map-reduce).
+
+        The text is split on sentence boundaries into overlapping chunks that fit
+        the token budget, each chunk is summarized in batches, and the joined
+        chunk summaries are summarized again until they fit in a single pass.
+        Each level is tokenized once; sentence token counts come from that
+        encoding's offsets. Chunks are produced lazily, so memory is bounded by
+        one batch of chunks plus the summaries of the current level.
+
+        Args:
+            text (str): The text to summarize
+            max_length (int): Maximum length of the summary (and of each chunk summary)
+            min_length (int): Minimum length of the final summary
+            chunk_tokens (Optional[int]): Token budget per chunk, defaults to the model limit
+            overlap_sentences (int): Sentences repeated at the start of the next chunk
+            batch_size (int): Number of chunks per forward pass
+            length_unit (str): "tokens" or "words" for the summary lengths (the chunk
+                budget is always in tokens), see summarize()
+
+        Returns:
+            Dict containing the summary text, metadata and per-level timings
+        """
+        if not text.strip():
+            raise ValueError("Input text cannot be empty")
+        if overlap_sentences < 0:
+            raise ValueError("overlap_sentences cannot be negative")
+        _check_length_unit(length_unit)
+
+        tokenizer = self.summarizer.tokenizer
+        special_tokens = tokenizer.num_special_tokens_to_add()
+        if chunk_tokens is None:
+            chunk_tokens = self.max_input_tokens - special_tokens
+
+        text = text.strip()
+        current = text
+        levels: List[Dict[str, Any]] = []
+
+        def encode(level_text: str) -> Tuple[Any, float]:
+            start = time.perf_counter()
+            # Offsets let sentence lengths be read off this encoding instead of re-tokenizing
+            encoding = tokenizer(level_text, return_offsets_mapping=tokenizer.is_fast)
+            return encoding, time.perf_counter() - start
+
+        try:
+            encoding, tokenize_seconds = encode(current)
+            for level in range(MAX_REDUCE_LEVELS):
+                input_tokens = len(encoding["input_ids"]) - special_tokens
+                if input_tokens <= chunk_tokens:
+                    break
+
+                start = time.perf_counter()
+                sentences, lengths = self._sentence_lengths(
+                    current, encoding.get("offset_mapping")
+                )
+                summaries: List[str] = []
+                batch: List[str] = []
+                for chunk in self._iter_chunks(sentences, lengths, chunk_tokens, overlap_sentences):
+                    batch.append(chunk)
+                    if len(batch) == batch_size:
+                        summaries.extend(
+                            self._summarize_chunks(batch, max_length, batch_size, length_unit)
+                        )
+                        batch = []
+                if batch:
+                    summaries.extend(
+                        self._summarize_chunks(batch, max_length, batch_size, length_unit)
+                    )
+
+                levels.append(
+                    {
+                        "level": level,
+                        "chunks": len(summaries),
+                        "input_tokens": input_tokens,
+                        "seconds": time.perf_counter() - start,
+                    }
+                )
+                logger.info(
+                    f"Reduced level {level}: {input_tokens} tokens -> "
+                    f"{len(summaries)} chunk summaries"
+                )
+                current = " ".join(summaries)
+                encoding, tokenize_seconds = encode(current)
+
+            start = time.perf_counter()
+            input_tokens = len(encoding["input_ids"]) - special_tokens
+            final = self._generate(
+                [current],
+                max_length,
+                min_length,
+                False,
+                length_unit,
+                encoded=[encoding["input_ids"]],
+                tokenize_seconds=tokenize_seconds,
+            )[0]
+            levels.append(
+                {
+                    "level": len(levels),
+                    "chunks": 1,
+                    "input_tokens": input_tokens,
+                    "seconds": time.perf_counter() - start,
+                }
+            )
+
+            result: Dict[str, Any] = self._build_result(text, final["summary"])
+            result["levels"] = levels
+            return result
+
+        except Exception as e:
+            logger.error(f"Long document summarization failed: {str(e)}")
             raise
 
+    def _sentence_lengths(
+        self, text: str, offsets: Optional[List[Tuple[int, int]]]
+    ) -> Tuple[List[str], List[int]]:
+        """
+        Split ``text`` into sentences and count the tokens of each.
+
+        Args:
+            text (str): The text that was tokenized
+            offsets (Optional[List[Tuple[int, int]]]): Character span of every token in
+                ``text``, or None if the tokenizer cannot report them
+
+        Returns:
+            Tuple of the sentences and their token counts
+        """
+        spans = sentence_spans(text)
+        sentences = [text[start:end].strip() for start, end in spans]
+        if offsets is None:
+            # Slow tokenizers have no offsets, so tokenize the sentences themselves
+            encoded = self.summarizer.tokenizer(sentences, add_special_tokens=False)
+            return sentences, [len(ids) for ids in encoded["input_ids"]]
+
+        starts = [start for start, _ in spans]
+        lengths = [0] * len(spans)
+        for token_start, token_end in offsets:
+            # Special tokens have empty spans
+            if token_end > token_start:
+                lengths[max(bisect.bisect_right(starts, token_start) - 1, 0)] += 1
+        return sentences, lengths
+
+    @staticmethod
+    def _iter_chunks(
+        sentences: List[str], lengths: List[int], chunk_tokens: int, overlap_sentences: int
+    ) -> Iterator[str]:
+        """Yield runs of ``sentences`` whose token ``lengths`` fit in ``chunk_tokens``."""
+        chunk: List[int] = []
+        used = 0
+        for index, length in enumerate(lengths):
+            if chunk and used + length > chunk_tokens:
+                yield " ".join(sentences[i] for i in chunk)
+                # Carry trailing sentences over for context, if they leave room
+                keep = min(overlap_sentences, len(chunk) - 1)
+                chunk = chunk[len(chunk) - keep :] if keep else []
+                used = sum(lengths[i] for i in chunk)
+                while chunk and used + length > chunk_tokens:
+                    used -= lengths[chunk.pop(0)]
+            chunk.append(index)
+            used += length
+        if chunk:
+            yield " ".join(sentences[i] for i in chunk)
+
+    def _summarize_chunks(
+        self, chunks: List[str], max_length: int, batch_size: int, length_unit: str
+    ) -> List[str]:
+        """Summarize intermediate chunks, letting short chunks produce short summaries."""
+        results = self.summarize_many(
+            chunks,
+            batch_size=batch_size,
+            max_length=max_length,
+            min_length=0,
+            length_unit=length_unit,
+        )
+        return [result["summary"] for result in results]
+
+    def _generate(
+        self,
+        texts: List[str],
+        max_length: int,
+        min_length: int,
+        do_sample: bool,
+        length_unit: str = "tokens",
+        encoded: Optional[List[List[int]]] = None,
+        tokenize_seconds: float = 0.0,
+        profile: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Tokenize, generate and decode one batch, recording per-stage timings.
+
+        Callers that already tokenized ``texts`` pass the ids as ``encoded`` (and
+        the time that took as ``tokenize_seconds``) so they are not tokenized
+        twice. Inputs longer than the model limit are truncated (keeping the
+        final end-of-sequence token) and flagged with ``truncated`` in the result.
+        ``deadline`` is a ``time.perf_counter()`` value at which generation stops.
+        Time spent in the encoder is counted under ``generate``; ``encoder_reused``
+        tells whether it was skipped thanks to the encoder cache.
+        """
+        import torch
+
+        tokenizer = self.summarizer.tokenizer
+        model = self.summarizer.model
+        limit = self.max_input_tokens
+
+        start = time.perf_counter()
+        if encoded is None:
+            encoded = self._tokenize(texts)
+        batch = self._prepare(encoded)
+        tokenize_seconds += time.perf_counter() - start
+        input_tokens = [len(ids) for ids in encoded]
+        input_words = [len(text.split()) for text in texts]
+        max_tokens, min_tokens = self._token_limits(
+            max_length, min_length, length_unit, input_tokens, input_words
+        )
+
+        # Every sequence in the batch runs as many steps as the longest input needs
+        work_tokens = min(max(input_tokens), limit) + max_tokens
+        start = time.perf_counter()
+        generation, encoder_reused = self._encoder_outputs(batch)
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if profile is None:
+                profile = self.choose_profile(work_tokens, remaining)
+            # Hard stop: generate() returns whatever it has when time runs out
+            generation["max_time"] = max(remaining, 0.0)
+        profile = profile or "quality"
+        generation.update(GENERATION_PROFILES[profile])
+
+        decoder_start = time.perf_counter()
+        with self._in_use(), torch.inference_mode():
+            output_ids = model.generate(
+                **batch,
+                max_length=max_tokens,
+                min_length=min_tokens,
+                do_sample=do_sample,
+                **generation,
+            )
+        finished = time.perf_counter()
+        generate_seconds = finished - start
+        stopped_early = (
+            "max_time" in generation and finished - decoder_start >= generation["max_time"]
+        )
+        if not stopped_early:
+            self._measure_profile(profile, generate_seconds / work_tokens)
+
+        start = time.perf_counter()
+        summaries = tokenizer.batch_decode(
+            output_ids, skip_special_tokens=True, clean_up_tokenization_spaces=False
+        )
+        decode_seconds = time.perf_counter() - start
+
+        output_tokens = (output_ids != tokenizer.pad_token_id).sum(dim=1).tolist()
+        timings = {
+            "tokenize": tokenize_seconds,
+            "generate": generate_seconds,
+            "decode": decode_seconds,
+            "total": tokenize_seconds + generate_seconds + decode_seconds,
+        }
+        tokens_per_second = sum(output_tokens) / generate_seconds if generate_seconds else 0.0
+
+        results = []
+        rows = zip(texts, summaries, input_words, input_tokens, output_tokens)
+        for text, summary, n_words, n_in, n_out in rows:
+            result: Dict[str, Any] = self._build_result(text, summary, n_words)
+            result.update(
+                {
+                    "input_tokens": n_in,
+                    "output_tokens": n_out,
+                    "truncated": n_in > limit,
+                    "batch_size": len(texts),
+                    "tokens_per_second": tokens_per_second,
+                    "timings": dict(timings),
+                    "profile": profile,
+                    "stopped_early": stopped_early,
+                    "encoder_reused": encoder_reused,
+                }
+            )
+            self._emit_metrics(result)
+            results.append(result)
+        self._measure_lengths(
+            output_ids, output_tokens, [result["summary_length"] for result in results]
+        )
+        return results
+
+    def estimate_seconds(self, profile: str, work_tokens: int) -> Optional[float]:
+        """
+        Predict how long generation takes with a decoding profile.
+
+        Profiles that have not run yet are estimated from a measured one, scaled
+        by the ratio of their beam counts.
+
+        Args:
+            profile (str): Name of a profile in GENERATION_PROFILES
+            work_tokens (int): Input tokens plus the maximum number of output tokens
+
+        Returns:
+            Optional[float]: Predicted seconds, or None before any generation is measured
+        """
+        with self._stats_lock:
+            rates = dict(self._profile_rates)
+        if profile in rates:
+            return rates[profile] * work_tokens
+        if not rates:
+            return None
+        measured, rate = next(iter(rates.items()))
+        return rate * self._num_beams(profile) / self._num_beams(measured) * work_tokens
+
+    def choose_profile(self, work_tokens: int, seconds: float) -> str:
+        """
+        Pick the highest-quality decoding profile expected to finish in time.
+
+        Args:
+            work_tokens (int): Input tokens plus the maximum number of output tokens
+            seconds (float): Time available for generation
+
+        Returns:
+            str: A profile name, "fast" if nothing is expected to fit or nothing is measured
+        """
+        for profile in reversed(list(GENERATION_PROFILES)):
+            estimate = self.estimate_seconds(profile, work_tokens)
+            if estimate is not None and estimate <= seconds:
+                return profile
+        return "fast"
+
+    def _num_beams(self, profile: str) -> int:
+        beams = GENERATION_PROFILES[profile].get("num_beams")
+        if beams is None:
+            config = self.summarizer.model.generation_config
+            beams = getattr(config, "num_beams", None) or 1
+        return beams
+
+    def _measure_profile(self, profile: str, seconds_per_token: float) -> None:
+        """Fold one generation's speed into the profile's moving average."""
+        with self._stats_lock:
+            previous = self._profile_rates.get(profile)
+            if previous is None:
+                self._profile_rates[profile] = seconds_per_token
+            else:
+                self._profile_rates[profile] = (
+                    PROFILE_RATE_SMOOTHING * seconds_per_token
+                    + (1 - PROFILE_RATE_SMOOTHING) * previous
+                )
+
+    def _cache_key(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        length_unit: str,
+        profile: str,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Cache key of a deterministic result generated with ``profile``."""
+        if profile != "quality":
+            options = {**(options or {}), "profile": profile}
+        return make_cache_key(
+            text, self.model_id, max_length, min_length, False, length_unit, options
+        )
+
+    def _cache_lookup(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        length_unit: str,
+        profile: Optional[str],
+        deadline: Optional[float],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Find a cached result acceptable for the request, best profile first."""
+        for candidate in _acceptable_profiles(profile, deadline):
+            key = self._cache_key(text, max_length, min_length, length_unit, candidate, options)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        return None
+
+    def _near_duplicate_lookup(
+        self,
+        text: str,
+        signature: Any,
+        max_length: int,
+        min_length: int,
+        length_unit: str,
+        profile: Optional[str],
+        deadline: Optional[float],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Reuse the result of a near-duplicate input, flagged with ``reused``."""
+        for candidate in _acceptable_profiles(profile, deadline):
+            namespace = self._cache_key("", max_length, min_length, length_unit, candidate, options)
+            match = self.near_duplicates.lookup(text, namespace, signature)
+            if match is not None:
+                stored, similarity = match
+                result = dict(stored)
+                # Lengths describe this input, the summary is the near-duplicate's
+                result.update(self._build_result(text, stored["summary"]))
+                result["reused"] = True
+                result["similarity"] = similarity
+                return result
+        return None
+
+    def _encoder_outputs(self, batch: Any) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run the encoder on a prepared batch, or take its output from the encoder cache.
+
+        Returns:
+            Tuple of the keyword arguments that hand the encoder output to generate()
+            (empty without a cache, so generate() runs the encoder itself) and whether
+            the output came from the cache
+        """
+        import torch
+        from transformers.modeling_outputs import BaseModelOutput
+
+        model = self.summarizer.model
+        if self.encoder_cache is None or self.backend != "torch":
+            return {}, False
+        # Outputs differ between precisions and live on the model's device
+        model_key = f"{self.model_id}:{model.device}"
+        key = make_encoder_key(model_key, batch["input_ids"].cpu().numpy())
+        hidden_states = self.encoder_cache.get(key)
+        reused = hidden_states is not None
+        if not reused:
+            with self._in_use(), torch.inference_mode():
+                encoder = model.get_encoder()
+                hidden_states = encoder(**batch, return_dict=True).last_hidden_state
+            self.encoder_cache.set(key, hidden_states)
+        # generate() expands the outputs for beam search in place, so wrap them afresh
+        return {"encoder_outputs": BaseModelOutput(last_hidden_state=hidden_states)}, reused
+
+    def count_tokens(self, text: str) -> int:
+        """Number of model tokens in a text, including special tokens, before truncation."""
+        return len(self._tokenize([text])[0])
+
+    def _tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Token ids of each text, with special tokens and without truncation."""
+        return self.summarizer.tokenizer(texts)["input_ids"]
+
+    def _prepare(self, encoded: List[List[int]]) -> Any:
+        """Truncate token ids to the model limit and pad them into model inputs."""
+        tokenizer = self.summarizer.tokenizer
+        limit = self.max_input_tokens
+        # Keep the final end-of-sequence token when truncating
+        encoded = [ids if len(ids) <= limit else ids[: limit - 1] + ids[-1:] for ids in encoded]
+        batch = tokenizer.pad({"input_ids": encoded}, return_tensors="pt")
+        return batch.to(self.summarizer.model.device)
+
+    def _token_limits(
+        self,
+        max_length: int,
+        min_length: int,
+        length_unit: str,
+        input_tokens: List[int],
+        input_words: List[int],
+    ) -> Tuple[int, int]:
+        """
+        Convert summary length targets into the token limits passed to generate().
+
+        Word targets use the tokens-per-word ratio measured on earlier summaries.
+        Before any exist, the ratio of the inputs themselves is used, since a
+        summary mostly reuses its input's vocabulary.
+
+        Both limits are clamped to the model's position limit, which generate()
+        cannot go past, and min_length never exceeds max_length.
+
+        Returns:
+            Tuple of (max_length, min_length) in tokens, including special tokens
+        """
+        if length_unit == "tokens":
+            max_tokens = min(max_length, self.max_input_tokens)
+            return max_tokens, min(min_length, max_tokens)
+
+        special_tokens = self.summarizer.tokenizer.num_special_tokens_to_add()
+        ratio = self.tokens_per_word
+        if ratio is None:
+            content_tokens = sum(input_tokens) - special_tokens * len(input_tokens)
+            ratio = content_tokens / max(sum(input_words), 1)
+        with self._stats_lock:
+            overhead = self._output_overhead
+        if overhead is None:
+            overhead = special_tokens
+
+        max_tokens = min(math.ceil(max_length * ratio) + overhead, self.max_input_tokens)
+        min_tokens = math.floor(min_length * ratio) + overhead if min_length else 0
+        return max_tokens, min(min_tokens, max_tokens)
+
+    def _measure_lengths(
+        self, output_ids: "torch.Tensor", output_tokens: List[int], summary_words: List[int]
+    ) -> None:
+        """Add generated summaries to the measured tokens-per-word ratio."""
+        import torch
+
+        special_ids = torch.tensor(
+            self.summarizer.tokenizer.all_special_ids, device=output_ids.device
+        )
+        content_tokens = (~torch.isin(output_ids, special_ids)).sum(dim=1).tolist()
+        with self._stats_lock:
+            self._summary_tokens += sum(content_tokens)
+            self._summary_words += sum(summary_words)
+            # Start/end tokens the model adds around every summary
+            self._output_overhead = max(
+                total - content for total, content in zip(output_tokens, content_tokens)
+            )
+
+    def _emit_metrics(self, result: Dict[str, Any]) -> None:
+        """Push one result's timings and token counts to every metric sink."""
+        if not self.metric_sinks:
+            return
+        record = {
+            key: result[key]
+            for key in (
+                "input_tokens",
+                "output_tokens",
+                "truncated",
+                "batch_size",
+                "tokens_per_second",
+                "timings",
+            )
+        }
+        record["model"] = self.model_id
+        for sink in self.metric_sinks:
+            try:
+                sink.record(record)
+            except Exception as e:
+                # A broken sink must never fail a summarization request
+                logger.warning(f"Metric sink {type(sink).__name__} failed: {str(e)}")
+
+    @staticmethod
+    def _build_result(
+        text: str, summary: str, original_length: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Assemble the result dict shared by all summarization entry points."""
+        if original_length is None:
+            original_length = len(text.split())
+        summary_length = len(summary.split())
+        return {
+            "summary": summary,
+            "original_length": original_length,
+            "summary_length": summary_length,
+            "compression_ratio": summary_length / original_length,
+        }
+
 
 def generate_summary(text: str, max_length: int = 130, min_length: int = 30) -> str:
     """
@@ -101,12 +1807,18 @@ def generate_summary(text: str, max_length: int = 130, min_length: int = 30) ->
     Returns:
         str: The generated summary
     """
+    # The pipeline is shared through model_registry, so only the first call loads it
     summarizer = TextSummarizer()
     result = summarizer.summarize(text, max_length, min_length)
     return result["summary"]
 
 
 if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
     # Example usage
     sample_text = """
     Artificial intelligence (AI) is intelligence demonstrated by machines,
@@ -0,0 +1,121 @@
+"""
+Accuracy check for int8 quantization: compares ROUGE of int8 summaries against fp32 ones.
+
+Run from the project directory:
+
+    python -m tests.quantization_accuracy
+"""
+
+import sys
+import os
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from summarizer import TextSummarizer
+from .test_data import (
+    SHORT_TEXT,
+    TECHNICAL_TEXT,
+    HISTORICAL_TEXT,
+    NEWS_TEXT,
+    SCIENTIFIC_TEXT,
+    MULTI_TOPIC_TEXT,
+    DIALOGUE_TEXT,
+)
+
+TEXTS = {
+    "Short Text (Photosynthesis)": SHORT_TEXT,
+    "Technical Text (Neural Networks)": TECHNICAL_TEXT,
+    "Long Text (Industrial Revolution)": HISTORICAL_TEXT,
+    "News Article (Quantum Computing)": NEWS_TEXT,
+    "Scientific Abstract (AlphaFold)": SCIENTIFIC_TEXT,
+    "Multi-topic Text (Climate & Tech)": MULTI_TOPIC_TEXT,
+    "Dialogue Text (Apollo 11)": DIALOGUE_TEXT,
+}
+
+# Mean ROUGE-L F1 (int8 vs fp32) below this fails the check
+MIN_ROUGE_L = 0.6
+
+
+def _f1(overlap, reference_total, candidate_total):
+    if not overlap:
+        return 0.0
+    precision = overlap / candidate_total
+    recall = overlap / reference_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def _ngrams(tokens, n):
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def rouge_scores(reference, candidate):
+    """Return ROUGE-1, ROUGE-2 and ROUGE-L F1 scores of candidate against reference."""
+    ref = reference.lower().split()
+    cand = candidate.lower().split()
+    scores = {}
+    for n in (1, 2):
+        ref_ngrams, cand_ngrams = _ngrams(ref, n), _ngrams(cand, n)
+        overlap = sum((ref_ngrams & cand_ngrams).values())
+        scores[f"rouge{n}"] = _f1(
+            overlap, sum(ref_ngrams.values()), sum(cand_ngrams.values())
+        )
+    scores["rougeL"] = _f1(_lcs_length(ref, cand), len(ref), len(cand))
+    return scores
+
+
+def summarize_all(summarizer):
+    """Summarize every sample text, returning summaries and total seconds."""
+    start = time.perf_counter()
+    summaries = {name: summarizer.summarize(text)['summary'] for name, text in TEXTS.items()}
+    return summaries, time.perf_counter() - start
+
+
+def main():
+    """Compare int8 summaries with fp32 summaries and report ROUGE and timings."""
+    fp32 = TextSummarizer()
+    int8 = TextSummarizer(quantize="int8")
+
+    # Load both models before timing generation
+    fp32.summarizer
+    int8.summarizer
+
+    reference, fp32_seconds = summarize_all(fp32)
+    candidate, int8_seconds = summarize_all(int8)
+
+    totals = Counter()
+    for name in TEXTS:
+        scores = rouge_scores(reference[name], candidate[name])
+        totals.update(scores)
+        print(f"\n{name}:")
+        print("-" * 50)
+        print(
+            f"ROUGE-1 {scores['rouge1']:.3f}  ROUGE-2 {scores['rouge2']:.3f}  "
+            f"ROUGE-L {scores['rougeL']:.3f}"
+        )
+        print(f"fp32: {reference[name]}")
+        print(f"int8: {candidate[name]}")
+
+    mean_rouge_l = totals['rougeL'] / len(TEXTS)
+    print("\n" + "=" * 50)
+    print(f"Mean ROUGE-1: {totals['rouge1'] / len(TEXTS):.3f}")
+    print(f"Mean ROUGE-2: {totals['rouge2'] / len(TEXTS):.3f}")
+    print(f"Mean ROUGE-L: {mean_rouge_l:.3f} (minimum {MIN_ROUGE_L})")
+    print(f"fp32 time: {fp32_seconds:.2f}s, int8 time: {int8_seconds:.2f}s "
+          f"({fp32_seconds / int8_seconds:.2f}x)")
+    return 0 if mean_rouge_l >= MIN_ROUGE_L else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Unit tests for the benchmark statistics and regression checks.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from bench.stats import find_regressions, latency_summary, percentile
+
+
+def make_report(p50, docs_per_sec):
+    return {
+        'model_load_seconds': 10.0,
+        'latency': {'short': {'p50': p50, 'p95': p50 * 2, 'p99': p50 * 3}},
+        'throughput': [{'mode': 'batch', 'size': 8, 'docs_per_sec': docs_per_sec}],
+    }
+
+
+class TestBenchStats(unittest.TestCase):
+    """Test cases for benchmark statistics."""
+
+    def test_percentile(self):
+        """Test linear-interpolated percentiles."""
+        values = [4, 1, 3, 2, 5]
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile(values, 50), 3)
+        self.assertEqual(percentile(values, 100), 5)
+        self.assertAlmostEqual(percentile([1, 2], 95), 1.95)
+
+    def test_percentile_empty(self):
+        """Test that percentiles of no samples are rejected."""
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+
+    def test_latency_summary(self):
+        """Test the latency summary fields."""
+        summary = latency_summary([1.0, 2.0, 3.0])
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(summary['mean'], 2.0)
+        self.assertEqual(summary['p50'], 2.0)
+
+    def test_no_regression_within_threshold(self):
+        """Test that small changes pass."""
+        self.assertEqual(find_regressions(make_report(1.0, 10.0), make_report(1.05, 9.5), 0.1), [])
+
+    def test_latency_regression(self):
+        """Test that slower latency is reported."""
+        regressions = find_regressions(make_report(1.0, 10.0), make_report(1.5, 10.0), 0.1)
+        self.assertTrue(any(r.startswith('latency.short.p50') for r in regressions))
+
+    def test_throughput_regression(self):
+        """Test that lower throughput is reported, but higher throughput is not."""
+        regressions = find_regressions(make_report(1.0, 10.0), make_report(1.0, 5.0), 0.1)
+        self.assertEqual([r.split(':')[0] for r in regressions], ['throughput.batch.8'])
+        self.assertEqual(find_regressions(make_report(1.0, 10.0), make_report(1.0, 20.0), 0.1), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
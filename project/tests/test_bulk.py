@@ -0,0 +1,184 @@
+"""
+Unit tests for the bulk summarization CLI helpers.
+"""
+
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import bulk
+from bulk import Checkpoint, InvalidDocument, iter_documents, parse_args, run
+
+
+class FakeSummarizer:
+    """Stands in for TextSummarizer; upper-cases each text and fails on 'explode'."""
+
+    def summarize_many(self, texts, batch_size=8, max_length=130, min_length=30,
+                       length_unit='tokens'):
+        if any('explode' in text for text in texts):
+            raise RuntimeError('model failed')
+        return [{'summary': text.upper()[:max_length]} for text in texts]
+
+
+class TestBulk(unittest.TestCase):
+    """Test cases for input streaming and checkpointing."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_jsonl_input(self):
+        """Test JSONL records with and without ids."""
+        path = self.write('docs.jsonl', '{"id": "a", "text": "First."}\n\n{"text": "Second."}\n')
+        self.assertEqual(
+            list(iter_documents([path])), [('a', 'First.'), ('docs.jsonl:3', 'Second.')]
+        )
+
+    def test_custom_fields(self):
+        """Test configurable text and id fields."""
+        path = self.write('docs.jsonl', '{"key": 7, "body": "Text."}\n')
+        self.assertEqual(
+            list(iter_documents([path], text_field='body', id_field='key')), [('7', 'Text.')]
+        )
+
+    def test_directory_is_sorted(self):
+        """Test that directories are read in a stable order."""
+        self.write('b.txt', 'Bee.')
+        self.write('a.txt', 'Ay.')
+        self.write('sub/c.jsonl', '{"id": "c", "text": "See."}\n')
+        self.write('ignored.csv', 'x')
+        self.assertEqual(
+            list(iter_documents([self.root])), [('a.txt', 'Ay.'), ('b.txt', 'Bee.'), ('c', 'See.')]
+        )
+
+    def test_invalid_lines(self):
+        """Test that unreadable JSONL lines become InvalidDocuments, not exceptions."""
+        path = self.write(
+            'docs.jsonl', '{"id": "a", "text": "Ok."}\n{not json\n[1]\n{"id": "n", "text": 5}\n'
+        )
+        documents = list(iter_documents([path]))
+        self.assertEqual(documents[0], ('a', 'Ok.'))
+        self.assertTrue(all(isinstance(d, InvalidDocument) for d in documents[1:]))
+        self.assertEqual([d.id for d in documents[1:]], ['docs.jsonl:2', 'docs.jsonl:3', 'n'])
+
+    def test_checkpoint_round_trip(self):
+        """Test that saved progress is read back by a new checkpoint."""
+        output = os.path.join(self.root, 'out.jsonl')
+        Checkpoint(output).save(16, 4096)
+        checkpoint = Checkpoint(output)
+        self.assertEqual((checkpoint.completed, checkpoint.output_bytes), (16, 4096))
+        with open(checkpoint.path) as f:
+            self.assertEqual(json.load(f), {'completed': 16, 'output_bytes': 4096})
+
+    def test_fresh_checkpoint(self):
+        """Test that a missing checkpoint starts from the beginning."""
+        checkpoint = Checkpoint(os.path.join(self.root, 'out.jsonl'))
+        self.assertEqual((checkpoint.completed, checkpoint.output_bytes), (0, 0))
+
+    def test_parse_args(self):
+        """Test command-line defaults."""
+        args = parse_args(['in.jsonl', '-o', 'out.jsonl', '--workers', '4'])
+        self.assertEqual(args.workers, 4)
+        self.assertEqual(args.batch_size, 8)
+        self.assertIsNone(args.threads)
+        self.assertFalse(args.share_weights)
+        self.assertFalse(args.low_memory)
+
+
+@unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'needs fork')
+class TestRun(unittest.TestCase):
+    """Test cases for run(), with forked workers sharing a fake summarizer."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        # Inherited by the forked workers, so no model or torch is needed
+        bulk._worker_summarizer = FakeSummarizer()
+        configure = bulk.configure_torch_threads
+        bulk.configure_torch_threads = lambda threads: None
+
+        def restore():
+            bulk._worker_summarizer = None
+            bulk.configure_torch_threads = configure
+            gc.unfreeze()
+
+        self.addCleanup(restore)
+
+    def run_bulk(self, lines, output='out.jsonl'):
+        path = os.path.join(self.tmpdir.name, 'docs.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        output = os.path.join(self.tmpdir.name, output)
+        args = parse_args(
+            [path, '-o', output, '--workers', '2', '--batch-size', '2', '--share-weights']
+        )
+        return run(args), output
+
+    def read(self, output):
+        with open(output, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_output_in_input_order(self):
+        """Test that every document is written once, in input order."""
+        lines = [json.dumps({'id': str(i), 'text': f'document {i}'}) for i in range(9)]
+        written, output = self.run_bulk(lines)
+        self.assertEqual(written, 9)
+        records = self.read(output)
+        self.assertEqual([r['id'] for r in records], [str(i) for i in range(9)])
+        self.assertEqual(records[4]['summary'], 'DOCUMENT 4')
+
+    def test_errors_are_recorded(self):
+        """Test that bad lines and failing documents get error records and the run goes on."""
+        lines = [
+            '{"id": "a", "text": "fine"}',
+            '{not json',
+            '{"id": "b", "text": "explode"}',
+            '{"id": "c", "text": "also fine"}',
+            '{"id": "d", "text": "   "}',
+        ]
+        written, output = self.run_bulk(lines)
+        self.assertEqual(written, 5)
+        records = self.read(output)
+        self.assertEqual([r['id'] for r in records], ['a', 'docs.jsonl:2', 'b', 'c', 'd'])
+        self.assertEqual(records[0]['summary'], 'FINE')
+        self.assertIn('Invalid JSON', records[1]['error'])
+        self.assertEqual(records[2]['error'], 'model failed')
+        self.assertEqual(records[3]['summary'], 'ALSO FINE')
+        self.assertEqual(records[4]['error'], 'Input text cannot be empty')
+
+    def test_resume_from_checkpoint(self):
+        """Test that a rerun after a crash skips finished documents and drops partial output."""
+        lines = [json.dumps({'id': str(i), 'text': f'document {i}'}) for i in range(5)]
+        _, complete = self.run_bulk(lines, 'complete.jsonl')
+        with open(complete, 'rb') as f:
+            finished = f.readline() + f.readline()
+
+        # What a crash after the second document's checkpoint leaves behind
+        output = os.path.join(self.tmpdir.name, 'out.jsonl')
+        with open(output, 'wb') as f:
+            f.write(finished + b'{"id": "2", "summ')
+        Checkpoint(output).save(2, len(finished))
+
+        written, output = self.run_bulk(lines)
+        self.assertEqual(written, 3)
+        self.assertEqual(self.read(output), self.read(complete))
+        self.assertEqual(self.run_bulk(lines)[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
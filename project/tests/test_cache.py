@@ -0,0 +1,159 @@
+"""
+Unit tests for the summary cache.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from cache import EncoderCache, SummaryCache, make_cache_key, make_encoder_key
+
+RESULT = {
+    'summary': 'Plants turn sunlight into energy.',
+    'original_length': 60,
+    'summary_length': 5,
+    'compression_ratio': 5 / 60,
+}
+
+
+class TestSummaryCache(unittest.TestCase):
+    """Test cases for the SummaryCache class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'summaries.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_normalizes_whitespace(self):
+        """Test that whitespace differences map to the same key."""
+        key_a = make_cache_key("Hello   world.\n", "bart", 130, 30, False)
+        key_b = make_cache_key(" Hello world.", "bart", 130, 30, False)
+        self.assertEqual(key_a, key_b)
+
+    def test_key_includes_parameters(self):
+        """Test that model and generation parameters change the key."""
+        base = make_cache_key("Hello world.", "bart", 130, 30, False)
+        self.assertNotEqual(base, make_cache_key("Hello world.", "other", 130, 30, False))
+        self.assertNotEqual(base, make_cache_key("Hello world.", "bart", 100, 30, False))
+        self.assertNotEqual(base, make_cache_key("Hello world.", "bart", 130, 10, False))
+        self.assertNotEqual(
+            base, make_cache_key("Hello world.", "bart", 130, 30, False, length_unit="words")
+        )
+        self.assertNotEqual(
+            base, make_cache_key("Hello world.", "bart", 130, 30, False, options={"mode": "hybrid"})
+        )
+
+    def test_memory_hit_and_miss(self):
+        """Test memory-only lookups and counters."""
+        cache = SummaryCache(max_entries=2)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', RESULT)
+        self.assertEqual(cache.get('a'), RESULT)
+        stats = cache.stats()
+        self.assertEqual(stats['memory_hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted from memory."""
+        cache = SummaryCache(max_entries=2)
+        cache.set('a', RESULT)
+        cache.set('b', RESULT)
+        cache.get('a')
+        cache.set('c', RESULT)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+
+    def test_disk_persistence(self):
+        """Test that results survive a new cache instance via SQLite."""
+        cache = SummaryCache(path=self.path)
+        cache.set('a', RESULT)
+        cache.close()
+
+        reopened = SummaryCache(path=self.path)
+        self.assertEqual(reopened.get('a'), RESULT)
+        self.assertEqual(reopened.stats()['disk_hits'], 1)
+        reopened.close()
+
+    def test_disk_size_eviction(self):
+        """Test that the disk tier is bounded."""
+        cache = SummaryCache(max_entries=1, path=self.path, max_disk_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, RESULT)
+        self.assertEqual(cache.stats()['disk_entries'], 2)
+        cache.close()
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        cache = SummaryCache(path=self.path, ttl=0.01)
+        cache.set('a', RESULT)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['disk_entries'], 0)
+        cache.close()
+
+    def test_returns_copies(self):
+        """Test that callers cannot mutate cached results."""
+        cache = SummaryCache()
+        cache.set('a', RESULT)
+        cache.get('a')['summary'] = 'changed'
+        self.assertEqual(cache.get('a')['summary'], RESULT['summary'])
+
+
+class TestEncoderCache(unittest.TestCase):
+    """Test cases for the EncoderCache class."""
+
+    def test_key_includes_model_and_ids(self):
+        """Test that keys change with the model, the ids and the batch shape."""
+        ids = np.array([[0, 10, 11, 2]])
+        key = make_encoder_key('bart', ids)
+        self.assertEqual(key, make_encoder_key('bart', ids.copy()))
+        self.assertNotEqual(key, make_encoder_key('bart@int8', ids))
+        self.assertNotEqual(key, make_encoder_key('bart', np.array([[0, 10, 12, 2]])))
+        self.assertNotEqual(key, make_encoder_key('bart', ids.reshape(2, 2)))
+
+    def test_hit_and_miss(self):
+        """Test that stored outputs are returned as-is and counted."""
+        cache = EncoderCache()
+        hidden = np.zeros((1, 4, 8), dtype=np.float32)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', hidden)
+        self.assertIs(cache.get('a'), hidden)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': 128})
+
+    def test_entry_eviction(self):
+        """Test that the least recently used output is evicted first."""
+        cache = EncoderCache(max_entries=2)
+        for key in 'abc':
+            if key == 'c':
+                cache.get('a')
+            cache.set(key, np.zeros(4))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_byte_budget(self):
+        """Test that outputs are evicted to stay within max_bytes."""
+        cache = EncoderCache(max_entries=10, max_bytes=100)
+        cache.set('a', np.zeros(8))
+        cache.set('b', np.zeros(8))
+        self.assertIsNone(cache.get('a'))
+        cache.set('huge', np.zeros(20))
+        self.assertIsNone(cache.get('huge'))
+        cache.set('b', np.zeros(4))
+        self.assertEqual(cache.stats()['bytes'], 32)
+
+    def test_invalid_size(self):
+        """Test that an empty cache is rejected."""
+        with self.assertRaises(ValueError):
+            EncoderCache(max_entries=0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,93 @@
+"""
+Unit tests for the near-duplicate (MinHash-LSH) index.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dedup import NearDuplicateIndex, shingles
+from .test_data import HISTORICAL_TEXT, NEWS_TEXT, SCIENTIFIC_TEXT
+
+# The same story with a byline, timestamp and footer added
+NEWS_VARIANT = (
+    'By Jane Doe | Updated 12 May 2024 09:14 UTC\n'
+    + NEWS_TEXT
+    + '\nSubscribe to our newsletter for more stories like this.'
+)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test cases for the NearDuplicateIndex class."""
+
+    def setUp(self):
+        self.index = NearDuplicateIndex(threshold=0.8)
+        self.index.add(NEWS_TEXT, {'summary': 'news'}, 'params')
+        self.index.add(HISTORICAL_TEXT, {'summary': 'history'}, 'params')
+
+    def test_shingles_ignore_case_and_punctuation(self):
+        """Test that normalization makes formatting differences irrelevant."""
+        self.assertEqual(shingles('Hello,   World! Again.'), shingles('hello world again'))
+        self.assertEqual(shingles('Two words'), ['two words'])
+
+    def test_near_duplicate_is_found(self):
+        """Test that a re-published story matches the original."""
+        result, similarity = self.index.lookup(NEWS_VARIANT, 'params')
+        self.assertEqual(result, {'summary': 'news'})
+        self.assertGreaterEqual(similarity, 0.8)
+
+    def test_results_are_copied(self):
+        """Test that changing an added or returned result does not change the index."""
+        result = {'summary': 'science', 'timings': {'total': 1.0}}
+        self.index.add(SCIENTIFIC_TEXT, result, 'params')
+        result['summary'] = 'changed by the caller'
+        found, _ = self.index.lookup(SCIENTIFIC_TEXT, 'params')
+        found['timings']['total'] = 0.0
+        found, _ = self.index.lookup(SCIENTIFIC_TEXT, 'params')
+        self.assertEqual(found, {'summary': 'science', 'timings': {'total': 1.0}})
+
+    def test_different_text_misses(self):
+        """Test that unrelated texts do not match."""
+        self.assertIsNone(self.index.lookup(SCIENTIFIC_TEXT, 'params'))
+        self.assertEqual(self.index.stats()['misses'], 1)
+
+    def test_namespaces_are_separate(self):
+        """Test that entries only match under the namespace they were added with."""
+        self.assertIsNone(self.index.lookup(NEWS_TEXT, 'other params'))
+
+    def test_bounded_with_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        index = NearDuplicateIndex(max_entries=2)
+        index.add(NEWS_TEXT, {'summary': 'news'})
+        index.add(HISTORICAL_TEXT, {'summary': 'history'})
+        index.lookup(NEWS_TEXT)
+        index.add(SCIENTIFIC_TEXT, {'summary': 'science'})
+        self.assertEqual(len(index), 2)
+        self.assertIsNone(index.lookup(HISTORICAL_TEXT))
+        self.assertIsNotNone(index.lookup(NEWS_TEXT))
+
+    def test_save_and_load(self):
+        """Test that a saved index answers the same lookups after loading."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'index.json')
+            self.index.save(path)
+            loaded = NearDuplicateIndex()
+            loaded.load(path)
+            self.assertEqual(len(loaded), 2)
+            self.assertEqual(loaded.lookup(NEWS_VARIANT, 'params')[0], {'summary': 'news'})
+
+            with self.assertRaises(ValueError):
+                NearDuplicateIndex(seed=2).load(path)
+
+    def test_invalid_settings(self):
+        """Test that inconsistent settings are rejected."""
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(threshold=0)
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(num_perm=100, bands=16)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
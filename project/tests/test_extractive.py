@@ -0,0 +1,77 @@
+"""
+Unit tests for extractive (TF-IDF/TextRank) sentence selection.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from extractive import (
+    extract,
+    extractive_summary,
+    score_sentences,
+    select_sentences,
+    split_sentences,
+    tfidf_matrix,
+)
+from .test_data import NEWS_TEXT
+
+SENTENCES = [
+    'The city council approved the new park budget on Monday.',
+    'The park budget includes funds for trees and new playgrounds.',
+    'My cat likes to sleep in the sun.',
+    'Council members said the park budget will be reviewed next year.',
+]
+
+
+class TestExtractive(unittest.TestCase):
+    """Test cases for the extractive summarizer."""
+
+    def test_tfidf_rows_are_normalized(self):
+        """Test that every non-empty sentence vector has unit length."""
+        vectors = tfidf_matrix(SENTENCES + ['...'])
+        norms = (vectors ** 2).sum(axis=1)
+        for norm in norms[:-1]:
+            self.assertAlmostEqual(float(norm), 1.0, places=5)
+        self.assertEqual(float(norms[-1]), 0.0)
+
+    def test_off_topic_sentence_scores_lowest(self):
+        """Test that both methods rank the unrelated sentence last."""
+        for method in ('textrank', 'tfidf'):
+            scores = score_sentences(SENTENCES, method)
+            self.assertEqual(int(scores.argmin()), 2, method)
+
+    def test_unknown_method(self):
+        """Test that unknown scoring methods are rejected."""
+        with self.assertRaises(ValueError):
+            score_sentences(SENTENCES, 'lexrank')
+
+    def test_select_respects_budget_and_order(self):
+        """Test greedy selection within a budget, returned in document order."""
+        lengths = [10, 10, 8, 11]
+        kept = select_sentences(score_sentences(SENTENCES), lengths, budget=21)
+        self.assertLessEqual(sum(lengths[i] for i in kept), 21)
+        self.assertEqual(kept, sorted(kept))
+        self.assertNotIn(2, kept)
+
+    def test_select_keeps_top_sentence_over_budget(self):
+        """Test that at least one sentence is kept even if it is too long."""
+        self.assertEqual(len(select_sentences(score_sentences(SENTENCES), [50] * 4, 10)), 1)
+
+    def test_extract_within_budget_keeps_everything(self):
+        """Test that short texts are not touched."""
+        self.assertEqual(extract(SENTENCES, 1000), [0, 1, 2, 3])
+
+    def test_extractive_summary(self):
+        """Test the model-free summary of a real article."""
+        summary = extractive_summary(NEWS_TEXT, max_words=60)
+        self.assertTrue(summary)
+        self.assertLessEqual(len(summary.split()), 60)
+        article = ' '.join(NEWS_TEXT.split())
+        for sentence in split_sentences(summary):
+            self.assertIn(sentence, article)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,155 @@
+"""
+Unit tests for incremental summarization of growing documents.
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from incremental import IncrementalSummarizer
+
+
+def make_text(start, count):
+    """Build distinct eleven-word sentences numbered from start."""
+    return ' '.join(
+        f'Sentence number {i} talks about topic {i} in some more detail.'
+        for i in range(start, start + count)
+    )
+
+
+class FakeSummarizer:
+    """Stands in for TextSummarizer and records the texts it is asked to summarize."""
+
+    def __init__(self):
+        self.texts = []
+
+    def summarize(self, text, max_length=130, min_length=30, **kwargs):
+        self.texts.append(text)
+        return {'summary': ' '.join(text.split()[:3])}
+
+    def summarize_many(self, texts, **kwargs):
+        self.texts.extend(texts)
+        return [{'summary': ' '.join(text.split()[:3])} for text in texts]
+
+
+class BlockingSummarizer(FakeSummarizer):
+    """Holds summaries of texts containing 'slow' until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def summarize(self, text, max_length=130, min_length=30, **kwargs):
+        if 'slow' in text:
+            self.started.set()
+            self.release.wait(5)
+        return super().summarize(text, max_length, min_length)
+
+
+class TestIncrementalSummarizer(unittest.TestCase):
+    """Test cases for the IncrementalSummarizer class."""
+
+    def setUp(self):
+        self.model = FakeSummarizer()
+        self.incremental = IncrementalSummarizer(
+            self.model, max_chunk_words=60, min_chunk_words=20, fanout=3
+        )
+
+    def test_chunks_cover_text(self):
+        """Test that chunks keep every sentence and respect the size limit."""
+        text = make_text(0, 40)
+        chunks = self.incremental.chunk(text)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(' '.join(chunks), text)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.split()), 60)
+
+    def test_single_chunk(self):
+        """Test that short documents are summarized directly."""
+        result = self.incremental.update('doc', 'One short sentence. And another.')
+        self.assertEqual(result['chunks'], 1)
+        self.assertEqual(result['levels'], 1)
+        self.assertEqual(self.model.texts, ['One short sentence. And another.'])
+
+    def test_unchanged_text_is_free(self):
+        """Test that refreshing an unchanged document calls no model."""
+        text = make_text(0, 40)
+        first = self.incremental.update('doc', text)
+        self.model.texts.clear()
+        second = self.incremental.update('doc', text)
+        self.assertEqual(second['resummarized'], 0)
+        self.assertEqual(self.model.texts, [])
+        self.assertEqual(second['summary'], first['summary'])
+
+    def test_append_resummarizes_tail(self):
+        """Test that appending text only regenerates the tail of the tree."""
+        text = make_text(0, 200)
+        first = self.incremental.update('doc', text)
+        self.assertGreater(first['levels'], 2)
+        chunks = self.incremental.chunk(text)
+
+        self.model.texts.clear()
+        grown = text + ' ' + make_text(200, 3)
+        result = self.incremental.update('doc', grown)
+        leaves = [t for t in self.model.texts if t in self.incremental.chunk(grown)]
+        self.assertEqual(len(leaves), 1)
+        # One leaf plus one node per level and the root, far fewer than the chunk count
+        self.assertLessEqual(result['resummarized'], result['levels'] + 1)
+        self.assertLess(result['resummarized'], len(chunks))
+        self.assertEqual(result['original_length'], 2233)
+
+    def test_edit_resummarizes_changed_chunk(self):
+        """Test that editing one sentence leaves the other chunks cached."""
+        text = make_text(0, 60)
+        self.incremental.update('doc', text)
+        self.model.texts.clear()
+        edited = text.replace('topic 30 ', 'a different subject ')
+        self.incremental.update('doc', edited)
+        changed_chunks = [t for t in self.model.texts if 'different subject' in t]
+        self.assertEqual(len(changed_chunks), 1)
+        self.assertLess(len(self.model.texts), len(self.incremental.chunk(edited)))
+
+    def test_documents_are_separate_and_bounded(self):
+        """Test that trees are kept per document id and old ones are dropped."""
+        incremental = IncrementalSummarizer(self.model, max_documents=2)
+        for doc_id in ('a', 'b', 'c'):
+            incremental.update(doc_id, f'Text of document {doc_id}.')
+        self.assertEqual(incremental.documents(), ['b', 'c'])
+        incremental.forget('b')
+        self.assertEqual(incremental.documents(), ['c'])
+
+    def test_documents_update_concurrently(self):
+        """Test that one document's generation does not block another document."""
+        model = BlockingSummarizer()
+        incremental = IncrementalSummarizer(model)
+        slow = threading.Thread(target=incremental.update, args=('a', 'A slow document.'))
+        slow.start()
+        self.assertTrue(model.started.wait(5))
+        try:
+            results = []
+            quick = threading.Thread(
+                target=lambda: results.append(incremental.update('b', 'A quick document.'))
+            )
+            quick.start()
+            quick.join(2)
+            self.assertEqual(len(results), 1)
+            self.assertFalse(model.release.is_set())
+        finally:
+            model.release.set()
+            slow.join()
+
+    def test_invalid_arguments(self):
+        """Test that empty text and inconsistent settings are rejected."""
+        with self.assertRaises(ValueError):
+            self.incremental.update('doc', '  ')
+        with self.assertRaises(ValueError):
+            IncrementalSummarizer(self.model, max_chunk_words=10, min_chunk_words=20)
+        with self.assertRaises(ValueError):
+            IncrementalSummarizer(self.model, fanout=1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,131 @@
+"""
+Unit tests for the background job queue.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from jobs import JobQueue
+
+
+class FakeSummarizer:
+    """Stands in for TextSummarizer and records each call's batch size."""
+
+    model_id = 'fake-model'
+
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+
+    def summarize_many(self, texts, batch_size=8, max_length=130, min_length=30,
+                       length_unit='tokens'):
+        if self.gate is not None:
+            self.gate.wait()
+        if any('explode' in text for text in texts):
+            raise RuntimeError('model failed')
+        self.batches.append(len(texts))
+        return [{'summary': text[:max_length]} for text in texts]
+
+    def summarize(self, text, max_length=130, min_length=30, length_unit='tokens',
+                  mode='abstractive'):
+        self.batches.append(1)
+        return {'summary': text[:max_length], 'mode': mode}
+
+
+def wait_finished(batch, timeout=5):
+    """Poll a batch until every document is done or failed."""
+    deadline = time.monotonic() + timeout
+    while not batch.progress()['finished']:
+        if time.monotonic() > deadline:
+            raise AssertionError('batch did not finish')
+        time.sleep(0.01)
+    return batch.progress()
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for the JobQueue class."""
+
+    def make_queue(self, summarizer, batch_size=8):
+        queue = JobQueue(summarizer, batch_size=batch_size)
+        self.addCleanup(queue.stop)
+        return queue
+
+    def test_submit_returns_immediately(self):
+        """Test that submitting does not wait for the model."""
+        gate = threading.Event()
+        queue = self.make_queue(FakeSummarizer(gate))
+        batch = queue.submit([('a.txt', 'First document.'), ('b.txt', 'Second document.')])
+        self.assertFalse(batch.progress()['finished'])
+        gate.set()
+        progress = wait_finished(batch)
+        self.assertEqual((progress['done'], progress['failed']), (2, 0))
+        self.assertEqual(batch.jobs[1].result['summary'], 'Second document.')
+
+    def test_documents_are_batched(self):
+        """Test that queued documents with the same settings share a batch."""
+        summarizer = FakeSummarizer()
+        queue = self.make_queue(summarizer, batch_size=3)
+        documents = [(f'{i}.txt', f'Document {i}.') for i in range(7)]
+        wait_finished(queue.submit(documents, max_length=5))
+        self.assertEqual(sum(summarizer.batches), 7)
+        self.assertLessEqual(max(summarizer.batches), 3)
+
+    def test_session_results_are_reused(self):
+        """Test that resubmitting with earlier settings is answered from the results."""
+        summarizer = FakeSummarizer()
+        queue = self.make_queue(summarizer)
+        results = {}
+        documents = [('a.txt', 'Some document text.')]
+        for max_length in (60, 90):
+            batch = queue.submit(documents, max_length=max_length, results=results)
+            wait_finished(batch)
+            results.update(batch.results())
+        again = queue.submit(documents, max_length=60, results=results)
+        self.assertEqual(again.progress()['cached'], 1)
+        self.assertTrue(again.progress()['finished'])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(sum(summarizer.batches), 2)
+
+    def test_results_are_not_written_by_the_worker(self):
+        """Test that the queue only reads the caller's results, leaving copying to the caller."""
+        queue = self.make_queue(FakeSummarizer())
+        results = {}
+        batch = queue.submit([('a.txt', 'Some document text.'), ('b.txt', '  ')], results=results)
+        wait_finished(batch)
+        self.assertEqual(results, {})
+        self.assertEqual(batch.results(), {batch.jobs[0].key: batch.jobs[0].result})
+
+    def test_decoding_profile_is_part_of_the_key(self):
+        """Test that greedy and beam-search results for the same settings do not collide."""
+        queue = self.make_queue(FakeSummarizer())
+        beam = queue.result_key('Text.', 130, 30, 'words', 'abstractive')
+        greedy = queue.result_key('Text.', 130, 30, 'words', 'abstractive', 'fast')
+        self.assertNotEqual(beam, greedy)
+        batch = queue.submit([('a.txt', 'Text.')], 130, 30, 'words')
+        self.assertEqual(batch.jobs[0].key, beam)
+
+    def test_failures_are_reported(self):
+        """Test that empty documents and model errors fail only their jobs."""
+        queue = self.make_queue(FakeSummarizer())
+        failed = queue.submit([('empty.txt', '  '), ('bad.txt', 'explode')])
+        progress = wait_finished(failed)
+        self.assertEqual(progress['failed'], 2)
+        self.assertEqual(failed.jobs[0].error, 'Input text cannot be empty')
+        self.assertEqual(failed.jobs[1].error, 'model failed')
+        ok = queue.submit([('ok.txt', 'Fine.')])
+        self.assertEqual(wait_finished(ok)['done'], 1)
+
+    def test_fast_mode(self):
+        """Test that non-abstractive modes summarize each document on its own."""
+        queue = self.make_queue(FakeSummarizer())
+        batch = queue.submit([('a.txt', 'Quick one.')], mode='fast')
+        wait_finished(batch)
+        self.assertEqual(batch.jobs[0].result['mode'], 'fast')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,62 @@
+"""
+Unit tests for the metric sinks.
+"""
+
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from metrics import CallbackSink, LoggingSink, PrometheusSink
+
+
+def make_record(batch_size=1, truncated=False):
+    return {
+        'model': 'bart',
+        'input_tokens': 200,
+        'output_tokens': 40,
+        'truncated': truncated,
+        'batch_size': batch_size,
+        'tokens_per_second': 20.0,
+        'timings': {'tokenize': 0.01, 'generate': 2.0, 'decode': 0.001, 'total': 2.011},
+    }
+
+
+class TestMetricSinks(unittest.TestCase):
+    """Test cases for the metric sinks."""
+
+    def test_callback_sink(self):
+        """Test that records reach the callback unchanged."""
+        records = []
+        CallbackSink(records.append).record(make_record())
+        self.assertEqual(records, [make_record()])
+
+    def test_logging_sink(self):
+        """Test that the logging sink writes one line per record."""
+        with self.assertLogs('metrics', level='INFO') as logs:
+            LoggingSink().record(make_record())
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('input_tokens=200', logs.output[0])
+
+    def test_prometheus_sink(self):
+        """Test counters and per-batch timing attribution."""
+        sink = PrometheusSink()
+        sink.record(make_record(batch_size=2))
+        sink.record(make_record(batch_size=2, truncated=True))
+        text = sink.render()
+        self.assertIn('summarizer_summaries_total{model="bart"} 2', text)
+        self.assertIn('summarizer_truncated_inputs_total{model="bart"} 1', text)
+        self.assertIn('summarizer_tokens_total{model="bart",direction="input"} 400', text)
+        # Two summaries from one batch of two count the batch time once
+        self.assertIn('summarizer_stage_seconds_total{model="bart",stage="generate"} 2.000000', text)
+
+    def test_logging_sink_level(self):
+        """Test that the logging level is configurable."""
+        with self.assertLogs('metrics', level='DEBUG') as logs:
+            LoggingSink(level=logging.DEBUG).record(make_record())
+        self.assertTrue(logs.output[0].startswith('DEBUG'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
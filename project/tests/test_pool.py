@@ -0,0 +1,134 @@
+"""
+Unit tests for the multi-model pool.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pool import ModelPool
+
+MIB = 2**20
+
+
+class FakeTensor:
+    """Reports a size like a torch tensor."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def numel(self):
+        return self.size
+
+    def element_size(self):
+        return 1
+
+
+class FakeRegistry:
+    """Stands in for ModelRegistry; each model's weights are as many MiB as its name says."""
+
+    def __init__(self):
+        self.loaded = set()
+
+    def get(self, model_name, device=-1, dtype=None, quantize=None, backend='torch',
+            warmup=False, low_memory=False):
+        self.loaded.add(model_name)
+        weights = [FakeTensor(int(model_name.split('-')[1]) * MIB)]
+        return SimpleNamespace(
+            model=SimpleNamespace(parameters=lambda: weights, buffers=lambda: [])
+        )
+
+    def unload(self, model_name, device=-1, dtype=None, quantize=None, backend='torch'):
+        self.loaded.discard(model_name)
+        return True
+
+
+class TestModelPool(unittest.TestCase):
+    """Test cases for the ModelPool class."""
+
+    def setUp(self):
+        self.registry = FakeRegistry()
+
+    def make_pool(self, **kwargs):
+        kwargs.setdefault('default_model', 'base-100')
+        return ModelPool(registry=self.registry, **kwargs)
+
+    def use(self, pool, *models):
+        for model in models:
+            with pool.acquire(model):
+                pass
+
+    def test_lru_eviction_under_memory_budget(self):
+        """Test that the least recently used model is unloaded to fit the budget."""
+        pool = self.make_pool(memory_budget=250 * MIB)
+        self.use(pool, 'legal-100', 'medical-100', 'legal-100', 'finance-100')
+        self.assertEqual(pool.loaded_models(), ['legal-100', 'finance-100'])
+        self.assertEqual(self.registry.loaded, {'legal-100', 'finance-100'})
+        stats = pool.stats()
+        self.assertEqual((stats['loads'], stats['evictions']), (3, 1))
+        self.assertEqual(stats['memory_bytes'], 200 * MIB)
+        self.assertEqual(stats['models']['legal-100']['requests'], 2)
+
+    def test_reload_after_eviction(self):
+        """Test that an evicted model is loaded again on its next request."""
+        pool = self.make_pool(max_models=1)
+        self.use(pool, 'legal-10', 'medical-10', 'legal-10')
+        self.assertEqual(pool.loaded_models(), ['legal-10'])
+        self.assertEqual(pool.stats()['loads'], 3)
+
+    def test_models_in_use_are_not_evicted(self):
+        """Test that a model with a generation in flight stays loaded."""
+        pool = self.make_pool(max_models=1)
+        with pool.acquire('legal-10'):
+            self.use(pool, 'medical-10')
+            self.assertIn('legal-10', self.registry.loaded)
+        self.assertEqual(pool.stats()['evictions'], 0)
+
+    def test_concurrency_limit(self):
+        """Test that generations beyond max_concurrency wait for a free slot."""
+        pool = self.make_pool(max_concurrency=1)
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with pool.acquire('legal-10'):
+                entered.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        entered.wait()
+        waited = []
+        second = threading.Thread(target=lambda: waited.append(self.use(pool, 'legal-10')))
+        second.start()
+        time.sleep(0.1)
+        self.assertEqual(waited, [])
+        self.assertEqual(pool.stats()['models']['legal-10']['active'], 1)
+        release.set()
+        thread.join()
+        second.join()
+        self.assertEqual(len(waited), 1)
+
+    def test_allowed_models(self):
+        """Test that models outside the configured list are rejected."""
+        pool = self.make_pool(models=['legal-10'])
+        self.assertEqual(pool.models, ['base-100', 'legal-10'])
+        self.assertIs(pool.summarizer(), pool.summarizer('base-100'))
+        with self.assertRaises(ValueError):
+            pool.summarizer('unknown-10')
+        for name in (['legal-10'], {'name': 'legal-10'}):
+            with self.assertRaises(ValueError):
+                pool.summarizer(name)
+
+    def test_invalid_concurrency(self):
+        """Test that a pool needs at least one slot per model."""
+        with self.assertRaises(ValueError):
+            self.make_pool(max_concurrency=0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
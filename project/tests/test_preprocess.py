@@ -0,0 +1,147 @@
+"""
+Unit tests for input cleaning.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from preprocess import TextCleaner, clean_text
+from .test_data import NEWS_TEXT, SHORT_TEXT, TECHNICAL_TEXT
+
+# The sample texts as the cleaner returns them, on one line
+NEWS = ' '.join(NEWS_TEXT.split())
+SHORT = ' '.join(SHORT_TEXT.split())
+
+PAGE = f"""<html><head><style>body {{ color: red; }}</style>
+<script>if (a < b) {{ track(); }}</script></head>
+<body>
+<a href="#main">Skip to content</a>
+<nav><a href="/">Home</a> | <a href="/news">News</a></nav>
+<!-- article starts -->
+<h1>Quantum&nbsp;computing   milestone</h1>
+<p>{NEWS_TEXT}</p>
+<div class="promo"><p>Subscribe to our newsletter</p></div>
+<p>{SHORT_TEXT}</p>
+<p>{SHORT_TEXT}</p>
+<footer>© 2024 Example News. All rights reserved.</footer>
+</body></html>
+"""
+
+
+class TestCleanText(unittest.TestCase):
+    """Test cases for cleaning a whole document."""
+
+    def test_html_page(self):
+        """Test that markup, chrome and repeats are removed and the article kept."""
+        cleaned, report = clean_text(PAGE)
+        paragraphs = cleaned.split('\n\n')
+        self.assertEqual(paragraphs[0], 'Quantum computing milestone')
+        self.assertEqual(paragraphs[1:], [NEWS, SHORT])
+        self.assertEqual(report['duplicate_paragraphs'], 1)
+        self.assertEqual(report['removed_paragraphs'], 4)
+        self.assertLess(report['characters_after'], report['characters_before'])
+        self.assertEqual(report['characters_after'], len(cleaned))
+        self.assertEqual(report['words_after'], len(cleaned.split()))
+
+    def test_whitespace(self):
+        """Test that whitespace runs collapse and wrapped lines are joined."""
+        cleaned, _ = clean_text('First  line\u00a0of\ttext\nwraps\u200b here.\n\n\n\nNext one.')
+        self.assertEqual(cleaned, 'First line of text wraps here.\n\nNext one.')
+
+    def test_long_lines_are_kept(self):
+        """Test that boilerplate patterns only drop short lines."""
+        sentence = ('Researchers found that people who subscribe to several streaming services '
+                    'watch less live television than they did five years ago.')
+        self.assertEqual(clean_text(sentence)[0], sentence)
+        self.assertEqual(clean_text('Subscribe now')[0], '')
+
+    def test_wrapped_prose_is_kept(self):
+        """Test that wrapped lines mentioning boilerplate words stay in their paragraph."""
+        text = """
+The service changed its
+privacy policy to allow advertisers to see more data,
+and users who tried to sign up
+for an account were asked to agree to the new terms.
+
+Revenue rose 5% as more readers chose to subscribe.
+"""
+        cleaned, report = clean_text(text)
+        self.assertEqual(
+            cleaned,
+            'The service changed its privacy policy to allow advertisers to see more data, '
+            'and users who tried to sign up for an account were asked to agree to the new '
+            'terms.\n\nRevenue rose 5% as more readers chose to subscribe.',
+        )
+        self.assertEqual(report['removed_paragraphs'], 0)
+        for sample in (SHORT_TEXT, TECHNICAL_TEXT, NEWS_TEXT):
+            self.assertEqual(clean_text(sample)[0], ' '.join(sample.split()))
+
+    def test_plain_text_comparisons(self):
+        """Test that angle brackets in plain text are not mistaken for tags."""
+        text = 'if a<b and c>d then stop.\n\nIt holds when x < y and y > z.'
+        self.assertEqual(clean_text(text)[0], text)
+        self.assertEqual(clean_text('<p>Stop if a &lt; b.</p>')[0], 'Stop if a < b.')
+
+    def test_options(self):
+        """Test that each stage can be turned off."""
+        text = '<b>Share this</b>\n\nSame.\n\nSame.'
+        self.assertEqual(
+            clean_text(text, strip_html=False, boilerplate=None, dedupe=False)[0],
+            '<b>Share this</b>\n\nSame.\n\nSame.',
+        )
+
+    def test_tokens_saved(self):
+        """Test that a token counter adds token counts to the report."""
+        _, report = clean_text(PAGE, count_tokens=lambda text: len(text.split()))
+        self.assertEqual(report['tokens_before'], report['words_before'])
+        self.assertEqual(report['tokens_saved'], report['tokens_before'] - report['tokens_after'])
+        self.assertGreater(report['tokens_saved'], 0)
+
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for cleaning a document fed in pieces."""
+
+    def test_pieces_match_whole_document(self):
+        """Test that any split of the input gives the same result as one call."""
+        expected, _ = clean_text(PAGE)
+        for size in (1, 7, 64, 500):
+            cleaner = TextCleaner()
+            pieces = [cleaner.feed(PAGE[i : i + size]) for i in range(0, len(PAGE), size)]
+            self.assertEqual(''.join(pieces) + cleaner.finish(), expected, size)
+
+    def test_paragraphs_are_emitted_early(self):
+        """Test that finished paragraphs come out before the document ends."""
+        cleaner = TextCleaner()
+        self.assertEqual(cleaner.feed('First paragraph\nstill first'), '')
+        self.assertEqual(cleaner.feed('\n\nSecond'), 'First paragraph still first')
+        self.assertEqual(cleaner.finish(), '\n\nSecond')
+
+    def test_unfinished_tags_are_held_back(self):
+        """Test that a tag or script split across pieces is not emitted half-cleaned."""
+        cleaner = TextCleaner()
+        self.assertEqual(cleaner.feed('Kept.\n\n<script>\nvar x = 1;\n'), 'Kept.')
+        self.assertEqual(cleaner.feed('</script><a\nhref="/">Also kept.</a>\n\n'), '\n\nAlso kept.')
+        self.assertEqual(cleaner.finish(), '')
+
+    def test_unclosed_script_is_linear(self):
+        """Test that a script block left open does not make cleaning quadratic."""
+        page = '<p>Body text.</p>\n' * 20000 + '<script>\n' + 'var x = 1;\n' * 2000
+        start = time.perf_counter()
+        cleaned, _ = clean_text(page)
+        self.assertLess(time.perf_counter() - start, 3)
+        self.assertEqual(cleaned.split('\n\n')[0], 'Body text.')
+
+    def test_reuse_for_next_document(self):
+        """Test that repeats are only detected within one document."""
+        cleaner = TextCleaner()
+        cleaner.feed(SHORT_TEXT)
+        self.assertEqual(cleaner.finish(), SHORT)
+        cleaner.feed(SHORT_TEXT)
+        self.assertEqual(cleaner.finish(), SHORT)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
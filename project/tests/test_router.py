@@ -0,0 +1,101 @@
+"""
+Unit tests for cascade routing between a small and a large model.
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from router import CascadeRouter
+from summarizer import TextSummarizer
+from .test_data import HISTORICAL_TEXT, SHORT_TEXT
+
+# Tiny randomly initialised BART, only useful for checking the plumbing
+TINY_MODEL = 'sshleifer/bart-tiny-random'
+
+
+class FakeSummarizer:
+    """Stands in for TextSummarizer and records the texts it receives."""
+
+    def __init__(self, name):
+        self.model_id = name
+        self.texts = []
+
+    def summarize(self, text, **kwargs):
+        self.texts.append(text)
+        return {'summary': text[:10], 'kwargs': kwargs}
+
+    def summarize_many(self, texts, **kwargs):
+        self.texts.extend(texts)
+        return [{'summary': text[:10], 'kwargs': kwargs} for text in texts]
+
+
+class TestCascadeRouter(unittest.TestCase):
+    """Test cases for the CascadeRouter class."""
+
+    def setUp(self):
+        self.small = FakeSummarizer('small-model')
+        self.large = FakeSummarizer('large-model')
+        self.router = CascadeRouter(self.small, self.large, max_small_words=50)
+
+    def test_short_text_goes_small(self):
+        """Test that short plain inputs use the small model."""
+        result = self.router.summarize('A short note. It is easy.', max_length=40)
+        self.assertEqual(result['route']['tier'], 'small')
+        self.assertEqual(result['route']['model'], 'small-model')
+        self.assertEqual(result['kwargs'], {'max_length': 40})
+
+    def test_long_text_goes_large(self):
+        """Test that inputs over the word threshold use the large model."""
+        result = self.router.summarize(HISTORICAL_TEXT)
+        self.assertEqual(result['route']['tier'], 'large')
+        self.assertIn('words >', result['route']['reason'])
+
+    def test_long_sentences_go_large(self):
+        """Test that dense run-on sentences count as hard."""
+        text = ' '.join(['word'] * 40) + '.'
+        self.assertEqual(self.router.route(text)[0], 'large')
+
+    def test_summarize_many_keeps_order(self):
+        """Test that each tier gets one batch and results come back in order."""
+        texts = ['Tiny one.', HISTORICAL_TEXT, 'Tiny two.']
+        results = self.router.summarize_many(texts, batch_size=4)
+        self.assertEqual([r['route']['tier'] for r in results], ['small', 'large', 'small'])
+        self.assertEqual(self.small.texts, ['Tiny one.', 'Tiny two.'])
+        self.assertEqual(self.router.stats(), {'small': 2, 'large': 1})
+
+    def test_result_is_copied(self):
+        """Test that the route is added to a copy, leaving shared results untouched."""
+        shared = {'summary': 'cached'}
+        self.small.summarize = lambda text, **kwargs: shared
+        self.router.summarize('Tiny.')
+        self.assertNotIn('route', shared)
+
+    def test_empty_text(self):
+        """Test that empty inputs are rejected before routing."""
+        with self.assertRaises(ValueError):
+            self.router.summarize('   ')
+        with self.assertRaises(ValueError):
+            self.router.summarize_many(['ok.', ' '])
+
+
+@unittest.skipUnless(importlib.util.find_spec('transformers'), 'transformers is not installed')
+class TestCascadeModels(unittest.TestCase):
+    """Run the router end to end on tiny local checkpoints."""
+
+    def test_end_to_end(self):
+        """Test that both tiers produce results with routing information."""
+        router = CascadeRouter(TextSummarizer(TINY_MODEL), TextSummarizer(TINY_MODEL))
+        results = router.summarize_many(
+            [SHORT_TEXT, HISTORICAL_TEXT], max_length=20, min_length=5
+        )
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertIn('summary', result)
+            self.assertEqual(result['route']['model'], TINY_MODEL)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
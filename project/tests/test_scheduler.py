@@ -0,0 +1,130 @@
+"""
+Unit tests for the asyncio micro-batching scheduler.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scheduler import BatchScheduler
+
+
+class FakeSummarizer:
+    """Stands in for TextSummarizer and records the batches it receives."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.length_units = []
+        self.threads = set()
+        self.fail = fail
+
+    def summarize_many(
+        self,
+        texts,
+        batch_size=8,
+        max_length=130,
+        min_length=30,
+        do_sample=False,
+        length_unit='tokens',
+    ):
+        self.batches.append((list(texts), max_length))
+        self.length_units.append(length_unit)
+        self.threads.add(threading.get_ident())
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return [{'summary': text.upper(), 'max_length': max_length} for text in texts]
+
+
+class TestBatchScheduler(unittest.TestCase):
+    """Test cases for the BatchScheduler class."""
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Test that concurrent callers share one batch and get their own result."""
+        fake = FakeSummarizer()
+        scheduler = BatchScheduler(fake, max_batch_size=16, max_wait=0.05)
+
+        async def run():
+            texts = [f"text {i}" for i in range(10)]
+            results = await asyncio.gather(*(scheduler.submit(text) for text in texts))
+            await scheduler.close()
+            return texts, results
+
+        texts, results = asyncio.run(run())
+        self.assertEqual([r['summary'] for r in results], [t.upper() for t in texts])
+        self.assertEqual(len(fake.batches), 1)
+        self.assertNotIn(threading.get_ident(), fake.threads)
+
+    def test_max_batch_size(self):
+        """Test that batches never exceed max_batch_size."""
+        fake = FakeSummarizer()
+        scheduler = BatchScheduler(fake, max_batch_size=3, max_wait=0.05)
+
+        async def run():
+            await asyncio.gather(*(scheduler.submit(f"text {i}") for i in range(7)))
+            await scheduler.close()
+
+        asyncio.run(run())
+        self.assertTrue(all(len(texts) <= 3 for texts, _ in fake.batches))
+        self.assertEqual(sum(len(texts) for texts, _ in fake.batches), 7)
+
+    def test_parameters_split_batches(self):
+        """Test that requests with different generation parameters are not mixed."""
+        fake = FakeSummarizer()
+        scheduler = BatchScheduler(fake, max_wait=0.05)
+
+        async def run():
+            results = await asyncio.gather(
+                scheduler.submit("a", max_length=50),
+                scheduler.submit("b", max_length=100),
+                scheduler.submit("c", max_length=50),
+            )
+            await scheduler.close()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual([r['max_length'] for r in results], [50, 100, 50])
+        self.assertEqual(sorted(len(texts) for texts, _ in fake.batches), [1, 2])
+
+    def test_length_units_split_batches(self):
+        """Test that token and word length targets are batched separately."""
+        fake = FakeSummarizer()
+        scheduler = BatchScheduler(fake, max_wait=0.05)
+
+        async def run():
+            await asyncio.gather(
+                scheduler.submit("a"),
+                scheduler.submit("b", length_unit='words'),
+                scheduler.submit("c"),
+            )
+            await scheduler.close()
+
+        asyncio.run(run())
+        self.assertEqual(sorted(fake.length_units), ['tokens', 'words'])
+        self.assertEqual(sorted(len(texts) for texts, _ in fake.batches), [1, 2])
+
+    def test_errors_reach_every_caller(self):
+        """Test that a failed batch fails each waiting request."""
+        scheduler = BatchScheduler(FakeSummarizer(fail=True), max_wait=0.01)
+
+        async def run():
+            results = await asyncio.gather(
+                scheduler.submit("a"), scheduler.submit("b"), return_exceptions=True
+            )
+            await scheduler.close()
+            return results
+
+        for result in asyncio.run(run()):
+            self.assertIsInstance(result, RuntimeError)
+
+    def test_empty_text(self):
+        """Test that empty input is rejected before it is queued."""
+        scheduler = BatchScheduler(FakeSummarizer())
+        with self.assertRaises(ValueError):
+            asyncio.run(scheduler.submit("  "))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,280 @@
+"""
+Unit tests for the HTTP inference server.
+"""
+
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from serve import SummaryServer
+
+
+class FakeSummarizer:
+    """Stands in for TextSummarizer with controllable load and run times."""
+
+    def __init__(self, loaded=None, delay=0.0):
+        self.loaded = loaded or threading.Event()
+        self.delay = delay
+        self.metric_sinks = []
+        if loaded is None:
+            self.loaded.set()
+
+    @property
+    def summarizer(self):
+        self.loaded.wait()
+        return self
+
+    def memory_usage(self):
+        return {'loaded': self.loaded.is_set(), 'resident_bytes': 1024, 'model_bytes': None}
+
+    def summarize_many(
+        self,
+        texts,
+        batch_size=8,
+        max_length=130,
+        min_length=30,
+        length_unit='tokens',
+        profile=None,
+        deadline=None,
+    ):
+        time.sleep(self.delay)
+        return [
+            {
+                'summary': text[:10],
+                'max_length': max_length,
+                'length_unit': length_unit,
+                'profile': profile,
+                'deadline': deadline,
+            }
+            for text in texts
+        ]
+
+
+class FakePool:
+    """Stands in for ModelPool and tags results with the model that produced them."""
+
+    models = ['legal']
+
+    def summarizer(self, model_name=None):
+        if model_name != 'legal':
+            raise ValueError(f'Unsupported model {model_name!r}')
+
+    def summarize_many(self, texts, model_name=None, **kwargs):
+        return [{'summary': text[:10], 'model': model_name} for text in texts]
+
+    def stats(self):
+        return {
+            'loads': 1,
+            'evictions': 0,
+            'loaded': 1,
+            'memory_bytes': 0,
+            'models': {'legal': {'active': 0}},
+        }
+
+
+class TestSummaryServer(unittest.TestCase):
+    """Test cases for the SummaryServer class."""
+
+    def start(self, summarizer, **kwargs):
+        server = SummaryServer(summarizer, port=0, **kwargs)
+        server.start()
+        self.addCleanup(server.stop)
+        host, port = server.address
+        return server, f"http://{host}:{port}"
+
+    def request(self, url, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        try:
+            with urllib.request.urlopen(url, data=data, timeout=5) as response:
+                return response.status, response.read().decode('utf-8')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8')
+
+    def wait_ready(self, server):
+        self.assertTrue(server.ready.wait(5))
+
+    def test_summarize(self):
+        """Test the single-text endpoint."""
+        server, url = self.start(FakeSummarizer())
+        self.wait_ready(server)
+        status, body = self.request(url + '/summarize', {'text': 'Hello world, again.'})
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['summary'], 'Hello worl')
+
+    def test_batch(self):
+        """Test the batch endpoint keeps order and parameters."""
+        server, url = self.start(FakeSummarizer())
+        self.wait_ready(server)
+        status, body = self.request(
+            url + '/summarize/batch', {'texts': ['first text', 'second text'], 'max_length': 60}
+        )
+        self.assertEqual(status, 200)
+        results = json.loads(body)['results']
+        self.assertEqual([r['summary'] for r in results], ['first text', 'second tex'])
+        self.assertTrue(all(r['max_length'] == 60 for r in results))
+
+    def test_length_unit(self):
+        """Test that word length targets reach the summarizer."""
+        server, url = self.start(FakeSummarizer())
+        self.wait_ready(server)
+        status, body = self.request(url + '/summarize', {'text': 'Hello.', 'length_unit': 'words'})
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['length_unit'], 'words')
+
+    def test_profile_and_deadline(self):
+        """Test that the request timeout becomes the generation deadline."""
+        server, url = self.start(FakeSummarizer(), request_timeout=10)
+        self.wait_ready(server)
+        status, body = self.request(url + '/summarize', {'text': 'Hello.', 'profile': 'fast'})
+        self.assertEqual(status, 200)
+        result = json.loads(body)
+        self.assertEqual(result['profile'], 'fast')
+        self.assertTrue(0 < result['deadline'] <= 10)
+        self.assertEqual(
+            self.request(url + '/summarize', {'text': 'Hi.', 'profile': 'ultra'})[0], 400
+        )
+        for profile in ([], {}, 1):
+            self.assertEqual(
+                self.request(url + '/summarize', {'text': 'Hi.', 'profile': profile})[0], 400
+            )
+
+    def test_model_from_pool(self):
+        """Test that requests naming a model are served by the pool."""
+        server, url = self.start(FakeSummarizer(), pool=FakePool())
+        self.wait_ready(server)
+        status, body = self.request(url + '/summarize', {'text': 'Hello.', 'model': 'legal'})
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['model'], 'legal')
+        status, body = self.request(url + '/summarize', {'text': 'Hello.'})
+        self.assertNotIn('model', json.loads(body))
+        for model in ('other', ['legal'], {'name': 'legal'}, 1):
+            self.assertEqual(
+                self.request(url + '/summarize', {'text': 'Hi.', 'model': model})[0], 400
+            )
+        self.assertIn('summarizer_pool_loads_total 1', self.request(url + '/metrics')[1])
+
+    def test_pool_needs_allow_list(self):
+        """Test that a pool allowing any model cannot be exposed to clients."""
+        pool = FakePool()
+        pool.models = None
+        with self.assertRaises(ValueError):
+            SummaryServer(FakeSummarizer(), port=0, pool=pool)
+
+    def test_model_without_pool(self):
+        """Test that naming a model is rejected when the server hosts only one."""
+        server, url = self.start(FakeSummarizer())
+        self.wait_ready(server)
+        self.assertEqual(
+            self.request(url + '/summarize', {'text': 'Hi.', 'model': 'legal'})[0], 400
+        )
+
+    def test_bad_requests(self):
+        """Test that invalid payloads return 400."""
+        server, url = self.start(FakeSummarizer())
+        self.wait_ready(server)
+        self.assertEqual(self.request(url + '/summarize', {'text': '  '})[0], 400)
+        self.assertEqual(self.request(url + '/summarize/batch', {'texts': []})[0], 400)
+        self.assertEqual(
+            self.request(url + '/summarize', {'text': 'Hi.', 'length_unit': 'pages'})[0], 400
+        )
+        self.assertEqual(self.request(url + '/nope', {})[0], 404)
+
+    def test_bad_timeouts(self):
+        """Test that timeouts that are not positive finite numbers return 400."""
+        server, url = self.start(FakeSummarizer())
+        self.wait_ready(server)
+        for timeout in (None, 'nan', 'soon', [1], {}, 0, -5, 'inf'):
+            status, body = self.request(url + '/summarize', {'text': 'Hi.', 'timeout': timeout})
+            self.assertEqual(status, 400, timeout)
+            self.assertIn('timeout', json.loads(body)['error'])
+
+    def test_bad_lengths(self):
+        """Test that lengths out of range return 400 instead of failing in generate."""
+        server, url = self.start(FakeSummarizer(), max_summary_length=512)
+        self.wait_ready(server)
+        for lengths in (
+            {'max_length': -5},
+            {'max_length': 0, 'min_length': 0},
+            {'min_length': -1},
+            {'max_length': 20, 'min_length': 40},
+            {'max_length': 100000},
+        ):
+            status, body = self.request(url + '/summarize', {'text': 'Hi.', **lengths})
+            self.assertEqual(status, 400, lengths)
+            self.assertIn('length', json.loads(body)['error'])
+        status, _ = self.request(url + '/summarize', {'text': 'Hi.', 'max_length': 512})
+        self.assertEqual(status, 200)
+
+    def test_body_size(self):
+        """Test that negative Content-Length returns 400 and oversized bodies 413."""
+        server, _ = self.start(FakeSummarizer(), max_body_bytes=1024)
+        self.wait_ready(server)
+
+        def post(body, length):
+            connection = http.client.HTTPConnection(*server.address, timeout=5)
+            self.addCleanup(connection.close)
+            connection.putrequest('POST', '/summarize')
+            connection.putheader('Content-Length', str(length))
+            connection.endheaders(body)
+            return connection.getresponse().status
+
+        small = json.dumps({'text': 'Hi.'}).encode('utf-8')
+        large = json.dumps({'text': 'x' * 2048}).encode('utf-8')
+        self.assertEqual(post(small, -1), 400)
+        self.assertEqual(post(large, len(large)), 413)
+        self.assertEqual(post(small, len(small)), 200)
+
+    def test_readiness_follows_model_load(self):
+        """Test that readiness and requests wait for the model."""
+        loaded = threading.Event()
+        server, url = self.start(FakeSummarizer(loaded=loaded))
+        self.assertEqual(self.request(url + '/healthz')[0], 200)
+        self.assertEqual(self.request(url + '/readyz')[0], 503)
+        self.assertEqual(self.request(url + '/summarize', {'text': 'too early'})[0], 503)
+        loaded.set()
+        self.wait_ready(server)
+        self.assertEqual(self.request(url + '/readyz')[0], 200)
+
+    def test_load_shedding_and_timeout(self):
+        """Test 429 when the queue is full and 504 when a request waits too long."""
+        server, url = self.start(
+            FakeSummarizer(delay=0.5), queue_size=1, max_batch_size=1, request_timeout=0.2
+        )
+        self.wait_ready(server)
+        statuses = []
+
+        def call():
+            statuses.append(self.request(url + '/summarize', {'text': 'some text'})[0])
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join()
+        self.assertIn(429, statuses)
+        self.assertIn(504, statuses)
+
+    def test_metrics(self):
+        """Test the Prometheus metrics endpoint."""
+        server, url = self.start(FakeSummarizer())
+        self.wait_ready(server)
+        self.request(url + '/summarize', {'text': 'Hello world.'})
+        status, body = self.request(url + '/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn('summarizer_http_responses_total{path="/summarize",status="200"} 1', body)
+        self.assertIn('summarizer_ready 1', body)
+        self.assertIn('summarizer_summaries_total', body)
+        self.assertIn('summarizer_resident_memory_bytes 1024', body)
+        self.assertNotIn('summarizer_model_memory_bytes', body)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -2,11 +2,23 @@
 Unit tests for the AI Text Summarizer.
 """
 
+import asyncio
+import importlib.util
+import subprocess
+import tempfile
+import threading
+import time
 import unittest
 import sys
 import os
+from types import SimpleNamespace
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from summarizer import TextSummarizer
+from cache import EncoderCache, SummaryCache
+from dedup import NearDuplicateIndex
+from extractive import sentence_spans, split_sentences
+from metrics import CallbackSink
+import summarizer as summarizer_module
+from summarizer import DEFAULT_MODEL, ModelRegistry, TextSummarizer, model_registry
 from .test_data import (
     SHORT_TEXT,
     TECHNICAL_TEXT,
@@ -107,6 +119,511 @@ class TestSummarizer(unittest.TestCase):
             print(f"Warning: summary shorter than min_length (got {summary_length})")
         self.assertTrue(summary_length <= 100)
 
+    def test_summarize_many_preserves_order(self):
+        """Test batched summarization returns results in input order."""
+        texts = [HISTORICAL_TEXT, SHORT_TEXT, NEWS_TEXT]
+        results = self.summarizer.summarize_many(texts, batch_size=2, max_length=60, min_length=10)
+        self.assertEqual(len(results), len(texts))
+        self.assertIn('industrial', results[0]['summary'].lower())
+        self.assertIn('photosynthesis', results[1]['summary'].lower())
+        self.assertIn('quantum', results[2]['summary'].lower())
+        for result in results:
+            self.assertLessEqual(
+                {'summary', 'original_length', 'summary_length', 'compression_ratio'}, set(result)
+            )
+
+    def test_summarize_many_empty_text(self):
+        """Test batched summarization rejects empty entries."""
+        with self.assertRaises(ValueError):
+            self.summarizer.summarize_many([SHORT_TEXT, "   "])
+
+    def test_summarize_long_document(self):
+        """Test map-reduce summarization of text beyond the model input limit."""
+        long_text = " ".join([HISTORICAL_TEXT, NEWS_TEXT, SCIENTIFIC_TEXT, MULTI_TOPIC_TEXT] * 5)
+        result = self.summarizer.summarize_long(long_text, max_length=80, min_length=20)
+        self.assertIn('summary', result)
+        self.assertTrue(result['summary_length'] < result['original_length'])
+        # At least one reduce level plus the final pass
+        self.assertGreaterEqual(len(result['levels']), 2)
+        self.assertGreater(result['levels'][0]['chunks'], 1)
+        for level in result['levels']:
+            self.assertGreaterEqual(level['seconds'], 0)
+
+    def test_split_sentences(self):
+        """Test sentence splitting keeps closing quotes with their sentence."""
+        sentences = split_sentences('He said "All systems are go." It worked! Did it? Yes.')
+        self.assertEqual(
+            sentences, ['He said "All systems are go."', 'It worked!', 'Did it?', 'Yes.']
+        )
+
+    def test_cache_hit(self):
+        """Test that a repeated request is served from the cache."""
+        cached = TextSummarizer(cache=SummaryCache())
+        first = cached.summarize(NEWS_TEXT)
+        second = cached.summarize("  " + NEWS_TEXT + "\n")
+        self.assertEqual(first, second)
+        self.assertEqual(cached.cache.stats()['memory_hits'], 1)
+
+    def test_registry_shares_pipeline(self):
+        """Test that instances for the same model share one loaded pipeline."""
+        other = TextSummarizer()
+        self.assertIs(other.summarizer, self.summarizer.summarizer)
+        self.assertTrue(model_registry.is_loaded(DEFAULT_MODEL))
+
+    def test_asummarize_concurrent(self):
+        """Test that concurrent async requests each get their own summary."""
+        async def run():
+            results = await asyncio.gather(
+                self.summarizer.asummarize(NEWS_TEXT),
+                self.summarizer.asummarize(SCIENTIFIC_TEXT),
+            )
+            await self.summarizer.scheduler.close()
+            self.summarizer.scheduler = None
+            return results
+
+        news, scientific = asyncio.run(run())
+        self.assertIn('quantum', news['summary'].lower())
+        self.assertIn('alphafold', scientific['summary'].lower())
+
+    def test_summarize_stream(self):
+        """Test that streaming yields text pieces followed by final metrics."""
+        events = list(self.summarizer.summarize_stream(NEWS_TEXT, max_length=60, min_length=10))
+        tokens = [event for event in events if event['type'] == 'token']
+        final = events[-1]
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual(final['type'], 'done')
+        self.assertEqual(final['summary'], ''.join(e['text'] for e in tokens).strip())
+        self.assertIn('quantum', final['summary'].lower())
+        self.assertLessEqual(final['time_to_first_token'], final['total_seconds'])
+
+    def test_abandoned_stream_stops_generation(self):
+        """Test that closing a stream early stops its generation thread."""
+        stream = self.summarizer.summarize_stream(HISTORICAL_TEXT, max_length=400, min_length=300)
+        self.assertEqual(next(stream)['type'], 'token')
+        stream.close()
+        for worker in threading.enumerate():
+            if worker.name == 'summarizer-stream':
+                worker.join(5)
+                self.assertFalse(worker.is_alive())
+
+    def test_quantized_int8(self):
+        """Test summarization with dynamically quantized int8 weights."""
+        quantized = TextSummarizer(quantize="int8")
+        result = quantized.summarize(NEWS_TEXT)
+        self.assertIn('quantum', result['summary'].lower())
+        self.assertNotEqual(quantized.model_id, self.summarizer.model_id)
+
+    def test_invalid_quantize_mode(self):
+        """Test that unknown quantization modes are rejected."""
+        with self.assertRaises(ValueError):
+            TextSummarizer(quantize="int4")
+
+    def test_onnx_backend(self):
+        """Test that the onnx backend (or its PyTorch fallback) keeps the result contract."""
+        onnx = TextSummarizer(backend="onnx")
+        result = onnx.summarize(NEWS_TEXT)
+        self.assertLessEqual(
+            {'summary', 'original_length', 'summary_length', 'compression_ratio'}, set(result)
+        )
+        self.assertIn('quantum', result['summary'].lower())
+
+    def test_invalid_backend(self):
+        """Test that unknown backends are rejected."""
+        with self.assertRaises(ValueError):
+            TextSummarizer(backend="tensorrt")
+
+    def test_stage_timings_and_tokens(self):
+        """Test that results carry token counts and per-stage timings."""
+        result = self.summarizer.summarize(NEWS_TEXT)
+        self.assertGreater(result['input_tokens'], result['output_tokens'])
+        self.assertFalse(result['truncated'])
+        self.assertGreater(result['tokens_per_second'], 0)
+        for stage in ('tokenize', 'generate', 'decode', 'total'):
+            self.assertGreaterEqual(result['timings'][stage], 0)
+        self.assertGreater(result['timings']['generate'], result['timings']['tokenize'])
+
+    def test_truncation_is_reported(self):
+        """Test that inputs over the model limit are truncated and flagged."""
+        result = self.summarizer.summarize(" ".join([HISTORICAL_TEXT] * 12), max_length=60)
+        self.assertTrue(result['truncated'])
+        self.assertGreater(result['input_tokens'], self.summarizer.max_input_tokens)
+
+    def test_metric_sinks(self):
+        """Test that metric sinks receive one record per summary."""
+        records = []
+        instrumented = TextSummarizer(metric_sinks=[CallbackSink(records.append)])
+        instrumented.summarize_many([SHORT_TEXT, NEWS_TEXT], batch_size=2, max_length=60)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['model'], DEFAULT_MODEL)
+        self.assertEqual(records[0]['batch_size'], 2)
+
+    def test_word_length_targets(self):
+        """Test that word targets are converted to tokens and learn a ratio."""
+        measured = TextSummarizer()
+        result = measured.summarize(NEWS_TEXT, max_length=40, min_length=10, length_unit='words')
+        self.assertLessEqual(result['summary_length'], 45)
+        self.assertGreater(result['output_tokens'], result['summary_length'])
+        self.assertGreater(measured.tokens_per_word, 1.0)
+
+    def test_invalid_length_unit(self):
+        """Test that unknown length units are rejected."""
+        with self.assertRaises(ValueError):
+            self.summarizer.summarize(NEWS_TEXT, length_unit='characters')
+
+    def test_sentence_lengths_from_offsets(self):
+        """Test that per-sentence token counts from one encoding match tokenizing each."""
+        tokenizer = self.summarizer.summarizer.tokenizer
+        text = SCIENTIFIC_TEXT.strip()
+        encoding = tokenizer(text, return_offsets_mapping=True)
+        sentences, lengths = self.summarizer._sentence_lengths(text, encoding['offset_mapping'])
+        expected = tokenizer(sentences, add_special_tokens=False)['input_ids']
+        self.assertEqual(sentences, split_sentences(text))
+        self.assertEqual(sum(lengths), len(encoding['input_ids']) - 2)
+        for length, ids in zip(lengths, expected):
+            self.assertLessEqual(abs(length - len(ids)), 1)
+
+    def test_hybrid_mode_extracts_long_inputs(self):
+        """Test that hybrid mode keeps central sentences instead of truncating."""
+        long_text = " ".join([HISTORICAL_TEXT, SCIENTIFIC_TEXT, TECHNICAL_TEXT] * 4)
+        result = self.summarizer.summarize(
+            long_text, max_length=80, min_length=20, mode='hybrid', extract_tokens=300
+        )
+        extraction = result['extraction']
+        self.assertLess(extraction['kept_sentences'], extraction['total_sentences'])
+        self.assertLessEqual(result['input_tokens'], 300 + 10)
+        self.assertFalse(result['truncated'])
+        self.assertEqual(result['original_length'], len(long_text.split()))
+        self.assertEqual(result['mode'], 'hybrid')
+
+    def test_generation_profiles(self):
+        """Test that results report the decoding profile they were generated with."""
+        fast = self.summarizer.summarize(NEWS_TEXT, max_length=60, profile='fast')
+        quality = self.summarizer.summarize(NEWS_TEXT, max_length=60)
+        self.assertEqual(fast['profile'], 'fast')
+        self.assertEqual(quality['profile'], 'quality')
+        self.assertFalse(quality['stopped_early'])
+        self.assertIsNotNone(self.summarizer.estimate_seconds('balanced', 300))
+
+    def test_deadline_stops_generation(self):
+        """Test that an impossible deadline stops generation and is reported."""
+        start = time.perf_counter()
+        result = self.summarizer.summarize(
+            HISTORICAL_TEXT, max_length=200, min_length=150, deadline=0.2
+        )
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertTrue(result['stopped_early'])
+        self.assertEqual(result['profile'], 'fast')
+
+    def test_encoder_reuse(self):
+        """Test that changing only the lengths reuses the encoder output."""
+        summarizer = TextSummarizer(encoder_cache=EncoderCache())
+        first = summarizer.summarize(NEWS_TEXT, max_length=60, min_length=20)
+        expected = self.summarizer.summarize(NEWS_TEXT, max_length=90, min_length=30)
+        second = summarizer.summarize(NEWS_TEXT, max_length=90, min_length=30)
+        self.assertFalse(first['encoder_reused'])
+        self.assertTrue(second['encoder_reused'])
+        self.assertEqual(second['summary'], expected['summary'])
+        self.assertEqual(summarizer.encoder_cache.stats()['hits'], 1)
+
+    def test_preload_background(self):
+        """Test that summarize waits for a background preload instead of loading again."""
+        preloaded = TextSummarizer()
+        future = preloaded.preload(background=True)
+        result = preloaded.summarize(SHORT_TEXT, max_length=50, min_length=20)
+        self.assertTrue(future.done())
+        self.assertIs(preloaded.summarizer, future.result())
+        self.assertIn('summary', result)
+
+
+class TestChunking(unittest.TestCase):
+    """Test cases for sentence-aligned chunking (no model needed)."""
+
+    def test_sentence_spans(self):
+        """Test that spans locate the same sentences split_sentences returns."""
+        text = 'First one.  Second "quoted." Third?'
+        spans = sentence_spans(text)
+        self.assertEqual([text[start:end] for start, end in spans], split_sentences(text))
+
+    def test_iter_chunks_budget_and_overlap(self):
+        """Test that chunks fit the budget and repeat one sentence for context."""
+        sentences = ['a', 'b', 'c', 'd', 'e']
+        chunks = list(TextSummarizer._iter_chunks(sentences, [3, 3, 3, 3, 3], 7, 1))
+        self.assertEqual(chunks, ['a b', 'b c', 'c d', 'd e'])
+
+    def test_iter_chunks_oversized_sentence(self):
+        """Test that a sentence over the budget becomes its own chunk."""
+        chunks = list(TextSummarizer._iter_chunks(['a', 'b', 'c'], [2, 10, 2], 5, 1))
+        self.assertEqual(chunks, ['a', 'b', 'c'])
+
+
+class TestLengthLimits(unittest.TestCase):
+    """Test cases for converting length targets into token limits (no model needed)."""
+
+    def setUp(self):
+        self.summarizer = TextSummarizer(model_name='not-a-real/model')
+        # A loaded pipeline with BART's limits
+        self.summarizer._summarizer = SimpleNamespace(
+            model=SimpleNamespace(config=SimpleNamespace(max_position_embeddings=1024)),
+            tokenizer=SimpleNamespace(model_max_length=1024, num_special_tokens_to_add=lambda: 2),
+        )
+
+    def test_word_targets_are_clamped(self):
+        """Test that large word targets never ask generate() for more positions than exist."""
+        limits = self.summarizer._token_limits(2000, 1500, 'words', [902], [300])
+        self.assertEqual(limits, (1024, 1024))
+        self.assertEqual(self.summarizer._token_limits(60, 20, 'words', [902], [300]), (182, 62))
+
+    def test_token_targets_are_clamped(self):
+        """Test that token targets are clamped and min_length never exceeds max_length."""
+        self.assertEqual(self.summarizer._token_limits(5000, 30, 'tokens', [10], [5]), (1024, 30))
+        self.assertEqual(self.summarizer._token_limits(20, 40, 'tokens', [10], [5]), (20, 20))
+
+
+class TestProfiles(unittest.TestCase):
+    """Test cases for deadline-based profile selection (no model needed)."""
+
+    def make_summarizer(self, rates):
+        summarizer = TextSummarizer()
+        summarizer._summarizer = SimpleNamespace(
+            model=SimpleNamespace(generation_config=SimpleNamespace(num_beams=4))
+        )
+        summarizer._profile_rates = dict(rates)
+        return summarizer
+
+    def test_unmeasured_picks_fast(self):
+        """Test that the fastest profile is used before anything is measured."""
+        self.assertEqual(self.make_summarizer({}).choose_profile(500, 10.0), 'fast')
+
+    def test_best_profile_within_deadline(self):
+        """Test that the highest-quality profile that fits the deadline wins."""
+        summarizer = self.make_summarizer({'fast': 0.001})
+        # fast: 0.5s, balanced: 1.0s, quality: 2.0s for 500 tokens of work
+        self.assertAlmostEqual(summarizer.estimate_seconds('quality', 500), 2.0)
+        self.assertEqual(summarizer.choose_profile(500, 5.0), 'quality')
+        self.assertEqual(summarizer.choose_profile(500, 1.5), 'balanced')
+        self.assertEqual(summarizer.choose_profile(500, 0.1), 'fast')
+
+    def test_unknown_profile(self):
+        """Test that unknown profiles are rejected."""
+        with self.assertRaises(ValueError):
+            TextSummarizer().summarize(NEWS_TEXT, profile='ludicrous')
+
+
+class TestFastMode(unittest.TestCase):
+    """Test cases for the model-free extractive mode."""
+
+    def test_fast_mode_skips_the_model(self):
+        """Test that fast mode answers without loading a model."""
+        summarizer = TextSummarizer(model_name='not-a-real/model')
+        result = summarizer.summarize(NEWS_TEXT, max_length=50, length_unit='words', mode='fast')
+        self.assertEqual(result['mode'], 'fast')
+        self.assertLessEqual(result['summary_length'], 50)
+        self.assertLess(result['compression_ratio'], 1)
+        self.assertFalse(model_registry.is_loaded('not-a-real/model'))
+
+    def test_clean_input(self):
+        """Test that clean=True summarizes the cleaned text and reports what it removed."""
+        summarizer = TextSummarizer(model_name='not-a-real/model')
+        page = f'<nav>Home</nav>\n<p>{NEWS_TEXT}</p>\n<p>{NEWS_TEXT}</p>\n<p>Subscribe</p>'
+        result = summarizer.summarize(page, max_length=50, length_unit='words', mode='fast',
+                                      clean=True)
+        report = result['preprocessing']
+        self.assertEqual(result['original_length'], len(NEWS_TEXT.split()))
+        self.assertEqual((report['removed_paragraphs'], report['duplicate_paragraphs']), (2, 1))
+        self.assertNotIn('tokens_saved', report)
+        with self.assertRaises(ValueError):
+            summarizer.summarize('<p>Read more</p>', mode='fast', clean=True)
+
+    def test_unknown_mode(self):
+        """Test that unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            TextSummarizer().summarize(NEWS_TEXT, mode='turbo')
+
+
+class TestNearDuplicateReuse(unittest.TestCase):
+    """Test cases for reusing summaries of near-duplicate inputs (no model needed)."""
+
+    def test_reused_summary_skips_the_model(self):
+        """Test that a near-duplicate input is answered from the index."""
+        index = NearDuplicateIndex()
+        summarizer = TextSummarizer(model_name='not-a-real/model', near_duplicates=index)
+        namespace = summarizer._cache_key('', 130, 30, 'tokens', 'quality')
+        stored = {'summary': 'Quantum supremacy achieved.', 'profile': 'quality'}
+        index.add(NEWS_TEXT, stored, namespace)
+
+        result = summarizer.summarize('Reuters - ' + NEWS_TEXT + ' (Reporting by J. Doe)')
+        self.assertTrue(result['reused'])
+        self.assertGreaterEqual(result['similarity'], index.threshold)
+        self.assertEqual(result['summary'], 'Quantum supremacy achieved.')
+        self.assertEqual(result['original_length'], len(NEWS_TEXT.split()) + 6)
+        self.assertFalse(model_registry.is_loaded('not-a-real/model'))
+
+
+class FakeRegistry(ModelRegistry):
+    """A ModelRegistry that hands out stand-in pipelines and counts loads and unloads."""
+
+    def __init__(self):
+        super().__init__()
+        self.loads = []
+        self.unloads = 0
+
+    def get(self, model_name, device=-1, dtype=None, quantize=None, backend='torch',
+            warmup=False, low_memory=False):
+        self.loads.append(low_memory)
+        key = (model_name, device, dtype, quantize, backend)
+        with self._lock:
+            self._pipelines[key] = SimpleNamespace(model=SimpleNamespace())
+            self._used[key] = time.monotonic()
+            return self._pipelines[key]
+
+    def unload(self, *args, **kwargs):
+        unloaded = super().unload(*args, **kwargs)
+        self.unloads += unloaded
+        return unloaded
+
+
+class TestMemory(unittest.TestCase):
+    """Test cases for memory reporting and idle unloading (no model needed)."""
+
+    def test_unload_and_reload(self):
+        """Test that an unloaded model is loaded again on next use."""
+        registry = FakeRegistry()
+        summarizer = TextSummarizer(registry=registry, low_memory=True)
+        first = summarizer.summarizer
+        self.assertTrue(summarizer.unload())
+        self.assertFalse(summarizer.unload())
+        self.assertIsNot(summarizer.summarizer, first)
+        self.assertEqual(registry.loads, [True, True])
+        self.assertEqual(registry.unloads, 1)
+
+    def test_idle_ttl(self):
+        """Test that the model is unloaded after idle_ttl seconds without use."""
+        registry = FakeRegistry()
+        summarizer = TextSummarizer(registry=registry, idle_ttl=0.05)
+        summarizer.summarizer
+        self.assertTrue(summarizer.memory_usage()['loaded'])
+        time.sleep(0.3)
+        self.assertFalse(summarizer.memory_usage()['loaded'])
+        self.assertEqual(registry.unloads, 1)
+        summarizer.summarizer
+        self.assertEqual(len(registry.loads), 2)
+
+    def test_idle_waits_for_running_generation(self):
+        """Test that a model is not unloaded while a generation is still running."""
+        summarizer = TextSummarizer(registry=FakeRegistry(), idle_ttl=0.05)
+        summarizer.summarizer
+        with summarizer._in_use():
+            time.sleep(0.3)
+            self.assertTrue(summarizer.memory_usage()['loaded'])
+        time.sleep(0.3)
+        self.assertFalse(summarizer.memory_usage()['loaded'])
+
+    def test_idle_waits_for_other_holders(self):
+        """Test that a shared model stays loaded while another instance keeps using it."""
+        registry = FakeRegistry()
+        idle = TextSummarizer(registry=registry, idle_ttl=0.1)
+        busy = TextSummarizer(registry=registry)
+        idle.summarizer
+        busy.summarizer
+        for _ in range(20):
+            with busy._in_use():
+                time.sleep(0.02)
+        self.assertTrue(idle.memory_usage()['loaded'])
+        self.assertEqual(registry.unloads, 0)
+        time.sleep(0.4)
+        self.assertFalse(idle.memory_usage()['loaded'])
+        self.assertEqual(registry.unloads, 1)
+
+    def test_model_id_includes_precision(self):
+        """Test that results of different precisions never share cache keys."""
+        ids = {
+            TextSummarizer().model_id,
+            TextSummarizer(dtype='bfloat16').model_id,
+            TextSummarizer(quantize='int8').model_id,
+        }
+        self.assertEqual(len(ids), 3)
+
+    @unittest.skipIf(summarizer_module.onnx_available(), 'optimum and onnxruntime are installed')
+    def test_onnx_fallback_reports_torch(self):
+        """Test that falling back to PyTorch is reflected in the backend and model_id."""
+        fallback = TextSummarizer(backend='onnx', registry=FakeRegistry())
+        self.assertEqual(fallback.backend, 'torch')
+        self.assertEqual(fallback.model_id, TextSummarizer().model_id)
+        fallback.summarizer
+        self.assertTrue(fallback.registry.is_loaded(DEFAULT_MODEL))
+
+    def test_memory_usage(self):
+        """Test that resident memory is reported and unknown model sizes are None."""
+        summarizer = TextSummarizer(registry=FakeRegistry())
+        summarizer.summarizer
+        usage = summarizer.memory_usage()
+        self.assertIsNone(usage['model_bytes'])
+        if sys.platform.startswith('linux'):
+            self.assertGreater(usage['resident_bytes'], 0)
+
+
+@unittest.skipUnless(importlib.util.find_spec('transformers'), 'transformers is not installed')
+class TestQuantizedCache(unittest.TestCase):
+    """Test cases for the on-disk cache of int8 weights."""
+
+    # Tiny randomly initialised BART, only useful for checking the plumbing
+    model_name = 'sshleifer/bart-tiny-random'
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        cache_dir = summarizer_module.MODEL_CACHE_DIR
+        summarizer_module.MODEL_CACHE_DIR = tmpdir.name
+        self.addCleanup(setattr, summarizer_module, 'MODEL_CACHE_DIR', cache_dir)
+
+    def test_cache_hit_skips_checkpoint(self):
+        """Test that cached int8 weights are loaded without reading the fp32 checkpoint."""
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        first = summarizer_module._load_quantized_model(self.model_name)
+        loader = AutoModelForSeq2SeqLM.__dict__['from_pretrained']
+        self.addCleanup(setattr, AutoModelForSeq2SeqLM, 'from_pretrained', loader)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('the fp32 checkpoint was loaded on a cache hit')
+
+        AutoModelForSeq2SeqLM.from_pretrained = fail
+        second = summarizer_module._load_quantized_model(self.model_name)
+        expected = first.state_dict()
+        for name, value in second.state_dict().items():
+            # Quantized Linear layers store a (weight, bias) tuple of packed params
+            if isinstance(value, tuple):
+                pairs = zip(value, expected[name])
+            else:
+                pairs = [(value, expected[name])]
+            for actual, wanted in pairs:
+                if getattr(actual, 'is_quantized', False):
+                    actual, wanted = actual.dequantize(), wanted.dequantize()
+                if hasattr(actual, 'dtype'):
+                    self.assertTrue(torch.equal(actual, wanted), name)
+
+
+class TestFastImport(unittest.TestCase):
+    """Test that importing the module stays cheap."""
+
+    def test_import_is_lazy(self):
+        """Test that importing summarizer does not import torch or transformers."""
+        project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        output = subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                "import sys, summarizer; "
+                "print(sorted(m for m in ('torch', 'transformers') if m in sys.modules))",
+            ],
+            cwd=project_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(output.strip(), '[]')
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
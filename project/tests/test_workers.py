@@ -0,0 +1,145 @@
+"""
+Unit tests for the multi-process worker pool.
+"""
+
+import importlib.util
+import os
+import queue
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from workers import WorkerPool, candidate_layouts, plan_layout
+from .test_data import NEWS_TEXT, SHORT_TEXT
+
+# Tiny randomly initialised BART, only useful for checking the plumbing
+TINY_MODEL = 'sshleifer/bart-tiny-random'
+
+
+class TestLayout(unittest.TestCase):
+    """Test cases for choosing worker counts, threads and CPUs."""
+
+    def test_default_layout(self):
+        """Test that workers get four threads each and cover every CPU."""
+        self.assertEqual(plan_layout(range(8)), (2, 4, [[0, 1, 2, 3], [4, 5, 6, 7]]))
+
+    def test_derived_threads(self):
+        """Test that threads per worker follow from the worker count."""
+        self.assertEqual(plan_layout(range(8), workers=3), (3, 2, [[0, 1], [2, 3], [4, 5]]))
+
+    def test_oversubscribed_layout(self):
+        """Test that workers share CPUs when there are not enough to go round."""
+        workers, threads, groups = plan_layout([0, 1], workers=2, threads=2)
+        self.assertEqual((workers, threads), (2, 2))
+        self.assertEqual(groups, [[0, 1], [0, 1]])
+
+    def test_invalid_layout(self):
+        """Test that empty layouts are rejected."""
+        with self.assertRaises(ValueError):
+            plan_layout(range(4), workers=0)
+
+    def test_candidate_layouts(self):
+        """Test that tuning candidates use every CPU and respect max_workers."""
+        self.assertEqual(candidate_layouts(8), [(1, 8), (2, 4), (4, 2), (8, 1)])
+        self.assertEqual(candidate_layouts(8, max_workers=2), [(1, 8), (2, 4)])
+        self.assertEqual(candidate_layouts(6), [(1, 4), (3, 2), (6, 1)])
+
+
+class TestDispatch(unittest.TestCase):
+    """Test cases for least-loaded dispatch (no processes needed)."""
+
+    def setUp(self):
+        self.pool = WorkerPool(workers=2, threads_per_worker=1, cpus=[0, 1])
+        # Stand-ins for running workers; requests just pile up in the queues
+        self.alive = [True, True]
+        self.pool._processes = [
+            SimpleNamespace(pid=pid, is_alive=lambda index=index: self.alive[index])
+            for index, pid in enumerate([1, 2])
+        ]
+        self.pool._requests = [queue.Queue(), queue.Queue()]
+        self.pool._loaded = {0, 1}
+        self.spawned = []
+
+        def spawn(index):
+            self.spawned.append(index)
+            return queue.Queue(), SimpleNamespace(pid=3, is_alive=lambda: True)
+
+        self.pool._spawn = spawn
+
+    def test_least_loaded_worker(self):
+        """Test that requests go to the worker with the fewest queued texts."""
+        self.pool.submit('summarize_many', ['a', 'b', 'c'], size=3)
+        self.pool.submit('summarize', 'd')
+        self.pool.submit('summarize', 'e')
+        self.assertEqual(self.pool._requests[0].qsize(), 1)
+        self.assertEqual(self.pool._requests[1].qsize(), 2)
+        self.assertEqual([w['queued_texts'] for w in self.pool.stats()['per_worker']], [3, 2])
+
+    def test_dead_worker_is_replaced(self):
+        """Test that a worker that exits fails its jobs and is replaced with an empty queue."""
+        lost = self.pool.submit('summarize_many', ['a', 'b', 'c'], size=3)
+        self.alive[0] = False
+        self.pool._check_alive()
+        with self.assertRaises(RuntimeError):
+            lost.result(0)
+        self.assertEqual(self.spawned, [0])
+        self.assertEqual(self.pool._requests[0].qsize(), 0)
+        self.assertEqual([w['queued_texts'] for w in self.pool.stats()['per_worker']], [0, 0])
+        self.assertEqual(self.pool.stats()['per_worker'][0]['pid'], 3)
+        self.pool.submit('summarize', 'd')
+        self.assertEqual(self.pool._requests[0].qsize(), 1)
+
+    def test_worker_that_never_loaded_is_removed(self):
+        """Test that a worker that exits before loading its model no longer gets requests."""
+        self.pool._loaded = {1}
+        self.alive[0] = False
+        self.pool._check_alive()
+        self.assertEqual(self.spawned, [])
+        for text in ('a', 'b', 'c'):
+            self.pool.submit('summarize', text)
+        self.assertEqual(self.pool._requests[1].qsize(), 3)
+        self.assertFalse(self.pool.stats()['per_worker'][0]['alive'])
+        self.alive[1] = False
+        self.pool._loaded = set()
+        self.pool._check_alive()
+        with self.assertRaises(RuntimeError):
+            self.pool.submit('summarize', 'd')
+
+    def test_unknown_method(self):
+        """Test that only summarization methods can be dispatched."""
+        with self.assertRaises(ValueError):
+            self.pool.submit('unload')
+
+    def test_not_started(self):
+        """Test that submitting before start() fails."""
+        with self.assertRaises(RuntimeError):
+            WorkerPool(workers=1, threads_per_worker=1).submit('summarize', 'text')
+
+
+class TestWorkerProcesses(unittest.TestCase):
+    """Test cases that start real worker processes."""
+
+    def test_load_failure(self):
+        """Test that a worker that cannot load its model fails start()."""
+        pool = WorkerPool('not-a-real/model', workers=1, threads_per_worker=1)
+        with self.assertRaises(RuntimeError):
+            pool.start(timeout=120)
+        self.assertEqual(pool.stats()['per_worker'], [])
+
+    @unittest.skipUnless(importlib.util.find_spec('transformers'), 'transformers is not installed')
+    def test_end_to_end(self):
+        """Test that texts spread over two workers come back in order."""
+        with WorkerPool(TINY_MODEL, workers=2, threads_per_worker=1) as pool:
+            results = pool.summarize_many(
+                [SHORT_TEXT, NEWS_TEXT, SHORT_TEXT], max_length=20, min_length=5
+            )
+            self.assertEqual(len(results), 3)
+            self.assertEqual(results[0]['summary'], results[2]['summary'])
+            with self.assertRaises(ValueError):
+                pool.summarize('   ')
+            self.assertEqual([w['queued_texts'] for w in pool.stats()['per_worker']], [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,465 @@
+"""
+Multi-process execution for the AI Text Summarizer.
+
+Calling one pipeline from many Python threads makes torch's thread pools fight
+over the same cores. A WorkerPool instead runs K worker processes, each with
+its own pipeline, a fixed number of intra-op threads and optionally its own set
+of CPUs, and sends every request to the worker with the least work queued.
+autotune() measures which K and threads per worker give the best throughput on
+the current host.
+
+Run from the project directory to tune for this host:
+
+    python -m workers --max-workers 8
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from summarizer import DEFAULT_MODEL, TextSummarizer, configure_torch_threads
+
+logger = logging.getLogger(__name__)
+
+# Methods of TextSummarizer a worker may run
+WORKER_METHODS = ("summarize", "summarize_many", "summarize_long")
+
+# Seconds between checks that busy workers are still alive
+LIVENESS_INTERVAL = 1.0
+
+
+def available_cpus() -> List[int]:
+    """Return the ids of the CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_layout(
+    cpus: Sequence[int], workers: Optional[int] = None, threads: Optional[int] = None
+) -> Tuple[int, int, List[List[int]]]:
+    """
+    Decide how many workers to run, with how many threads, on which CPUs.
+
+    Missing values are derived from the others: by default each worker gets four
+    threads, and the workers together use every CPU.
+
+    Args:
+        cpus (Sequence[int]): CPU ids to spread the workers over
+        workers (Optional[int]): Number of worker processes
+        threads (Optional[int]): Intra-op threads per worker
+
+    Returns:
+        Tuple of the worker count, threads per worker, and the CPUs of each worker
+        (disjoint while workers * threads fits in ``cpus``, shared round-robin otherwise)
+    """
+    count = len(cpus)
+    if (workers is not None and workers < 1) or (threads is not None and threads < 1):
+        raise ValueError("workers and threads must be at least 1")
+    if workers is None and threads is None:
+        threads = min(4, count)
+    if workers is None:
+        workers = max(1, count // threads)
+    if threads is None:
+        threads = max(1, count // workers)
+    cycle = itertools.cycle(cpus)
+    groups = [sorted({next(cycle) for _ in range(min(threads, count))}) for _ in range(workers)]
+    return workers, threads, groups
+
+
+def candidate_layouts(cpus: int, max_workers: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    List the (workers, threads) layouts worth measuring on a host.
+
+    Threads per worker are powers of two, and the workers of each layout together
+    use every CPU.
+
+    Args:
+        cpus (int): Number of CPUs
+        max_workers (Optional[int]): Most workers to try (each holds its own model)
+
+    Returns:
+        List of (workers, threads) pairs, fewest workers first
+    """
+    layouts = []
+    threads = 1
+    while threads <= cpus:
+        workers = cpus // threads
+        if max_workers is None or workers <= max_workers:
+            layouts.append((workers, threads))
+        threads *= 2
+    return sorted(layouts) or [(1, cpus)]
+
+
+def _worker_main(
+    index: int,
+    model_name: str,
+    threads: int,
+    cpus: Optional[List[int]],
+    options: Dict[str, Any],
+    requests: "multiprocessing.Queue",
+    results: "multiprocessing.Queue",
+) -> None:
+    try:
+        configure_torch_threads(threads, cpus)
+        summarizer = TextSummarizer(model_name, **options)
+        summarizer.summarizer
+    except Exception as e:
+        results.put(("failed", index, f"{type(e).__name__}: {e}"))
+        return
+    results.put(("ready", index, os.getpid()))
+
+    for job_id, method, args, kwargs in iter(requests.get, None):
+        try:
+            results.put(("done", job_id, getattr(summarizer, method)(*args, **kwargs)))
+        except Exception as e:
+            # Exceptions are sent as text, since not all of them can be pickled
+            results.put(("error", job_id, (type(e).__name__, str(e))))
+
+
+class WorkerPool:
+    """Worker processes with their own pipelines, fed by a least-loaded dispatcher."""
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        pin_cpus: bool = False,
+        cpus: Optional[Sequence[int]] = None,
+        **options: Any,
+    ):
+        """
+        Initialize the pool (call start() to launch the workers).
+
+        Args:
+            model_name (str): The model every worker loads
+            workers (Optional[int]): Number of worker processes, see plan_layout()
+            threads_per_worker (Optional[int]): Torch intra-op threads per worker
+            pin_cpus (bool): Restrict each worker to its own CPUs (Linux only)
+            cpus (Optional[Sequence[int]]): CPUs to use, defaults to all available
+            **options: Passed on to each worker's TextSummarizer (e.g. dtype, quantize)
+        """
+        self.model_name = model_name
+        self.workers, self.threads_per_worker, self.cpu_groups = plan_layout(
+            list(cpus) if cpus is not None else available_cpus(), workers, threads_per_worker
+        )
+        self.pin_cpus = pin_cpus
+        self.options = options
+        self._context = multiprocessing.get_context("spawn")
+        self._results = self._context.Queue()
+        self._requests: List["multiprocessing.Queue"] = []
+        self._processes: List[multiprocessing.Process] = []
+        self._lock = threading.Lock()
+        # Texts queued or running on each worker
+        self._load = [0] * self.workers
+        self.completed = [0] * self.workers
+        # Workers that may be sent requests, and those that have loaded their model
+        self._alive = [True] * self.workers
+        self._loaded: set = set()
+        self._jobs: Dict[int, Tuple[int, int, Future]] = {}
+        self._job_ids = itertools.count()
+        self._ready: Optional[Future] = None
+        self._collector: Optional[threading.Thread] = None
+
+    def start(self, timeout: Optional[float] = None) -> None:
+        """
+        Launch the workers and wait until every one has loaded its model.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the models to load
+
+        Raises:
+            RuntimeError: If a worker fails to load its model
+        """
+        if self._processes:
+            return
+        self._ready = Future()
+        self._alive = [True] * self.workers
+        self._loaded = set()
+        for index in range(self.workers):
+            requests, process = self._spawn(index)
+            self._requests.append(requests)
+            self._processes.append(process)
+        self._collector = threading.Thread(
+            target=self._collect, name="summarizer-workers-collect", daemon=True
+        )
+        self._collector.start()
+        start = time.perf_counter()
+        try:
+            self._ready.result(timeout)
+        except BaseException:
+            self.stop()
+            raise
+        logger.info(
+            f"Started {self.workers} workers x {self.threads_per_worker} threads "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+    def stop(self) -> None:
+        """Shut the workers down; queued requests fail."""
+        for requests in self._requests:
+            requests.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._requests = []
+        self._results.put(None)
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+        for _, _, future in jobs.values():
+            future.set_exception(RuntimeError("Worker pool stopped"))
+
+    def _spawn(self, index: int) -> Tuple["multiprocessing.Queue", multiprocessing.Process]:
+        requests = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                index,
+                self.model_name,
+                self.threads_per_worker,
+                self.cpu_groups[index] if self.pin_cpus else None,
+                self.options,
+                requests,
+                self._results,
+            ),
+            name=f"summarizer-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        return requests, process
+
+    def __enter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def submit(self, method: str, *args: Any, size: int = 1, **kwargs: Any) -> Future:
+        """
+        Run a TextSummarizer method on the least-loaded worker.
+
+        Args:
+            method (str): One of WORKER_METHODS
+            *args: Positional arguments of the method
+            size (int): Number of texts in the request, used to balance load
+            **kwargs: Keyword arguments of the method
+
+        Returns:
+            Future: Resolves to the method's result, or raises its error
+        """
+        if method not in WORKER_METHODS:
+            raise ValueError(f"Unsupported method {method!r}, expected one of {WORKER_METHODS}")
+        if not self._processes:
+            raise RuntimeError("Worker pool is not started")
+        future: Future = Future()
+        with self._lock:
+            worker = self._least_loaded()
+            job_id = next(self._job_ids)
+            self._load[worker] += size
+            self._jobs[job_id] = (worker, size, future)
+        self._requests[worker].put((job_id, method, args, kwargs))
+        return future
+
+    def summarize(self, text: str, **kwargs: Any) -> Dict[str, Any]:
+        """Summarize one text on a worker, see TextSummarizer.summarize."""
+        return self.submit("summarize", text, **kwargs).result()
+
+    def summarize_many(self, texts: Sequence[str], **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Summarize many texts, spreading them over the workers.
+
+        Args:
+            texts (Sequence[str]): The texts to summarize
+            **kwargs: Passed on to TextSummarizer.summarize_many
+
+        Returns:
+            List of result dicts, in the same order as ``texts``
+        """
+        shard = max(1, math.ceil(len(texts) / self.workers))
+        parts = [list(texts[i : i + shard]) for i in range(0, len(texts), shard)]
+        futures = [self.submit("summarize_many", part, size=len(part), **kwargs) for part in parts]
+        return [result for future in futures for result in future.result()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the layout and per-worker load."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "pinned": self.pin_cpus,
+                "per_worker": [
+                    {
+                        "pid": process.pid,
+                        "cpus": self.cpu_groups[index],
+                        "queued_texts": self._load[index],
+                        "completed": self.completed[index],
+                        "alive": self._alive[index],
+                    }
+                    for index, process in enumerate(self._processes)
+                ],
+            }
+
+    def _least_loaded(self) -> int:
+        alive = [index for index in range(self.workers) if self._alive[index]]
+        if not alive:
+            raise RuntimeError("All workers have exited")
+        # Ties go to the worker that has done the least, so idle workers take turns
+        return min(alive, key=lambda i: (self._load[i], self.completed[i]))
+
+    def _collect(self) -> None:
+        checked = time.monotonic()
+        while True:
+            if time.monotonic() - checked >= LIVENESS_INTERVAL:
+                self._check_alive()
+                checked = time.monotonic()
+            try:
+                message = self._results.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                continue
+            if message is None:
+                return
+            kind, key, payload = message
+            if kind == "ready":
+                with self._lock:
+                    self._loaded.add(key)
+                    started = len(self._loaded) == self.workers
+                if started and not self._ready.done():
+                    self._ready.set_result(None)
+                continue
+            if kind == "failed":
+                if not self._ready.done():
+                    self._ready.set_exception(RuntimeError(f"Worker {key} failed: {payload}"))
+                continue
+            with self._lock:
+                worker, size, future = self._jobs.pop(key, (None, 0, None))
+                if worker is not None:
+                    self._load[worker] -= size
+                    self.completed[worker] += 1
+            if future is None:
+                continue
+            if kind == "done":
+                future.set_result(payload)
+            else:
+                name, text = payload
+                future.set_exception(
+                    ValueError(text) if name == "ValueError" else RuntimeError(f"{name}: {text}")
+                )
+
+    def _check_alive(self) -> None:
+        """
+        Fail the jobs of workers that have exited and take those workers out of dispatch.
+
+        A worker that had loaded its model is replaced by a new process, while one
+        that never got that far is removed, so a broken model is not reloaded forever.
+        """
+        with self._lock:
+            dead = {
+                index
+                for index, process in enumerate(self._processes)
+                if self._alive[index] and not process.is_alive()
+            }
+            lost = {key: job for key, job in self._jobs.items() if job[0] in dead}
+            for key in lost:
+                del self._jobs[key]
+            for index in dead:
+                self._load[index] = 0
+                if index in self._loaded:
+                    logger.warning(f"Worker {index} exited, starting a replacement")
+                    self._loaded.discard(index)
+                    self._requests[index], self._processes[index] = self._spawn(index)
+                else:
+                    logger.warning(f"Worker {index} exited before loading its model")
+                    self._alive[index] = False
+            removed = [index for index in dead if not self._alive[index]]
+        for worker, _, future in lost.values():
+            future.set_exception(RuntimeError(f"Worker {worker} exited"))
+        if removed and self._ready is not None and not self._ready.done():
+            self._ready.set_exception(
+                RuntimeError(f"Worker {removed[0]} exited before loading its model")
+            )
+
+
+def autotune(
+    texts: Sequence[str],
+    model_name: str = DEFAULT_MODEL,
+    layouts: Optional[Sequence[Tuple[int, int]]] = None,
+    max_workers: Optional[int] = None,
+    pin_cpus: bool = True,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Measure throughput for several worker layouts and return the best one.
+
+    Every layout starts its own pool, so model loading is not part of the
+    measurement, but each worker does hold a copy of the model.
+
+    Args:
+        texts (Sequence[str]): Representative inputs, at least a few per worker
+        model_name (str): The model to run
+        layouts (Optional[Sequence[Tuple[int, int]]]): (workers, threads) pairs to
+            try, defaults to candidate_layouts() for this host
+        max_workers (Optional[int]): Most workers to try, bounded by memory
+        pin_cpus (bool): Pin each worker to its own CPUs
+        **options: Passed on to each worker's TextSummarizer
+
+    Returns:
+        Dict with the best ``workers``, ``threads_per_worker`` and ``docs_per_second``,
+        plus every measured layout under ``trials``
+    """
+    cpus = available_cpus()
+    if layouts is None:
+        layouts = candidate_layouts(len(cpus), max_workers)
+    trials = []
+    for workers, threads in layouts:
+        with WorkerPool(model_name, workers, threads, pin_cpus, cpus, **options) as pool:
+            # One untimed pass so every worker has run the model once
+            pool.summarize_many(texts[:workers])
+            start = time.perf_counter()
+            pool.summarize_many(texts)
+            seconds = time.perf_counter() - start
+        trials.append(
+            {
+                "workers": workers,
+                "threads_per_worker": threads,
+                "docs_per_second": len(texts) / seconds,
+            }
+        )
+        logger.info(f"{workers} workers x {threads} threads: {len(texts) / seconds:.2f} docs/sec")
+    best = max(trials, key=lambda trial: trial["docs_per_second"])
+    return {**best, "trials": trials}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Tune the worker layout for this host and print the result as JSON."""
+    from bench.runner import load_corpus
+
+    parser = argparse.ArgumentParser(description="Find the fastest worker layout for this host")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--texts", type=int, default=32, help="Inputs per measurement")
+    parser.add_argument("--no-pin", action="store_true", help="Do not pin workers to CPUs")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    corpus = load_corpus()
+    texts = [corpus[i % len(corpus)] for i in range(args.texts)]
+    result = autotune(texts, args.model, max_workers=args.max_workers, pin_cpus=not args.no_pin)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()